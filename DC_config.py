@@ -14,3 +14,53 @@ import os
 if os.getenv('DOCKER_ENV'):
     # Docker 컨테이너 내부에서 실행될 때
     DB_CONFIG['host'] = 'postgres'
+
+# 연결 타임아웃 설정 (초)
+# DB_CONNECT_TIMEOUT: 한 번의 연결 시도에 허용하는 시간
+# DB_WARMUP_TIMEOUT: 백그라운드 워밍업이 재시도를 포기하기까지의 전체 시간
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', 3))
+DB_WARMUP_TIMEOUT = float(os.getenv('DB_WARMUP_TIMEOUT', 60))
+
+# 시작 시 대기 중인 스키마 마이그레이션을 자동 적용할지 여부
+# false이면 스키마가 오래된 경우 연결을 실패로 처리합니다 (schema_migrations.py로 수동 적용)
+DB_AUTO_MIGRATE = os.getenv('DB_AUTO_MIGRATE', 'true').lower() == 'true'
+
+# 트랜잭션을 연 채로 유휴 상태인 세션을 서버가 끊기까지의 시간 (밀리초, 0이면 비활성화)
+DB_IDLE_TX_TIMEOUT_MS = int(os.getenv('DB_IDLE_TX_TIMEOUT_MS', 60000))
+
+# 작업별 statement_timeout 예산 (밀리초)
+STATEMENT_TIMEOUTS = {
+    'search': int(os.getenv('DB_TIMEOUT_SEARCH_MS', 5000)),
+    'list': int(os.getenv('DB_TIMEOUT_LIST_MS', 10000)),
+    'export': int(os.getenv('DB_TIMEOUT_EXPORT_MS', 120000)),
+    'stats': int(os.getenv('DB_TIMEOUT_STATS_MS', 3000)),
+    'lookup': int(os.getenv('DB_TIMEOUT_LOOKUP_MS', 1000)),
+    'default': int(os.getenv('DB_TIMEOUT_DEFAULT_MS', 15000)),
+}
+
+# 서킷 브레이커: 연속 실패 횟수 임계값과 백그라운드 상태 확인 주기 (초)
+DB_BREAKER_FAILURE_THRESHOLD = int(os.getenv('DB_BREAKER_FAILURE_THRESHOLD', 3))
+DB_BREAKER_PROBE_INTERVAL = float(os.getenv('DB_BREAKER_PROBE_INTERVAL', 5))
+
+# 백그라운드 작업 (웹 앱의 /api/jobs 가져오기/내보내기)
+# JOB_WORKERS: 동시에 실행하는 작업 수, JOB_QUEUE_LIMIT: 대기+실행 중인 작업 수 상한
+# JOB_DIR: 업로드 파일과 결과 파일을 두는 디렉터리, JOB_RETENTION_HOURS: 완료된 작업을 보관하는 시간
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', 20))
+JOB_DIR = os.getenv('JOB_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_files'))
+JOB_RETENTION_HOURS = int(os.getenv('JOB_RETENTION_HOURS', 24))
+
+# 폐기 자산 보관 (/api/jobs/archive)
+# ARCHIVE_AFTER_DAYS: 폐기된 뒤 보관 테이블로 옮기기까지의 일수, ARCHIVE_BATCH_SIZE: 한 배치(트랜잭션)에서 옮기는 자산 수
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 1000))
+
+# 모델명 자동 완성 (/api/suggest)
+# SUGGEST_LIMIT: 돌려주는 최대 모델명 수, SUGGEST_REFRESH_SECONDS: 다른 프로세스의 변경을 반영하기 위해 색인을 다시 만드는 주기
+SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 10))
+SUGGEST_REFRESH_SECONDS = int(os.getenv('SUGGEST_REFRESH_SECONDS', 300))
+
+# 조회 결과 캐시 (/api/search, /api/statistics)
+# REQUEST_CACHE_TTL_SECONDS: 결과를 재사용하는 시간 (0이면 캐시하지 않고 동시 요청만 합침), REQUEST_CACHE_MAX_ENTRIES: 캐시 항목 수 상한
+REQUEST_CACHE_TTL_SECONDS = float(os.getenv('REQUEST_CACHE_TTL_SECONDS', 5))
+REQUEST_CACHE_MAX_ENTRIES = int(os.getenv('REQUEST_CACHE_MAX_ENTRIES', 256))
@@ -1,37 +1,196 @@
 import psycopg2
+import psycopg2.errors
 from psycopg2.extras import RealDictCursor
-from DC_config import DB_CONFIG
+from psycopg2.extensions import QueryCanceledError
+from DC_config import DB_CONFIG, DB_CONNECT_TIMEOUT, DB_WARMUP_TIMEOUT, DB_AUTO_MIGRATE, DB_IDLE_TX_TIMEOUT_MS
+from DC_config import STATEMENT_TIMEOUTS, DB_BREAKER_FAILURE_THRESHOLD, DB_BREAKER_PROBE_INTERVAL
+from circuit_breaker import CircuitBreaker
+from query_watchdog import QueryWatchdog
+from schema_migrations import SchemaMigrator, MigrationError
+from db_statements import statements, StatementRegistry
 import logging
+import threading
 import time
+from contextlib import contextmanager
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 연결 옵션: 연결 타임아웃, 진단용 application_name, 유휴 트랜잭션 서버 측 제한
+CONNECT_OPTIONS = {
+    'connect_timeout': DB_CONNECT_TIMEOUT,
+    'application_name': 'it_asset_manager',
+    'options': f'-c idle_in_transaction_session_timeout={DB_IDLE_TX_TIMEOUT_MS}',
+}
+
+# statement_timeout 예산을 넘긴 뒤 클라이언트 측에서 취소를 보내기까지의 여유 시간 (초)
+WATCHDOG_GRACE_SECONDS = 2
+
+ROLLBACK_FAILED_MESSAGE = "롤백 실패: {}"
+CANCELLED_MESSAGE = "요청이 취소되었습니다"
+
+
+class RequestCancelledError(QueryCanceledError):
+    """cancel_query()로 의도적으로 취소된 쿼리 (statement_timeout 초과나 감시 타이머의 취소와 구분)"""
+
 class DockerDatabaseManager:
+    """PostgreSQL 연결을 관리합니다.
+
+    생성 시에는 연결하지 않습니다. 첫 쿼리에서 연결하거나,
+    start_warmup()으로 백그라운드에서 미리 연결해 둘 수 있습니다.
+    """
+
     def __init__(self):
         self.connection = None
-        self.connect_with_retry()
-    
-    def connect_with_retry(self, max_retries=30, delay=2):
-        """Docker 컨테이너가 완전히 시작될 때까지 재시도하며 연결합니다."""
+        self.state = 'idle'  # idle / connecting / connected / failed
+        self.last_error = None
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._warmup_thread = None
+        # 공유 연결에서 쿼리와 트랜잭션이 스레드 간에 섞이지 않도록 직렬화
+        self._query_lock = threading.RLock()
+        self._tx_depth = 0
+        self._tx_stats = {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+        # statement_timeout, 쿼리 취소, 서킷 브레이커 상태
+        self._local = threading.local()
+        self._active_lock = threading.Lock()
+        self._active_token = None
+        self._cancelled = set()
+        self._current_timeout = None
+        # 서버가 statement_timeout에 응답하지 않아 감시 타이머가 취소한 토큰 (연결 이상으로 집계)
+        self._stalled = set()
+        self._watchdog = QueryWatchdog(self._watchdog_expired)
+        # 현재 연결에서 PREPARE가 끝난 statement 이름 (재연결 시 초기화)
+        self._prepared = set()
+        # stream_query()가 사용 중인 전용 연결 (취소 토큰 -> 연결)
+        self._streams = {}
+        self.breaker = CircuitBreaker(
+            self._probe,
+            failure_threshold=DB_BREAKER_FAILURE_THRESHOLD,
+            probe_interval=DB_BREAKER_PROBE_INTERVAL,
+        )
+
+    def start_warmup(self, timeout=DB_WARMUP_TIMEOUT):
+        """백그라운드 스레드에서 최대 timeout초 동안 연결을 시도합니다."""
+        with self._lock:
+            if self.is_connected():
+                return
+            if self._warmup_thread is not None and self._warmup_thread.is_alive():
+                return
+            self.state = 'connecting'
+            self._ready.clear()
+            self._warmup_thread = threading.Thread(
+                target=self._warmup, args=(timeout,), name='db-warmup', daemon=True
+            )
+            self._warmup_thread.start()
+
+    def _warmup(self, timeout):
+        try:
+            self.connect_with_retry(timeout=timeout)
+        except (psycopg2.Error, MigrationError):
+            # 실패 상태와 오류는 connect_with_retry에서 기록됨
+            pass
+
+    def connect_with_retry(self, max_retries=30, delay=2, timeout=None):
+        """Docker 컨테이너가 완전히 시작될 때까지 재시도하며 연결합니다.
+
+        timeout을 지정하면 재시도 횟수와 관계없이 해당 시간(초) 안에 끝납니다.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        self.state = 'connecting'
         for attempt in range(max_retries):
             try:
-                self.connection = psycopg2.connect(**DB_CONFIG)
-                logger.info("✅ PostgreSQL 데이터베이스에 성공적으로 연결되었습니다!")
-                return
+                connection = psycopg2.connect(**CONNECT_OPTIONS, **DB_CONFIG)
             except psycopg2.OperationalError as e:
-                if attempt < max_retries - 1:
+                self.last_error = e
+                out_of_time = deadline is not None and time.monotonic() + delay >= deadline
+                if attempt < max_retries - 1 and not out_of_time:
                     logger.info(f"⏳ 데이터베이스 연결 대기 중... ({attempt + 1}/{max_retries})")
                     time.sleep(delay)
-                else:
-                    logger.error(f"❌ 데이터베이스 연결 실패: {e}")
-                    raise
-    
+                    continue
+                logger.error(f"❌ 데이터베이스 연결 실패: {e}")
+                self.state = 'failed'
+                self._ready.set()
+                raise
+
+            try:
+                self._prepare_connection(connection)
+            except (psycopg2.Error, MigrationError) as e:
+                logger.error(f"❌ 데이터베이스 스키마 확인 실패: {e}")
+                connection.close()
+                self.last_error = e
+                self.state = 'failed'
+                self._ready.set()
+                raise
+
+            self._set_connection(connection)
+            logger.info("✅ PostgreSQL 데이터베이스에 성공적으로 연결되었습니다!")
+            return
+
+    def _prepare_connection(self, connection):
+        """새 연결에서 스키마 버전을 확인하고 (필요 시 마이그레이션 적용) autocommit으로 전환합니다."""
+        version = SchemaMigrator(connection).ensure_schema(auto_migrate=DB_AUTO_MIGRATE)
+        logger.info(f"데이터베이스 스키마 버전: {version}")
+        # 단건 조회가 트랜잭션을 열어 둔 채 남지 않도록 기본은 autocommit,
+        # 여러 문장을 묶을 때만 transaction()으로 명시적으로 시작합니다.
+        connection.autocommit = True
+
+    def _set_connection(self, connection):
+        with self._lock:
+            if self.is_connected():
+                # 다른 스레드가 먼저 연결에 성공한 경우
+                connection.close()
+            else:
+                self.connection = connection
+                self._current_timeout = None
+                self._prepared = set()
+            self.state = 'connected'
+            self.last_error = None
+        self._ready.set()
+
+    def is_connected(self):
+        """사용 가능한 연결이 있는지 확인합니다."""
+        return self.connection is not None and not self.connection.closed
+
+    def ensure_connected(self, timeout=DB_CONNECT_TIMEOUT):
+        """연결을 반환합니다. 없으면 첫 사용 시점에 연결합니다.
+
+        워밍업이 진행 중이면 최대 timeout초만 기다리고, 그래도 연결되지 않으면
+        OperationalError를 발생시킵니다.
+        """
+        if self.is_connected():
+            return self.connection
+
+        warmup = self._warmup_thread
+        if warmup is not None and warmup.is_alive():
+            self._ready.wait(timeout)
+            if self.is_connected():
+                return self.connection
+            raise psycopg2.OperationalError("데이터베이스에 연결하는 중입니다. 잠시 후 다시 시도하세요.")
+
+        with self._lock:
+            if not self.is_connected():
+                self.connection = None
+                self.connect_with_retry(max_retries=1)
+        return self.connection
+
+    def status(self):
+        """연결 상태를 반환합니다 (웹/GUI 상태 표시용)."""
+        if self.breaker.state == CircuitBreaker.OPEN:
+            state = 'unavailable'
+        else:
+            state = 'connected' if self.is_connected() else self.state
+        return {
+            'state': state,
+            'error': str(self.last_error) if self.last_error else None,
+            'breaker': self.breaker.status(),
+        }
+
     def test_connection(self):
         """데이터베이스 연결을 테스트합니다."""
         try:
-            cursor = self.connection.cursor()
+            cursor = self.ensure_connected().cursor()
             cursor.execute("SELECT version();")
             version = cursor.fetchone()
             logger.info(f"PostgreSQL 버전: {version[0]}")
@@ -40,36 +199,294 @@ class DockerDatabaseManager:
         except Exception as e:
             logger.error(f"연결 테스트 실패: {e}")
             return False
-    
+
     def close(self):
         """데이터베이스 연결을 종료합니다."""
         if self.connection:
             self.connection.close()
             logger.info("데이터베이스 연결이 종료되었습니다.")
-    
-    def execute_query(self, query, params=None):
-        """쿼리를 실행하고 결과를 반환합니다."""
+
+    def execute_query(self, query, params=None, operation=None):
+        """쿼리를 실행하고 결과를 반환합니다.
+
+        결과 행이 있는 문장(SELECT, RETURNING)은 행 목록을, 그 외에는 영향받은 행 수를 반환합니다.
+        transaction() 블록 밖에서는 autocommit으로 즉시 커밋됩니다.
+        operation('search', 'list', 'export', 'stats')에 따라 statement_timeout 예산이 적용되며,
+        서킷 브레이커가 열려 있으면 CircuitOpenError로 즉시 실패합니다.
+        """
+        self.breaker.allow()
+        with self._query_lock:
+            connection = self._connection_for_query()
+            token = self._scope_token()
+            try:
+                cursor = connection.cursor(cursor_factory=RealDictCursor)
+                with self._guarded(cursor, token, operation):
+                    cursor.execute(query, params)
+
+                    if cursor.description is not None:
+                        result = cursor.fetchall()
+                    else:
+                        result = cursor.rowcount
+
+                cursor.close()
+                return result
+
+            except psycopg2.Error as e:
+                logger.error(f"쿼리 실행 실패: {e}")
+                raise
+
+    def execute_prepared(self, name, params=(), operation=None):
+        """db_statements에 등록된 쿼리를 서버 측 prepared statement로 실행합니다.
+
+        연결마다 처음 한 번만 PREPARE하고 이후에는 EXECUTE만 보냅니다. 재연결 시에는
+        다시 준비되며, 서버에서 statement가 사라졌거나 스키마 변경으로 무효화된 경우
+        트랜잭션 밖이라면 한 번 다시 준비하여 재시도합니다.
+        """
+        statement = statements.get(name)
+        self.breaker.allow()
+        with self._query_lock:
+            connection = self._connection_for_query()
+            token = self._scope_token()
+            for attempt in (1, 2):
+                try:
+                    cursor = connection.cursor(cursor_factory=RealDictCursor)
+                    with self._guarded(cursor, token, operation):
+                        if name not in self._prepared:
+                            cursor.execute(StatementRegistry.prepare_sql(statement))
+                            self._prepared.add(name)
+                        cursor.execute(StatementRegistry.execute_sql(statement), params)
+
+                        if statement.returns_rows:
+                            result = cursor.fetchall()
+                        else:
+                            result = cursor.rowcount
+
+                    cursor.close()
+                    return result
+
+                except (psycopg2.errors.InvalidSqlStatementName, psycopg2.errors.FeatureNotSupported) as e:
+                    # 서버 측 statement 유실 또는 "cached plan must not change result type"
+                    self._prepared.discard(name)
+                    if attempt == 2 or self._tx_depth:
+                        logger.error(f"쿼리 실행 실패: {e}")
+                        raise
+                    if isinstance(e, psycopg2.errors.FeatureNotSupported):
+                        cursor.execute(f"DEALLOCATE {name}")
+                except psycopg2.Error as e:
+                    logger.error(f"쿼리 실행 실패: {e}")
+                    raise
+
+    def _connection_for_query(self):
+        try:
+            return self.ensure_connected()
+        except psycopg2.OperationalError as e:
+            self.breaker.record_failure(e)
+            raise
+
+    # ---- statement_timeout 예산, 취소, 서킷 브레이커 ----
+
+    @contextmanager
+    def request_scope(self, token=None, operation=None):
+        """현재 스레드에서 실행되는 쿼리의 취소 토큰과 작업 종류를 지정합니다.
+
+        token으로 cancel_query()를 호출하면 이 범위의 쿼리가 서버에서 취소되고,
+        operation은 개별 쿼리의 작업 종류보다 우선합니다 (예: 내보내기 중의 목록 조회).
+        """
+        token = token if token is not None else object()
+        previous = (getattr(self._local, 'token', None), getattr(self._local, 'operation', None))
+        self._local.token, self._local.operation = token, operation
+        try:
+            yield token
+        finally:
+            self._local.token, self._local.operation = previous
+            self._cancelled.discard(token)
+
+    def _scope_token(self):
+        token = getattr(self._local, 'token', None)
+        if token is not None and token in self._cancelled:
+            raise RequestCancelledError(CANCELLED_MESSAGE)
+        return token if token is not None else object()
+
+    def cancel_query(self, token):
+        """token 범위의 쿼리를 취소합니다. 실행 중이면 서버에 취소를 보내고 True를 반환합니다."""
+        with self._active_lock:
+            self._cancelled.add(token)
+            stream = self._streams.get(token)
+            if stream is not None:
+                stream.cancel()
+                return True
+            if self._active_token is token and self.is_connected():
+                self.connection.cancel()
+                return True
+        return False
+
+    def _watchdog_expired(self, token):
+        """예산과 여유 시간이 지나도 끝나지 않은 쿼리를 클라이언트 측에서 취소합니다."""
+        with self._active_lock:
+            if self._active_token is not token:
+                return
+            self._stalled.add(token)
+        self.cancel_query(token)
+
+    @contextmanager
+    def _guarded(self, cursor, token, operation):
+        """statement_timeout 적용, 예산 초과 시 클라이언트 측 취소, 결과를 서킷 브레이커에 기록합니다."""
+        operation = getattr(self._local, 'operation', None) or operation or 'default'
+        budget_ms = STATEMENT_TIMEOUTS.get(operation, STATEMENT_TIMEOUTS['default'])
+        if self._current_timeout != budget_ms:
+            cursor.execute("SET statement_timeout = %s", (budget_ms,))
+            self._current_timeout = budget_ms
+
+        # 서버가 statement_timeout에 응답하지 못하는 경우(네트워크 정체 등)를 위한 감시 타이머
+        with self._active_lock:
+            self._active_token = token
+        watchdog = self._watchdog.arm(token, budget_ms / 1000 + WATCHDOG_GRACE_SECONDS)
+        try:
+            yield
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            if not isinstance(e, QueryCanceledError) or token in self._stalled:
+                # 연결 수준의 오류만 실패로 집계 (statement_timeout과 취소는 그 요청만 504로 실패)
+                self.breaker.record_failure(e)
+            elif token in self._cancelled:
+                raise RequestCancelledError(CANCELLED_MESSAGE) from e
+            raise
+        else:
+            self.breaker.record_success()
+        finally:
+            self._watchdog.disarm(watchdog)
+            with self._active_lock:
+                self._active_token = None
+                self._stalled.discard(token)
+                if token is not getattr(self._local, 'token', None):
+                    # 범위 밖의 일회성 토큰은 감시 타이머가 늦게 울렸더라도 남기지 않음
+                    self._cancelled.discard(token)
+
+    def stream_query(self, query, params=None, batch_size=10000, operation='export'):
+        """서버 측 커서로 결과를 batch_size 행씩 읽어 행 목록을 차례로 생성합니다.
+
+        대용량 내보내기가 공유 연결을 오래 점유하지 않도록 전용 연결의 READ ONLY 트랜잭션에서
+        실행하며, 메모리에는 한 번에 한 배치만 올라갑니다. statement_timeout 예산은 FETCH마다
+        적용되고, request_scope 토큰으로 cancel_query()를 호출하면 전용 연결의 쿼리가 취소됩니다.
+        """
+        self.breaker.allow()
+        token = self._scope_token()
+        operation = getattr(self._local, 'operation', None) or operation
+        budget_ms = STATEMENT_TIMEOUTS.get(operation, STATEMENT_TIMEOUTS['default'])
+        try:
+            connection = psycopg2.connect(**CONNECT_OPTIONS, **DB_CONFIG)
+        except psycopg2.OperationalError as e:
+            self.breaker.record_failure(e)
+            raise
+
+        with self._active_lock:
+            self._streams[token] = connection
         try:
-            cursor = self.connection.cursor(cursor_factory=RealDictCursor)
+            connection.set_session(readonly=True)
+            with connection.cursor() as cursor:
+                cursor.execute("SET statement_timeout = %s", (budget_ms,))
+            cursor = connection.cursor(name='stream_query', cursor_factory=RealDictCursor)
+            cursor.itersize = batch_size
             cursor.execute(query, params)
-            
-            if query.strip().upper().startswith('SELECT'):
-                result = cursor.fetchall()
-            else:
-                self.connection.commit()
-                result = cursor.rowcount
-            
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
             cursor.close()
-            return result
-            
-        except psycopg2.Error as e:
-            logger.error(f"쿼리 실행 실패: {e}")
-            self.connection.rollback()
+            connection.rollback()
+            self.breaker.record_success()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            logger.error(f"스트리밍 조회 실패: {e}")
+            if not isinstance(e, QueryCanceledError):
+                self.breaker.record_failure(e)
+            elif token in self._cancelled:
+                raise RequestCancelledError(CANCELLED_MESSAGE) from e
             raise
-    
+        finally:
+            with self._active_lock:
+                self._streams.pop(token, None)
+            connection.close()
+
+    def _probe(self):
+        """서킷 브레이커 상태 확인: 별도의 짧은 연결로 SELECT 1을 실행합니다."""
+        connection = psycopg2.connect(**CONNECT_OPTIONS, **DB_CONFIG)
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        finally:
+            connection.close()
+
+    @contextmanager
+    def transaction(self, readonly=False):
+        """명시적 작업 단위입니다.
+
+        블록 안의 쿼리는 하나의 트랜잭션으로 커밋되고, 예외가 발생하면 롤백됩니다.
+        블록 밖의 쿼리는 autocommit으로 실행되므로 유휴 트랜잭션을 남기지 않습니다.
+        중첩된 호출은 바깥 트랜잭션에 합류합니다.
+        """
+        with self._query_lock:
+            if self._tx_depth:
+                self._tx_depth += 1
+                try:
+                    yield self
+                finally:
+                    self._tx_depth -= 1
+                return
+
+            self.breaker.allow()
+            connection = self._connection_for_query()
+            cursor = connection.cursor()
+            cursor.execute("BEGIN READ ONLY" if readonly else "BEGIN")
+            self._tx_depth = 1
+            started = time.monotonic()
+            try:
+                yield self
+                cursor.execute("COMMIT")
+            except BaseException:
+                # 롤백되면 트랜잭션 안에서 바꾼 statement_timeout도 되돌아가므로 다시 설정하도록 표시
+                self._current_timeout = None
+                if not connection.closed:
+                    try:
+                        cursor.execute("ROLLBACK")
+                    except psycopg2.Error as rollback_error:
+                        logger.error(ROLLBACK_FAILED_MESSAGE.format(rollback_error))
+                raise
+            finally:
+                self._tx_depth = 0
+                self._record_transaction(time.monotonic() - started)
+                cursor.close()
+
+    def _record_transaction(self, seconds):
+        stats = self._tx_stats
+        stats['count'] += 1
+        stats['total_seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+    def transaction_diagnostics(self):
+        """트랜잭션 진단 정보를 반환합니다.
+
+        local: 이 프로세스에서 연 트랜잭션의 횟수와 지속 시간
+        idle_in_transaction: 현재 데이터베이스에서 트랜잭션을 연 채 유휴 상태인 세션과 유휴 시간
+        """
+        local = dict(self._tx_stats)
+        local['in_transaction'] = bool(self._tx_depth)
+        local['average_seconds'] = local['total_seconds'] / local['count'] if local['count'] else 0.0
+        sessions = self.execute_query("""
+            SELECT pid, usename, application_name, client_addr::text AS client_addr, state,
+                   EXTRACT(EPOCH FROM now() - xact_start)::float AS transaction_seconds,
+                   EXTRACT(EPOCH FROM now() - state_change)::float AS idle_seconds,
+                   LEFT(query, 200) AS last_query
+            FROM pg_stat_activity
+            WHERE datname = current_database()
+              AND state IN ('idle in transaction', 'idle in transaction (aborted)')
+            ORDER BY xact_start
+        """)
+        return {'local': local, 'idle_in_transaction': sessions}
+
     def get_connection(self):
         """데이터베이스 연결 객체를 반환합니다."""
-        return self.connection
+        return self.ensure_connected()
 
-# Docker 데이터베이스 매니저 인스턴스 생성
+# Docker 데이터베이스 매니저 인스턴스 생성 (연결은 첫 사용 시 또는 start_warmup() 호출 시)
 db_manager = DockerDatabaseManager()
@@ -1,7 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
-from PS_asset_manager import ITAssetManager
+from asset_attributes import ATTRIBUTE_SCHEMAS
+from PS_asset_manager import ConflictError, ITAssetManager
 import logging
 from datetime import datetime
 import sys
@@ -10,24 +11,47 @@ import sys
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _form_value(value):
+    """다이얼로그 입력값과 저장된 값을 비교하기 위한 표현 (None과 빈 값은 같음)"""
+    if isinstance(value, dict):
+        return {key: _form_value(item) for key, item in value.items() if _form_value(item) != ""}
+    return "" if value is None else str(value)
+
 class ITAssetManagerGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("IT Asset Manager (PostgreSQL)")
         self.root.geometry("1200x700")
         
-        # 자산 매니저 초기화
-        try:
-            self.manager = ITAssetManager()
-            logger.info("Asset manager initialized successfully")
-        except Exception as e:
-            messagebox.showerror("Database Error", f"데이터베이스 연결에 실패했습니다:\n{str(e)}")
-            logger.error(f"Failed to initialize asset manager: {e}")
-            sys.exit(1)
+        # 자산 매니저 초기화 (연결은 백그라운드에서 진행되므로 창이 바로 표시됩니다)
+        self.manager = ITAssetManager()
         
         self.setup_ui()
-        self.refresh_treeview()
-        self.load_statistics()
+        self.connect_database()
+    
+    def connect_database(self):
+        """백그라운드 연결을 시작하고 완료될 때까지 상태를 폴링합니다."""
+        self.db_status_var.set("데이터베이스 연결 중...")
+        self.manager.db.start_warmup()
+        self.root.after(200, self.poll_database)
+    
+    def poll_database(self):
+        """연결 상태를 확인하여 연결되면 데이터를 불러옵니다."""
+        status = self.manager.db.status()
+        if status['state'] == 'connected':
+            self.db_status_var.set("데이터베이스 연결됨")
+            logger.info("Asset manager initialized successfully")
+            self.refresh_treeview()
+        elif status['state'] == 'failed':
+            self.db_status_var.set("데이터베이스 연결 실패")
+            logger.error(f"Failed to initialize asset manager: {status['error']}")
+            if messagebox.askretrycancel("Database Error", f"데이터베이스 연결에 실패했습니다:\n{status['error']}"):
+                self.connect_database()
+            else:
+                self.root.destroy()
+                sys.exit(1)
+        else:
+            self.root.after(200, self.poll_database)
     
     def setup_ui(self):
         """UI 구성요소를 설정합니다."""
@@ -46,6 +70,10 @@ class ITAssetManagerGUI:
         
         # 버튼 프레임
         self.setup_button_frame(main_frame)
+        
+        # 연결 상태 표시줄
+        self.db_status_var = tk.StringVar(value="")
+        ttk.Label(main_frame, textvariable=self.db_status_var, foreground='gray').pack(fill='x', pady=(5, 0))
     
     def setup_statistics_frame(self, parent):
         """통계 정보를 표시하는 프레임을 설정합니다."""
@@ -100,6 +128,14 @@ class ITAssetManagerGUI:
         # 전체 보기 버튼
         clear_search_button = ttk.Button(search_frame, text="전체 보기", command=self.clear_search)
         clear_search_button.pack(side='left')
+        
+        # 보관 테이블로 옮긴 폐기 자산도 목록/검색/통계에 포함
+        self.include_archived_var = tk.BooleanVar(value=False)
+        include_archived_check = ttk.Checkbutton(
+            search_frame, text="보관된 폐기 자산 포함", variable=self.include_archived_var,
+            command=self.refresh_treeview
+        )
+        include_archived_check.pack(side='left', padx=(10, 0))
     
     def setup_treeview_frame(self, parent):
         """트리뷰 프레임을 설정합니다."""
@@ -133,6 +169,9 @@ class ITAssetManagerGUI:
         tree_frame.grid_rowconfigure(0, weight=1)
         tree_frame.grid_columnconfigure(0, weight=1)
         
+        # 보관된 자산은 회색으로 표시 (조회만 가능)
+        self.tree.tag_configure('archived', foreground='gray')
+        
         # 더블클릭 이벤트
         self.tree.bind("<Double-1>", self.on_tree_double_click)
     
@@ -154,6 +193,9 @@ class ITAssetManagerGUI:
         delete_button = ttk.Button(left_buttons, text="자산 삭제", command=self.on_delete_asset)
         delete_button.pack(side='left', padx=(0, 10))
         
+        bulk_status_button = ttk.Button(left_buttons, text="상태 일괄 변경", command=self.on_bulk_status)
+        bulk_status_button.pack(side='left', padx=(0, 10))
+        
         # 오른쪽 버튼들
         right_buttons = ttk.Frame(button_frame)
         right_buttons.pack(side='right')
@@ -173,10 +215,10 @@ class ITAssetManagerGUI:
         
         try:
             search_field = self.search_field_var.get()
-            if search_field == "all":
-                assets = self.manager.search_assets(search_term)
-            else:
-                assets = self.manager.search_assets(search_term, search_field)
+            assets = self.manager.search_assets(
+                search_term, None if search_field == "all" else search_field,
+                include_archived=self.include_archived_var.get()
+            )
             
             self.display_assets(assets)
             messagebox.showinfo("검색 완료", f"'{search_term}' 검색 결과: {len(assets)}개 자산")
@@ -208,12 +250,12 @@ class ITAssetManagerGUI:
                 asset_data["Status"],
                 asset_data["Location"],
                 asset_data["Reason"]
-            ))
+            ), tags=('archived',) if asset_data.get("Archived At") else ())
     
     def refresh_treeview(self):
         """트리뷰를 새로고침합니다."""
         try:
-            assets = self.manager.list_assets()
+            assets = self.manager.list_assets(include_archived=self.include_archived_var.get())
             self.display_assets(assets)
             self.load_statistics()
         except Exception as e:
@@ -223,7 +265,7 @@ class ITAssetManagerGUI:
     def load_statistics(self):
         """통계 정보를 로드합니다."""
         try:
-            stats = self.manager.get_asset_statistics()
+            stats = self.manager.get_asset_statistics(include_archived=self.include_archived_var.get())
             for key, label in self.stats_labels.items():
                 value = stats.get(key, 0)
                 label.config(text=str(value))
@@ -246,14 +288,57 @@ class ITAssetManagerGUI:
         if not selected_item:
             messagebox.showerror("오류", "수정할 자산을 선택해주세요.")
             return
+        if self._is_archived(selected_item):
+            messagebox.showinfo("안내", "보관된 폐기 자산은 수정할 수 없습니다.")
+            return
         self.manage_asset_dialog("자산 수정", asset_id=int(selected_item))
     
+    def _is_archived(self, item):
+        return 'archived' in self.tree.item(item, 'tags')
+    
+    def on_bulk_status(self):
+        """선택한 자산(Ctrl/Shift로 여러 개 선택)의 상태를 한 번에 바꿉니다."""
+        selected_items = self.tree.selection()
+        if not selected_items:
+            messagebox.showerror("오류", "상태를 바꿀 자산을 선택해주세요.")
+            return
+        
+        dialog = tk.Toplevel(self.root)
+        dialog.title("상태 일괄 변경")
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        ttk.Label(dialog, text=f"선택한 자산 {len(selected_items)}개의 상태").grid(row=0, column=0, padx=10, pady=10)
+        status_box = ttk.Combobox(dialog, values=["입고", "대기", "운영", "유휴", "폐기"], state="readonly", width=15)
+        status_box.grid(row=0, column=1, padx=10, pady=10)
+        
+        def submit():
+            if not status_box.get():
+                messagebox.showerror("오류", "변경할 상태를 선택해주세요.", parent=dialog)
+                return
+            try:
+                result = self.manager.bulk_update([int(item) for item in selected_items], {"Status": status_box.get()})
+                messagebox.showinfo("완료", f"자산 {result['updated']}건의 상태가 변경되었습니다.")
+                self.refresh_treeview()
+                dialog.destroy()
+            except Exception as e:
+                messagebox.showerror("오류", f"상태 변경 중 오류가 발생했습니다:\n{str(e)}", parent=dialog)
+                logger.error(f"Error bulk updating status: {e}")
+        
+        button_frame = ttk.Frame(dialog)
+        button_frame.grid(row=1, column=0, columnspan=2, pady=10)
+        ttk.Button(button_frame, text="변경", command=submit).pack(side='left', padx=10)
+        ttk.Button(button_frame, text="취소", command=dialog.destroy).pack(side='left', padx=10)
+    
     def on_delete_asset(self):
         """자산 삭제를 확인합니다."""
         selected_item = self.tree.focus()
         if not selected_item:
             messagebox.showerror("오류", "삭제할 자산을 선택해주세요.")
             return
+        if self._is_archived(selected_item):
+            messagebox.showinfo("안내", "보관된 폐기 자산은 삭제할 수 없습니다.")
+            return
         
         if messagebox.askyesno("확인", "선택한 자산을 삭제하시겠습니까?"):
             try:
@@ -268,7 +353,7 @@ class ITAssetManagerGUI:
         """자산 관리 다이얼로그를 엽니다."""
         dialog = tk.Toplevel(self.root)
         dialog.title(title)
-        dialog.geometry("500x400")
+        dialog.geometry("500x600")
         dialog.transient(self.root)
         dialog.grab_set()
         
@@ -280,7 +365,9 @@ class ITAssetManagerGUI:
             ("Warranty", "Warranty", None),
             ("Status", "Status", ["입고", "대기", "운영", "유휴", "폐기"]),
             ("Location", "Location", ["본사 서버실", "개인지급", "프로젝트장소", "기타"]),
-            ("Reason", "Reason", None)
+            ("Reason", "Reason", None),
+            ("Asset Tag", "Asset Tag", None),
+            ("Serial Number", "Serial Number", None)
         ]
         
         entries = {}
@@ -301,24 +388,52 @@ class ITAssetManagerGUI:
             widget.grid(row=i, column=1, sticky='w', padx=10, pady=5)
             entries[key] = widget
         
-        # 기존 데이터 로드
+        # 유형별 속성 (유형을 바꾸면 새 유형의 스키마로 다시 그리며, 같은 키의 입력값은 유지)
+        attribute_frame = ttk.LabelFrame(dialog, text="속성")
+        attribute_frame.grid(row=len(form_fields), column=0, columnspan=2, sticky='ew', padx=10, pady=5)
+        attribute_entries = {}
+        
+        def render_attributes(values):
+            for child in attribute_frame.winfo_children():
+                child.destroy()
+            attribute_entries.clear()
+            for row, field in enumerate(ATTRIBUTE_SCHEMAS.get(entries["Type"].get(), [])):
+                ttk.Label(attribute_frame, text=field.label).grid(row=row, column=0, sticky='w', padx=10, pady=3)
+                entry = ttk.Entry(attribute_frame, width=30)
+                value = values.get(field.key)
+                entry.insert(0, "" if value is None else str(value))
+                entry.grid(row=row, column=1, sticky='w', padx=10, pady=3)
+                attribute_entries[field.key] = entry
+        
+        entries["Type"].bind(
+            "<<ComboboxSelected>>",
+            lambda event: render_attributes({key: entry.get() for key, entry in attribute_entries.items()})
+        )
+        
+        # 기존 데이터 로드 (수정 시 바뀐 필드만 저장하기 위해 loaded에 보관)
+        loaded = {}
         if asset_id:
             try:
                 asset = self.manager.get_asset(asset_id)
                 if asset:
+                    loaded.update(asset)
                     for key, widget in entries.items():
                         if key == "Purchase Date":
                             if asset[key]:
                                 widget.set_date(asset[key])
-                        else:
+                        elif isinstance(widget, ttk.Combobox):
                             widget.set(asset[key] if asset[key] else "")
+                        else:
+                            widget.delete(0, tk.END)
+                            widget.insert(0, asset[key] if asset[key] else "")
+                    render_attributes(asset["Attributes"] or {})
             except Exception as e:
                 messagebox.showerror("오류", f"자산 데이터를 불러오는 중 오류가 발생했습니다:\n{str(e)}")
                 logger.error(f"Error loading asset data: {e}")
         
         # 버튼 프레임
         button_frame = ttk.Frame(dialog)
-        button_frame.grid(row=len(form_fields), column=0, columnspan=2, pady=20)
+        button_frame.grid(row=len(form_fields) + 1, column=0, columnspan=2, pady=20)
         
         def submit():
             try:
@@ -328,17 +443,31 @@ class ITAssetManagerGUI:
                         asset_data[key] = widget.get_date()
                     else:
                         asset_data[key] = widget.get()
+                asset_data["Attributes"] = {key: entry.get() for key, entry in attribute_entries.items()}
                 
                 if title == "자산 추가":
                     self.manager.add_asset(asset_data)
                     messagebox.showinfo("완료", "자산이 추가되었습니다.")
                 else:
-                    self.manager.update_asset(asset_id, asset_data)
-                    messagebox.showinfo("완료", "자산이 수정되었습니다.")
+                    changes = {
+                        key: value for key, value in asset_data.items()
+                        if _form_value(value) != _form_value(loaded.get(key))
+                    }
+                    if changes:
+                        # 다이얼로그를 여는 동안 행 잠금 없이, 불러온 버전과 같을 때만 수정
+                        self.manager.patch_asset(asset_id, changes, expected_version=loaded.get("Version"))
+                        messagebox.showinfo("완료", "자산이 수정되었습니다.")
                 
                 self.refresh_treeview()
                 dialog.destroy()
                 
+            except ConflictError:
+                messagebox.showwarning(
+                    "수정 충돌",
+                    "다른 사용자가 이 자산을 먼저 수정했습니다.\n목록을 새로 고친 뒤 다시 열어 최신 내용으로 수정하세요."
+                )
+                self.refresh_treeview()
+                dialog.destroy()
             except Exception as e:
                 messagebox.showerror("오류", f"자산 저장 중 오류가 발생했습니다:\n{str(e)}")
                 logger.error(f"Error saving asset: {e}")
@@ -350,24 +479,30 @@ class ITAssetManagerGUI:
         cancel_button.pack(side='left', padx=10)
     
     def export_data(self):
-        """데이터를 CSV로 내보냅니다."""
+        """데이터를 CSV / Excel / Parquet / Arrow 파일로 내보냅니다."""
         try:
             from datetime import datetime
-            import csv
+            from tkinter import filedialog
+            from asset_export import export_assets, format_for_path
             
-            filename = f"asset_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            filename = filedialog.asksaveasfilename(
+                title="내보내기",
+                initialfile=f"asset_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                defaultextension=".csv",
+                filetypes=[
+                    ("CSV", "*.csv"),
+                    ("Excel", "*.xlsx"),
+                    ("Parquet", "*.parquet"),
+                    ("Arrow IPC", "*.arrow"),
+                ],
+            )
+            if not filename:
+                return
             
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-                fieldnames = ["ID", "Type", "Model", "Purchase Date", "Warranty", "Status", "Location", "Reason"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                assets = self.manager.list_assets()
-                for asset_id, asset_data in assets.items():
-                    row = {"ID": asset_id, **asset_data}
-                    writer.writerow(row)
+            # 서버 측 커서에서 배치 단위로 읽어 쓰므로 건수와 관계없이 메모리 사용량이 일정함
+            count = export_assets(self.manager, format_for_path(filename), filename)
             
-            messagebox.showinfo("내보내기 완료", f"데이터가 {filename} 파일로 내보내졌습니다.")
+            messagebox.showinfo("내보내기 완료", f"데이터 {count:,}건이 {filename} 파일로 내보내졌습니다.")
             
         except Exception as e:
             messagebox.showerror("내보내기 오류", f"데이터 내보내기 중 오류가 발생했습니다:\n{str(e)}")
@@ -1,83 +1,429 @@
 from PS_database import db_manager
+from asset_attributes import validate_attributes
+from db_statements import STATISTICS_COLUMNS
+import psycopg2
 import logging
 from datetime import datetime
 import json
+import threading
 
 logger = logging.getLogger(__name__)
 
+# 검색할 수 있는 컬럼 (search_field는 이 목록에 있는 값만 허용)
+SEARCH_FIELDS = ('asset_type', 'model', 'status', 'location', 'reason')
+
+# ENUM 컬럼 -> (자산 딕셔너리의 키, ENUM 타입)
+ENUM_COLUMNS = {
+    'asset_type': ('Type', 'asset_type_enum'),
+    'status': ('Status', 'asset_status_enum'),
+    'location': ('Location', 'asset_location_enum'),
+}
+
+# location_id의 하위 트리(자신 포함)에 속한 자산 조건 (매개변수 하나: 위치 ID)
+SUBTREE_CONDITION = "location_id IN (SELECT descendant_id FROM location_closure WHERE ancestor_id = %s)"
+
+# 위치 목록과 경로 (closure에서 조상 이름을 깊이 순서로 이어 붙임)
+LIST_LOCATIONS = """
+    SELECT l.id, l.parent_id, l.name, l.kind, l.legacy_location,
+           MAX(c.depth) AS depth,
+           string_agg(ancestor.name, ' > ' ORDER BY c.depth DESC) AS path
+    FROM locations l
+    JOIN location_closure c ON c.descendant_id = l.id
+    JOIN locations ancestor ON ancestor.id = c.ancestor_id
+    GROUP BY l.id
+    ORDER BY path
+"""
+
+# 한 번의 일괄 조회(lookup_assets)에서 받을 수 있는 태그 수
+MAX_LOOKUP_TAGS = 1000
+
+# 자산 딕셔너리의 키 -> 컬럼
+ASSET_COLUMNS = {
+    "Type": 'asset_type',
+    "Model": 'model',
+    "Purchase Date": 'purchase_date',
+    "Warranty": 'warranty',
+    "Status": 'status',
+    "Location": 'location',
+    "Reason": 'reason',
+    "Location ID": 'location_id',
+    "Attributes": 'attributes',
+    "Asset Tag": 'asset_tag',
+    "Serial Number": 'serial_number',
+}
+
+# bulk_update로 바꿀 수 있는 필드 (유형은 속성 스키마가 달라지므로 자산별로 수정)
+BULK_FIELDS = ("Model", "Purchase Date", "Warranty", "Status", "Location", "Reason", "Location ID")
+
+# bulk_update 필터 키 -> 조건 (location_id는 하위 위치 포함)
+BULK_FILTERS = {
+    "location_id": SUBTREE_CONDITION,
+    "Type": "asset_type = %s",
+    "Status": "status = %s",
+    "Location": "location = %s",
+}
+
+# 한 번의 bulk_update에서 ID 목록으로 지정할 수 있는 자산 수
+MAX_BULK_IDS = 10000
+
+# 목록 한 페이지의 기본/최대 자산 수 (get_dashboard, list_assets의 limit)
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# 패싯: 유형/상태/위치/구매 연도별 건수 (GROUPING(...) 비트 -> 패싯 이름)
+FACETS = ('asset_type', 'status', 'location', 'purchase_year')
+FACET_QUERY = """
+    SELECT CASE GROUPING(asset_type, status, location, purchase_year)
+               WHEN 7 THEN 'asset_type' WHEN 11 THEN 'status' WHEN 13 THEN 'location' ELSE 'purchase_year'
+           END AS facet,
+           COALESCE(asset_type::text, status::text, location::text, purchase_year::text) AS value,
+           COUNT(*) AS count
+    FROM (
+        SELECT asset_type, status, location, EXTRACT(YEAR FROM purchase_date)::int AS purchase_year
+        FROM {source}
+    ) f
+    GROUP BY GROUPING SETS ((asset_type), (status), (location), (purchase_year))
+"""
+
+# assets와 assets_archive에 공통인 컬럼 (assets에 컬럼을 추가하면 보관 테이블과 이 목록에도 추가)
+STORED_COLUMNS = (
+    "id, asset_type, model, purchase_date, warranty, status, location, reason, created_at, updated_at, "
+    "row_fingerprint, location_id, attributes, asset_tag, serial_number, version, disposed_at"
+)
+
+# 폐기된 지 %s일이 지난 자산 최대 %s개를 assets_archive로 옮기는 한 배치
+# 다른 요청이 잠근 행은 SKIP LOCKED로 건너뛰고 다음 실행에서 옮기며, 옮긴 자산마다 이력을 남김
+ARCHIVE_DISPOSED = f"""
+    WITH batch AS (
+        SELECT id FROM assets
+        WHERE status = '폐기' AND disposed_at < CURRENT_TIMESTAMP - make_interval(days => %s)
+        ORDER BY disposed_at
+        LIMIT %s
+        FOR UPDATE SKIP LOCKED
+    ),
+    moved AS (
+        DELETE FROM assets a USING batch WHERE a.id = batch.id
+        RETURNING a.*
+    ),
+    archived AS (
+        INSERT INTO assets_archive ({STORED_COLUMNS})
+        SELECT {STORED_COLUMNS} FROM moved
+        RETURNING id
+    ),
+    history AS (
+        INSERT INTO asset_history (asset_id, action)
+        SELECT id, 'ARCHIVE' FROM archived
+    )
+    SELECT COUNT(*) AS archived FROM archived
+"""
+
+
+def _asset_from_row(row):
+    """assets 행을 API/GUI가 사용하는 자산 딕셔너리로 바꿉니다 (ID 제외)."""
+    return {
+        "Type": row['asset_type'],
+        "Model": row['model'],
+        "Purchase Date": row['purchase_date'],
+        "Warranty": row['warranty'],
+        "Status": row['status'],
+        "Location": row['location'],
+        "Reason": row['reason'],
+        "Location ID": row['location_id'],
+        "Attributes": row['attributes'],
+        "Asset Tag": row['asset_tag'],
+        "Serial Number": row['serial_number'],
+        "Version": row['version']
+    }
+
+
+def _assets_from_rows(rows):
+    """조회 결과를 {ID: 자산} 딕셔너리로 바꿉니다. 보관 테이블을 함께 조회한 행에는 "Archived At"을 붙입니다."""
+    assets = {}
+    for row in rows:
+        asset = _asset_from_row(row)
+        if 'archived_at' in row:
+            asset["Archived At"] = row['archived_at']
+        assets[row['id']] = asset
+    return assets
+
+
+def _asset_source(condition, params, include_archived):
+    """condition(없으면 None)에 맞는 자산 행의 쿼리(ORDER BY 없음)와 매개변수를 만듭니다.
+    
+    include_archived이면 같은 조건으로 assets_archive도 UNION ALL로 읽고, 운영 자산의 archived_at은 NULL입니다.
+    """
+    where = f"WHERE {condition} " if condition else ""
+    if not include_archived:
+        return f"SELECT * FROM assets {where}", list(params)
+    query = f"""
+        SELECT {STORED_COLUMNS}, NULL::timestamp AS archived_at FROM assets {where}
+        UNION ALL
+        SELECT {STORED_COLUMNS}, archived_at FROM assets_archive {where}
+    """
+    return query, list(params) + list(params)
+
+
+def _select_assets(condition, params, include_archived, after_id=None, limit=None):
+    """condition에 맞는 자산을 ID 순서로 조회하는 쿼리와 매개변수를 만듭니다.
+    
+    limit을 주면 after_id 다음 ID부터 limit개만 읽습니다 (키셋 페이지, 기본 키 인덱스 순서로 읽고 멈춤).
+    """
+    source, params = _asset_source(condition, params, include_archived)
+    if limit is None:
+        return f"{source}ORDER BY id", params
+    return f"SELECT * FROM ({source}) s WHERE id > %s ORDER BY id LIMIT %s", params + [after_id or 0, limit]
+
+
+def _page_limit(limit):
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"Page size must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def _facets_from_rows(rows):
+    """FACET_QUERY 결과를 {패싯: [{"value", "count"}, ...]}로 묶고 건수가 많은 순으로 정렬합니다."""
+    facets = {facet: [] for facet in FACETS}
+    for row in rows:
+        facets[row['facet']].append({"value": row['value'], "count": row['count']})
+    for values in facets.values():
+        values.sort(key=lambda item: (-item['count'], item['value'] or ''))
+    return facets
+
+
+class ConflictError(Exception):
+    """다른 사용자가 먼저 수정하여 자산의 현재 버전이 기대한 버전과 다를 때 발생합니다."""
+    
+    def __init__(self, asset_id, expected_version, current_version):
+        super().__init__(
+            f"Asset {asset_id} was modified by another user "
+            f"(expected version {expected_version}, current version {current_version}). Reload and try again."
+        )
+        self.asset_id = asset_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+def _change_query(condition, params, changes, select):
+    """condition(매개변수 params)에 맞는 자산의 일부 컬럼을 바꾸는 한 문장짜리 쿼리와 전체 매개변수를 만듭니다.
+    
+    조건에 맞는 행(잠그지 않음)인 matched, 그중 값이 실제로 다른 행만 FOR UPDATE로 잠근 prev,
+    prev를 쓰는 changed(UPDATE ... RETURNING), 바뀐 행의 이전/새 값을 기록하는 history를 CTE로 묶고
+    select로 결과를 고릅니다. 이미 같은 값인 행은 잠그지도 쓰지도 않습니다.
+    changes의 값은 컬럼에 넣을 형태(속성은 JSON 문자열)여야 합니다.
+    """
+    fields = list(changes)
+    columns = [ASSET_COLUMNS[key] for key in fields]
+    history_fields = list(zip(fields, columns))
+    # location_id를 바꾸면 트리거가 location도 맞추므로 이력에 함께 기록
+    if "Location ID" in changes and "Location" not in changes:
+        history_fields.append(("Location", 'location'))
+    old_json = ', '.join(f"'{key}', p.{column}" for key, column in history_fields)
+    new_json = ', '.join(f"'{key}', c.{column}" for key, column in history_fields)
+    
+    # 잠금을 기다린 뒤에는 최신 행으로 조건과 비교를 다시 평가하므로 prev에도 condition을 둠
+    query = f"""
+        WITH matched AS (
+            SELECT * FROM assets WHERE {condition}
+        ),
+        prev AS (
+            SELECT * FROM assets
+            WHERE {condition}
+              AND ({' OR '.join(f"{column} IS DISTINCT FROM %s" for column in columns)})
+            FOR UPDATE
+        ),
+        changed AS (
+            UPDATE assets a
+            SET {', '.join(f"{column} = %s" for column in columns)}
+            FROM prev
+            WHERE a.id = prev.id
+            RETURNING a.*
+        ),
+        history AS (
+            INSERT INTO asset_history (asset_id, action, old_values, new_values)
+            SELECT c.id, 'UPDATE', jsonb_build_object({old_json}), jsonb_build_object({new_json})
+            FROM changed c
+            JOIN prev p ON p.id = c.id
+        )
+        {select}
+    """
+    values = [changes[key] for key in fields]
+    return query, tuple(params + params + values + values)
+
+
+def _normalize_tag(value):
+    """자산 태그/시리얼 번호의 앞뒤 공백을 제거합니다. 빈 값은 None(태그 없음)입니다."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
 class ITAssetManager:
     def __init__(self):
         self.db = db_manager
+        self._labels = None
+        self._generation = 0
+        self._generation_lock = threading.Lock()
+    
+    @property
+    def generation(self):
+        """데이터 세대 번호. 이 매니저를 통한 변경이 있을 때마다 1씩 증가합니다."""
+        return self._generation
+    
+    def bump_generation(self):
+        """데이터가 바뀌었음을 기록하고 새 세대 번호를 반환합니다.
+        
+        세대 번호로 만든 파생 데이터(모델명 제안 색인 등)는 번호가 바뀌면 다시 만들어집니다.
+        매니저를 거치지 않는 변경(가져오기 작업, 실사 보정)은 호출하는 쪽에서 이 메서드를 부릅니다.
+        """
+        with self._generation_lock:
+            self._generation += 1
+            return self._generation
+    
+    def get_labels(self):
+        """유형/상태/위치의 허용 레이블을 정의 순서대로 반환합니다 ({"Type": (...), "Status": (...), "Location": (...)}).
+        
+        처음 호출될 때 데이터베이스의 ENUM 정의에서 한 번 읽어 캐시하며, 입력 검증과
+        검색어에 맞는 레이블 찾기에 사용합니다. ENUM 정의를 바꾼 뒤에는 refresh_labels()를 호출합니다.
+        """
+        if self._labels is None:
+            try:
+                rows = self.db.execute_prepared('enum_labels')
+            except Exception as e:
+                logger.error(f"Error loading label dictionary: {e}")
+                raise
+            
+            by_type = {}
+            for row in rows:
+                by_type.setdefault(row['enum_type'], []).append(row['label'])
+            self._labels = {
+                key: tuple(by_type.get(enum_type, ()))
+                for key, enum_type in ENUM_COLUMNS.values()
+            }
+        return self._labels
+    
+    def refresh_labels(self):
+        """캐시한 레이블 사전을 버리고 다시 읽습니다."""
+        self._labels = None
+        return self.get_labels()
+    
+    def _validate_labels(self, asset_data):
+        """유형/상태/위치 값이 허용 레이블인지 데이터베이스에 보내기 전에 확인합니다.
+        
+        "Location ID"로 위치 노드를 지정하면 레거시 "Location"은 생략할 수 있습니다 (트리거가 채움).
+        """
+        for key, allowed in self.get_labels().items():
+            value = asset_data.get(key)
+            if key == "Location" and value is None and asset_data.get("Location ID") is not None:
+                continue
+            if value not in allowed:
+                raise ValueError(f"{key} has an invalid value: {value!r} (allowed: {', '.join(allowed)})")
     
     def add_asset(self, asset_data):
-        """새로운 자산을 추가합니다."""
+        """새로운 자산을 추가합니다. "Attributes"는 유형별 스키마로 검증하여 저장합니다."""
         try:
-            query = """
-            INSERT INTO assets (asset_type, model, purchase_date, warranty, status, location, reason)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-            """
-            
+            self._validate_labels(asset_data)
+            asset_data = dict(
+                asset_data,
+                Attributes=validate_attributes(asset_data["Type"], asset_data.get("Attributes")),
+                **{"Asset Tag": _normalize_tag(asset_data.get("Asset Tag")),
+                   "Serial Number": _normalize_tag(asset_data.get("Serial Number"))}
+            )
             params = (
                 asset_data["Type"],
                 asset_data["Model"],
                 asset_data["Purchase Date"],
                 asset_data["Warranty"],
                 asset_data["Status"],
-                asset_data["Location"],
-                asset_data["Reason"]
+                asset_data.get("Location"),
+                asset_data["Reason"],
+                asset_data.get("Location ID"),
+                json.dumps(asset_data["Attributes"]),
+                asset_data["Asset Tag"],
+                asset_data["Serial Number"]
             )
             
-            result = self.db.execute_query(query, params)
+            # 자산 추가와 이력 기록을 하나의 트랜잭션으로 커밋
+            with self.db.transaction():
+                result = self.db.execute_prepared('insert_asset', params)
+                
+                # 이력 기록
+                if result:
+                    asset_id = result[0]['id']
+                    self._log_history(asset_id, 'INSERT', None, asset_data)
             
-            # 이력 기록
             if result:
-                asset_id = result[0]['id']
-                self._log_history(asset_id, 'INSERT', None, asset_data)
+                self.bump_generation()
                 logger.info(f"Asset added successfully with ID: {asset_id}")
                 return asset_id
             
+        except psycopg2.errors.UniqueViolation as e:
+            raise ValueError(f"Asset tag or serial number already in use: {e.diag.message_detail}") from e
         except Exception as e:
             logger.error(f"Error adding asset: {e}")
             raise
     
-    def update_asset(self, asset_id, asset_data):
-        """기존 자산을 업데이트합니다."""
+    def update_asset(self, asset_id, asset_data, expected_version=None):
+        """기존 자산을 업데이트합니다.
+        
+        "Attributes", "Asset Tag", "Serial Number"를 생략하면 기존 값을 유지합니다.
+        속성은 어느 경우든 새 유형의 스키마로 검증합니다.
+        expected_version(읽을 때의 "Version")을 주면 그 사이 다른 수정이 있었을 때 ConflictError가 발생합니다.
+        """
         try:
-            # 기존 데이터 조회
-            old_data = self.get_asset(asset_id)
-            if not old_data:
-                raise ValueError(f"Asset with ID {asset_id} not found")
-            
-            query = """
-            UPDATE assets 
-            SET asset_type = %s, model = %s, purchase_date = %s, warranty = %s, 
-                status = %s, location = %s, reason = %s
-            WHERE id = %s
-            """
+            self._validate_labels(asset_data)
             
-            params = (
-                asset_data["Type"],
-                asset_data["Model"],
-                asset_data["Purchase Date"],
-                asset_data["Warranty"],
-                asset_data["Status"],
-                asset_data["Location"],
-                asset_data["Reason"],
-                asset_id
-            )
-            
-            result = self.db.execute_query(query, params)
+            # 기존 데이터 조회, 수정, 이력 기록을 하나의 트랜잭션으로 커밋
+            with self.db.transaction():
+                old_data = self.get_asset(asset_id)
+                if not old_data:
+                    raise ValueError(f"Asset with ID {asset_id} not found")
+                if expected_version is not None and old_data["Version"] != expected_version:
+                    raise ConflictError(asset_id, expected_version, old_data["Version"])
+                
+                attributes = asset_data.get("Attributes", old_data["Attributes"])
+                asset_data = dict(
+                    asset_data,
+                    Attributes=validate_attributes(asset_data["Type"], attributes),
+                    **{key: _normalize_tag(asset_data.get(key, old_data[key])) for key in ("Asset Tag", "Serial Number")}
+                )
+                params = (
+                    asset_data["Type"],
+                    asset_data["Model"],
+                    asset_data["Purchase Date"],
+                    asset_data["Warranty"],
+                    asset_data["Status"],
+                    asset_data.get("Location"),
+                    asset_data["Reason"],
+                    asset_data.get("Location ID"),
+                    json.dumps(asset_data["Attributes"]),
+                    asset_data["Asset Tag"],
+                    asset_data["Serial Number"],
+                    asset_id,
+                    expected_version
+                )
+                result = self.db.execute_prepared('update_asset', params)
+                if result == 0 and expected_version is not None:
+                    # 조회와 수정 사이에 다른 수정이 끼어듦
+                    raise ConflictError(asset_id, expected_version, None)
+                
+                if result > 0:
+                    # 이력 기록
+                    self._log_history(asset_id, 'UPDATE', old_data, asset_data)
             
             if result > 0:
-                # 이력 기록
-                self._log_history(asset_id, 'UPDATE', old_data, asset_data)
+                self.bump_generation()
                 logger.info(f"Asset {asset_id} updated successfully")
                 return True
             else:
                 logger.warning(f"No rows affected when updating asset {asset_id}")
                 return False
                 
+        except psycopg2.errors.UniqueViolation as e:
+            raise ValueError(f"Asset tag or serial number already in use: {e.diag.message_detail}") from e
+        except ConflictError as e:
+            logger.warning(str(e))
+            raise
         except Exception as e:
             logger.error(f"Error updating asset {asset_id}: {e}")
             raise
@@ -85,17 +431,20 @@ class ITAssetManager:
     def delete_asset(self, asset_id):
         """자산을 삭제합니다."""
         try:
-            # 기존 데이터 조회 (이력 기록용)
-            old_data = self.get_asset(asset_id)
-            if not old_data:
-                raise ValueError(f"Asset with ID {asset_id} not found")
-            
-            query = "DELETE FROM assets WHERE id = %s"
-            result = self.db.execute_query(query, (asset_id,))
+            # 기존 데이터 조회 (이력 기록용), 삭제, 이력 기록을 하나의 트랜잭션으로 커밋
+            with self.db.transaction():
+                old_data = self.get_asset(asset_id)
+                if not old_data:
+                    raise ValueError(f"Asset with ID {asset_id} not found")
+                
+                result = self.db.execute_prepared('delete_asset', (asset_id,))
+                
+                if result > 0:
+                    # 이력 기록
+                    self._log_history(asset_id, 'DELETE', old_data, None)
             
             if result > 0:
-                # 이력 기록
-                self._log_history(asset_id, 'DELETE', old_data, None)
+                self.bump_generation()
                 logger.info(f"Asset {asset_id} deleted successfully")
                 return True
             else:
@@ -109,128 +458,558 @@ class ITAssetManager:
     def get_asset(self, asset_id):
         """특정 ID의 자산을 조회합니다."""
         try:
-            query = "SELECT * FROM assets WHERE id = %s"
-            result = self.db.execute_query(query, (asset_id,))
+            result = self.db.execute_prepared('get_asset', (asset_id,))
             
             if result:
                 asset = result[0]
-                return {
-                    "ID": asset['id'],
-                    "Type": asset['asset_type'],
-                    "Model": asset['model'],
-                    "Purchase Date": asset['purchase_date'],
-                    "Warranty": asset['warranty'],
-                    "Status": asset['status'],
-                    "Location": asset['location'],
-                    "Reason": asset['reason']
-                }
+                return {"ID": asset['id'], **_asset_from_row(asset)}
             return None
             
         except Exception as e:
             logger.error(f"Error getting asset {asset_id}: {e}")
             raise
     
-    def list_assets(self):
-        """모든 자산을 조회합니다."""
+    def patch_asset(self, asset_id, changes, expected_version=None):
+        """자산의 일부 필드만 바꿉니다 (예: {"Status": "운영"}).
+        
+        보낸 컬럼만 쓰고, 값이 모두 같으면 행을 쓰지 않으므로 updated_at, 행 지문, 이력도 바뀌지 않습니다.
+        행 잠금, UPDATE ... RETURNING, 이력 기록을 한 문장으로 실행하여 미리 읽지 않고 한 번의 왕복으로 끝냅니다.
+        유형이나 속성을 바꿀 때만 속성 스키마 검증을 위해 같은 트랜잭션에서 현재 행을 먼저 읽습니다.
+        {"asset": 수정 후 자산, "changed": 실제로 바뀌었는지}를 반환하며, 자산이 없으면 None입니다.
+        
+        expected_version을 주면 WHERE id = ? AND version = ?로 수정하고, 버전이 다르면 ConflictError가 발생합니다.
+        편집하는 동안 행 잠금을 잡지 않으므로 웹 모달/GUI 다이얼로그의 편집 시간과 관계없이 처리량이 유지됩니다.
+        """
+        unknown = sorted(set(changes) - set(ASSET_COLUMNS))
+        if unknown or not changes:
+            raise ValueError(f"Fields cannot be updated: {', '.join(unknown) or 'none'} (allowed: {', '.join(ASSET_COLUMNS)})")
+        labels = self.get_labels()
+        for key, value in changes.items():
+            if key in labels and value not in labels[key]:
+                raise ValueError(f"{key} has an invalid value: {value!r} (allowed: {', '.join(labels[key])})")
+        changes = dict(changes)
+        for key in ("Asset Tag", "Serial Number"):
+            if key in changes:
+                changes[key] = _normalize_tag(changes[key])
+        
+        select = """
+            SELECT c.*, true AS changed FROM changed c
+            UNION ALL
+            SELECT m.*, false FROM matched m WHERE NOT EXISTS (SELECT 1 FROM changed)
+        """
+        condition = "id = %s"
+        params = [asset_id]
+        if expected_version is not None:
+            condition += " AND version = %s"
+            params.append(expected_version)
+        
         try:
-            query = "SELECT * FROM assets ORDER BY id"
-            result = self.db.execute_query(query)
+            with self.db.transaction():
+                if "Type" in changes or "Attributes" in changes:
+                    current = self.db.execute_query(
+                        "SELECT asset_type, attributes, version FROM assets WHERE id = %s FOR UPDATE", (asset_id,)
+                    )
+                    if not current:
+                        return None
+                    if expected_version is not None and current[0]['version'] != expected_version:
+                        raise ConflictError(asset_id, expected_version, current[0]['version'])
+                    attributes = validate_attributes(
+                        changes.get("Type", current[0]['asset_type']),
+                        changes.get("Attributes", current[0]['attributes'])
+                    )
+                    if "Attributes" in changes:
+                        changes["Attributes"] = json.dumps(attributes)
+                
+                query, query_params = _change_query(condition, params, changes, select)
+                result = self.db.execute_query(query, query_params)
+                
+                if not result and expected_version is not None:
+                    # 버전이 달라 대상 행이 없었는지, 자산이 없는지 구분 (실패한 경우에만 추가 조회)
+                    current = self.db.execute_query("SELECT version FROM assets WHERE id = %s", (asset_id,))
+                    if current:
+                        raise ConflictError(asset_id, expected_version, current[0]['version'])
             
-            assets = {}
-            for row in result:
-                assets[row['id']] = {
-                    "Type": row['asset_type'],
-                    "Model": row['model'],
-                    "Purchase Date": row['purchase_date'],
-                    "Warranty": row['warranty'],
-                    "Status": row['status'],
-                    "Location": row['location'],
-                    "Reason": row['reason']
-                }
+            if not result:
+                return None
+            row = result[0]
+            if row['changed']:
+                self.bump_generation()
+                logger.info(f"Asset {asset_id} patched (fields: {', '.join(changes)})")
+            return {"asset": {"ID": row['id'], **_asset_from_row(row)}, "changed": row['changed']}
             
-            return assets
+        except psycopg2.errors.UniqueViolation as e:
+            raise ValueError(f"Asset tag or serial number already in use: {e.diag.message_detail}") from e
+        except psycopg2.IntegrityError as e:
+            raise ValueError(f"Cannot update asset: {e.diag.message_primary}") from e
+        except ConflictError as e:
+            logger.warning(str(e))
+            raise
+        except Exception as e:
+            logger.error(f"Error patching asset {asset_id}: {e}")
+            raise
+    
+    def bulk_update(self, ids_or_filter, changes):
+        """여러 자산의 일부 필드를 한 번에 바꿉니다 (예: 랙 철거 시 모두 '폐기').
+        
+        ids_or_filter: 자산 ID 목록, 또는 {"location_id", "Type", "Status", "Location"} 중 하나 이상의 필터
+        changes: BULK_FIELDS 중 바꿀 필드와 값
+        
+        값이 다른 행의 잠금, UPDATE ... RETURNING, 바뀐 행의 이력 INSERT를 하나의 문장(한 트랜잭션, 한 번의 왕복)으로
+        실행합니다. 이미 같은 값인 자산은 잠그지도 쓰지도 않으며(IS DISTINCT FROM) 이력도 남기지 않습니다.
+        {"matched": 대상 수, "updated": 바뀐 수, "ids": [바뀐 ID, ...]}를 반환합니다.
+        """
+        unknown = sorted(set(changes) - set(BULK_FIELDS))
+        if unknown or not changes:
+            raise ValueError(f"Fields cannot be bulk updated: {', '.join(unknown) or 'none'} (allowed: {', '.join(BULK_FIELDS)})")
+        labels = self.get_labels()
+        for key, value in changes.items():
+            if key in labels and value not in labels[key]:
+                raise ValueError(f"{key} has an invalid value: {value!r} (allowed: {', '.join(labels[key])})")
+        
+        conditions = []
+        params = []
+        if isinstance(ids_or_filter, dict):
+            unknown = sorted(set(ids_or_filter) - set(BULK_FILTERS))
+            if unknown or not ids_or_filter:
+                raise ValueError(f"Unknown filter: {', '.join(unknown) or 'none'} (allowed: {', '.join(BULK_FILTERS)})")
+            for key, value in ids_or_filter.items():
+                if key in labels and value not in labels[key]:
+                    raise ValueError(f"{key} has an invalid value: {value!r} (allowed: {', '.join(labels[key])})")
+                conditions.append(BULK_FILTERS[key])
+                params.append(value)
+        else:
+            ids = sorted({int(asset_id) for asset_id in ids_or_filter})
+            if not ids:
+                return {"matched": 0, "updated": 0, "ids": []}
+            if len(ids) > MAX_BULK_IDS:
+                raise ValueError(f"At most {MAX_BULK_IDS} assets can be updated at once (got {len(ids)})")
+            conditions.append("id = ANY(%s)")
+            params.append(ids)
+        
+        query, query_params = _change_query(
+            ' AND '.join(conditions), params, changes,
+            "SELECT (SELECT COUNT(*) FROM matched) AS matched, array_agg(id ORDER BY id) AS ids FROM changed"
+        )
+        try:
+            result = self.db.execute_query(query, query_params)
+            row = result[0]
+            ids = row['ids'] or []
+            if ids:
+                self.bump_generation()
+            logger.info(f"Bulk updated {len(ids)} assets ({row['matched']} matched, fields: {', '.join(changes)})")
+            return {"matched": row['matched'], "updated": len(ids), "ids": ids}
+            
+        except psycopg2.IntegrityError as e:
+            raise ValueError(f"Cannot bulk update assets: {e.diag.message_primary}") from e
+        except Exception as e:
+            logger.error(f"Error bulk updating assets: {e}")
+            raise
+    
+    def get_asset_by_tag(self, tag):
+        """자산 태그 또는 시리얼 번호로 자산을 조회합니다 (바코드 스캔). 없으면 None입니다."""
+        tag = _normalize_tag(tag)
+        if tag is None:
+            return None
+        try:
+            result = self.db.execute_prepared('asset_by_tag', (tag, tag), operation='lookup')
+            if result:
+                return {"ID": result[0]['id'], **_asset_from_row(result[0])}
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error looking up tag {tag}: {e}")
+            raise
+    
+    def lookup_assets(self, tags):
+        """스캔한 태그 여러 개를 한 번의 쿼리로 자산에 대응시킵니다.
+        
+        각 태그는 자산 태그 또는 시리얼 번호와 비교하며 {"found": {태그: 자산}, "missing": [태그, ...]}를
+        반환합니다. 중복과 빈 태그는 제외하고, 한 번에 MAX_LOOKUP_TAGS개까지 받습니다.
+        """
+        tags = list(dict.fromkeys(tag for tag in map(_normalize_tag, tags) if tag is not None))
+        if len(tags) > MAX_LOOKUP_TAGS:
+            raise ValueError(f"At most {MAX_LOOKUP_TAGS} tags can be looked up at once (got {len(tags)})")
+        if not tags:
+            return {"found": {}, "missing": []}
+        try:
+            result = self.db.execute_prepared('lookup_asset_tags', (tags, tags), operation='lookup')
+            
+            # 같은 값이 한 자산의 태그이면서 다른 자산의 시리얼이면 자산 태그를 우선함
+            assets = [(row, {"ID": row['id'], **_asset_from_row(row)}) for row in result]
+            by_tag = {}
+            for key in ('asset_tag', 'serial_number'):
+                for row, asset in assets:
+                    if row[key] is not None:
+                        by_tag.setdefault(row[key], asset)
+            
+            found = {tag: by_tag[tag] for tag in tags if tag in by_tag}
+            return {"found": found, "missing": [tag for tag in tags if tag not in by_tag]}
+            
+        except Exception as e:
+            logger.error(f"Error looking up tags: {e}")
+            raise
+    
+    def list_assets(self, location_id=None, attributes=None, include_archived=False, after_id=None, limit=None):
+        """모든 자산을 조회합니다.
+        
+        location_id를 지정하면 그 위치와 하위 위치의 자산만 조회합니다.
+        attributes({"ram_gb": 64} 등)를 지정하면 그 속성을 모두 가진 자산만 조회합니다
+        (attributes @> 조건이므로 idx_assets_attributes GIN 인덱스를 사용).
+        보관된 폐기 자산은 include_archived=True일 때만 함께 조회합니다.
+        limit을 주면 ID가 after_id보다 큰 자산을 limit개까지만 조회합니다 (다음 페이지는 마지막 ID를 after_id로).
+        """
+        try:
+            if limit is not None:
+                _page_limit(limit)
+            conditions = []
+            params = []
+            if location_id is not None:
+                conditions.append(SUBTREE_CONDITION)
+                params.append(location_id)
+            if attributes:
+                conditions.append("attributes @> %s::jsonb")
+                params.append(json.dumps(attributes))
+            
+            query, params = _select_assets(' AND '.join(conditions), params, include_archived, after_id, limit)
+            result = self.db.execute_query(query, tuple(params) or None, operation='list')
+            return _assets_from_rows(result)
             
         except Exception as e:
             logger.error(f"Error listing assets: {e}")
             raise
     
-    def search_assets(self, search_term, search_field=None):
-        """자산을 검색합니다."""
+    def iter_asset_batches(self, batch_size=10000):
+        """모든 자산을 ID 순서로 batch_size 행씩 생성합니다 (대용량 내보내기용).
+        
+        각 행은 "ID", "Type", "Model", "Purchase Date", "Warranty", "Status", "Location", "Reason"
+        키를 가진 딕셔너리이며, 전용 연결의 서버 측 커서에서 읽으므로 메모리 사용량이 일정합니다.
+        """
+        query = """
+            SELECT id AS "ID", asset_type AS "Type", model AS "Model", purchase_date AS "Purchase Date",
+                   warranty AS "Warranty", status AS "Status", location AS "Location", reason AS "Reason"
+            FROM assets
+            ORDER BY id
+        """
         try:
-            if search_field:
-                query = f"SELECT * FROM assets WHERE {search_field} ILIKE %s ORDER BY id"
-                params = (f"%{search_term}%",)
+            yield from self.db.stream_query(query, batch_size=batch_size, operation='export')
+        except Exception as e:
+            logger.error(f"Error while reading assets for export: {e}")
+            raise
+    
+    def _search_condition(self, search_term, search_field=None, location_id=None, filters=None):
+        """검색어, 위치, 패싯 필터를 WHERE 조건과 매개변수로 바꿉니다. 검색어에 맞는 레이블이 없으면 None입니다.
+        
+        filters는 {"asset_type"|"status"|"location": 레이블, "purchase_year": 연도 또는 None(구매일 없음)}입니다.
+        """
+        if search_field is not None and search_field not in SEARCH_FIELDS:
+            raise ValueError(f"Unsupported search field: {search_field} (allowed: {', '.join(SEARCH_FIELDS)})")
+        
+        conditions = []
+        params = []
+        if search_term:
+            matches_any = []
+            for field in ([search_field] if search_field else SEARCH_FIELDS):
+                if field in ENUM_COLUMNS:
+                    key, enum_type = ENUM_COLUMNS[field]
+                    term = search_term.lower()
+                    matches = [label for label in self.get_labels()[key] if term in label.lower()]
+                    if matches:
+                        matches_any.append(f"{field} = ANY(%s::{enum_type}[])")
+                        params.append(matches)
+                else:
+                    # idx_assets_<컬럼>_trgm (pg_trgm GIN)으로 부분 일치를 인덱스에서 찾음
+                    matches_any.append(f"{field} ILIKE %s")
+                    params.append(f"%{search_term}%")
+            if not matches_any:
+                # 검색어를 포함하는 레이블이 없음
+                return None
+            conditions.append(f"({' OR '.join(matches_any)})")
+        
+        if location_id is not None:
+            conditions.append(SUBTREE_CONDITION)
+            params.append(location_id)
+        
+        for facet, value in (filters or {}).items():
+            if facet not in FACETS:
+                raise ValueError(f"Unknown filter: {facet} (allowed: {', '.join(FACETS)})")
+            if facet == 'purchase_year':
+                if value is None:
+                    conditions.append("purchase_date IS NULL")
+                    continue
+                try:
+                    year = int(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid purchase year: {value!r}") from None
+                # 컬럼에 EXTRACT를 씌우지 않고 범위로 비교
+                conditions.append("purchase_date >= make_date(%s, 1, 1) AND purchase_date < make_date(%s, 1, 1)")
+                params.extend([year, year + 1])
             else:
-                query = """
-                SELECT * FROM assets 
-                WHERE asset_type ILIKE %s OR model ILIKE %s OR status ILIKE %s 
-                OR location ILIKE %s OR reason ILIKE %s
-                ORDER BY id
-                """
-                params = (f"%{search_term}%",) * 5
-            
-            result = self.db.execute_query(query, params)
-            
-            assets = {}
-            for row in result:
-                assets[row['id']] = {
-                    "Type": row['asset_type'],
-                    "Model": row['model'],
-                    "Purchase Date": row['purchase_date'],
-                    "Warranty": row['warranty'],
-                    "Status": row['status'],
-                    "Location": row['location'],
-                    "Reason": row['reason']
-                }
-            
-            return assets
+                key, enum_type = ENUM_COLUMNS[facet]
+                if value not in self.get_labels()[key]:
+                    raise ValueError(f"{key} has an invalid value: {value!r} (allowed: {', '.join(self.get_labels()[key])})")
+                conditions.append(f"{facet} = %s::{enum_type}")
+                params.append(value)
+        
+        return ' AND '.join(conditions), params
+    
+    def search_assets(self, search_term, search_field=None, location_id=None, include_archived=False, filters=None):
+        """자산을 검색합니다.
+        
+        모델과 비고는 ILIKE로(pg_trgm 인덱스), ENUM 컬럼(유형/상태/위치)은 캐시한 레이블 사전에서 검색어를 포함하는
+        레이블을 먼저 찾아 = ANY(...)로 비교하므로 해당 컬럼의 인덱스를 사용할 수 있습니다.
+        location_id를 지정하면 그 위치와 하위 위치의 자산 중에서 검색합니다.
+        include_archived=True이면 보관된 폐기 자산도 함께 검색합니다.
+        filters(패싯 값)를 주면 그 값을 가진 자산으로 좁힙니다.
+        """
+        try:
+            condition = self._search_condition(search_term, search_field, location_id, filters)
+            if condition is None:
+                return {}
+            query, params = _select_assets(condition[0], condition[1], include_archived)
+            result = self.db.execute_query(query, tuple(params) or None, operation='search')
+            return _assets_from_rows(result)
             
         except Exception as e:
             logger.error(f"Error searching assets: {e}")
             raise
     
-    def get_asset_statistics(self):
-        """자산 통계를 조회합니다."""
-        try:
-            query = """
-            SELECT 
-                COUNT(*) as total_assets,
-                COUNT(CASE WHEN status = '입고' THEN 1 END) as in_stock,
-                COUNT(CASE WHEN status = '대기' THEN 1 END) as waiting,
-                COUNT(CASE WHEN status = '운영' THEN 1 END) as operating,
-                COUNT(CASE WHEN status = '유휴' THEN 1 END) as idle,
-                COUNT(CASE WHEN status = '폐기' THEN 1 END) as disposed,
-                COUNT(CASE WHEN asset_type = 'HW' THEN 1 END) as hardware,
-                COUNT(CASE WHEN asset_type = 'SW' THEN 1 END) as software,
-                COUNT(CASE WHEN asset_type = 'NW' THEN 1 END) as network,
-                COUNT(CASE WHEN asset_type = 'STORAGE' THEN 1 END) as storage
-            FROM assets
+    def faceted_search(self, search_term, search_field=None, location_id=None, include_archived=False, filters=None):
+        """search_assets()와 같은 조건으로 검색하고, 결과 집합의 유형/상태/위치/구매 연도별 건수를 함께 반환합니다.
+        
+        검색 결과(hits)를 한 번만 읽어 GROUPING SETS로 네 패싯을 한 번에 세고, 같은 문장에서 결과 행과 함께 반환합니다.
+        {"assets": {ID: 자산}, "facets": {패싯: [{"value", "count"}, ...]}}을 반환합니다.
+        """
+        try:
+            condition = self._search_condition(search_term, search_field, location_id, filters)
+            if condition is None:
+                return {"assets": {}, "facets": _facets_from_rows([])}
+            source, params = _asset_source(condition[0], condition[1], include_archived)
+            query = f"""
+                WITH hits AS MATERIALIZED ({source})
+                SELECT CASE WHEN row_number() OVER (ORDER BY h.id) = 1 THEN f.facets END AS search_facets, h.*
+                FROM (
+                    SELECT COALESCE(json_agg(x), '[]'::json) AS facets
+                    FROM ({FACET_QUERY.format(source='hits')}) x
+                ) f
+                LEFT JOIN hits h ON true
+                ORDER BY h.id
             """
+            result = self.db.execute_query(query, tuple(params) or None, operation='search')
+            rows = [row for row in result if row['id'] is not None]
+            return {"assets": _assets_from_rows(rows), "facets": _facets_from_rows(result[0]['search_facets'])}
             
-            result = self.db.execute_query(query)
-            return result[0] if result else {}
+        except Exception as e:
+            logger.error(f"Error searching assets: {e}")
+            raise
+    
+    def get_asset_statistics(self, location_id=None, include_archived=False):
+        """자산 통계를 조회합니다. location_id를 지정하면 그 위치와 하위 위치의 자산만 셉니다.
+        
+        include_archived=True이면 보관된 자산도 각 항목에 더하고, 그중 보관된 수를 archived로 함께 반환합니다.
+        """
+        try:
+            if location_id is None:
+                result = self.db.execute_prepared('asset_statistics', operation='stats')
+            else:
+                result = self.db.execute_prepared('subtree_statistics', (location_id,), operation='stats')
+            statistics = dict(result[0]) if result else {}
+            
+            if include_archived:
+                if location_id is None:
+                    archived = self.db.execute_prepared('archive_statistics', operation='stats')
+                else:
+                    archived = self.db.execute_prepared('archive_subtree_statistics', (location_id,), operation='stats')
+                archived = archived[0] if archived else {}
+                statistics = {key: value + archived.get(key, 0) for key, value in statistics.items()}
+                statistics['archived'] = archived.get('total_assets', 0)
+            return statistics
             
         except Exception as e:
             logger.error(f"Error getting asset statistics: {e}")
             raise
     
+    def get_dashboard(self, location_id=None, include_archived=False, limit=PAGE_SIZE):
+        """첫 화면에 필요한 목록 첫 페이지, 통계 카드, 패싯 건수를 한 번에 조회합니다.
+        
+        세 결과를 CTE로 묶은 한 문장으로 실행하므로 한 번의 왕복으로 끝나고, 한 문장은 하나의 스냅샷에서
+        실행되므로 (READ COMMITTED에서도) 목록과 통계가 서로 다른 시점의 데이터를 보여 주지 않습니다.
+        {"assets": {ID: 자산}, "statistics": {...}, "facets": {...}, "next_after_id": 다음 페이지 기준 ID 또는 None}을
+        반환합니다. 다음 페이지는 list_assets(after_id=..., limit=...)로 읽습니다.
+        """
+        _page_limit(limit)
+        conditions = []
+        params = []
+        if location_id is not None:
+            conditions.append(SUBTREE_CONDITION)
+            params.append(location_id)
+        source, params = _asset_source(' AND '.join(conditions), params, include_archived)
+        archived = ", COUNT(archived_at) AS archived" if include_archived else ""
+        
+        # scope는 세 번 참조되지만 NOT MATERIALIZED로 인라인하여 페이지는 기본 키 인덱스 순서로 limit개만 읽음
+        query = f"""
+            WITH scope AS NOT MATERIALIZED ({source}),
+            page AS (
+                SELECT * FROM scope ORDER BY id LIMIT %s
+            ),
+            summary AS (
+                SELECT (SELECT row_to_json(s) FROM (SELECT {STATISTICS_COLUMNS}{archived} FROM scope) s) AS statistics,
+                       (SELECT COALESCE(json_agg(f), '[]'::json) FROM ({FACET_QUERY.format(source='scope')}) f) AS facets
+            )
+            SELECT CASE WHEN row_number() OVER (ORDER BY p.id) = 1 THEN s.statistics END AS dashboard_statistics,
+                   CASE WHEN row_number() OVER (ORDER BY p.id) = 1 THEN s.facets END AS dashboard_facets,
+                   p.*
+            FROM summary s
+            LEFT JOIN page p ON true
+            ORDER BY p.id
+        """
+        try:
+            # limit + 1개를 읽어 다음 페이지가 있는지 확인
+            result = self.db.execute_query(query, tuple(params + [limit + 1]), operation='list')
+            first = result[0]
+            rows = [row for row in result if row['id'] is not None]
+            next_after_id = rows[limit - 1]['id'] if len(rows) > limit else None
+            return {
+                "assets": _assets_from_rows(rows[:limit]),
+                "statistics": first['dashboard_statistics'],
+                "facets": _facets_from_rows(first['dashboard_facets']),
+                "next_after_id": next_after_id,
+            }
+        except Exception as e:
+            logger.error(f"Error loading dashboard: {e}")
+            raise
+    
+    # ---- 폐기 자산 보관 ----
+    
+    def archive_disposed_assets(self, older_than_days, batch_size=1000, progress=None):
+        """폐기된 지 older_than_days일이 지난 자산을 batch_size개씩 assets_archive로 옮기고 옮긴 수를 반환합니다.
+        
+        배치마다 한 문장(DELETE ... RETURNING -> INSERT)으로 실행하고 바로 커밋하므로 잠금은 짧게만 유지됩니다.
+        progress(지금까지 옮긴 수)는 배치마다 호출되며, 예외를 던지면 남은 배치를 옮기지 않고 중단합니다.
+        """
+        if older_than_days < 0:
+            raise ValueError("older_than_days must be 0 or greater")
+        if batch_size < 1:
+            raise ValueError("batch_size must be 1 or greater")
+        total = 0
+        try:
+            while True:
+                result = self.db.execute_query(ARCHIVE_DISPOSED, (older_than_days, batch_size))
+                moved = result[0]['archived']
+                total += moved
+                if progress:
+                    progress(total)
+                # 배치가 덜 찼으면 남은 대상이 없거나 다른 요청이 잠근 행뿐임
+                if moved < batch_size:
+                    break
+            if total:
+                self.bump_generation()
+                logger.info(f"Moved {total} disposed assets to the archive table")
+            return total
+        except Exception as e:
+            if total:
+                self.bump_generation()
+            logger.error(f"Error archiving disposed assets (after moving {total}): {e}")
+            raise
+    
+    # ---- 계층형 위치 ----
+    
+    def list_locations(self):
+        """모든 위치를 경로 순서로 조회합니다 (id, parent_id, name, kind, legacy_location, depth, path)."""
+        try:
+            return self.db.execute_query(LIST_LOCATIONS, operation='list')
+        except Exception as e:
+            logger.error(f"Error listing locations: {e}")
+            raise
+    
+    def get_location(self, location_id):
+        try:
+            result = self.db.execute_query(
+                f"SELECT * FROM ({LIST_LOCATIONS}) l WHERE l.id = %s", (location_id,)
+            )
+            return result[0] if result else None
+        except Exception as e:
+            logger.error(f"Error reading location {location_id}: {e}")
+            raise
+    
+    def add_location(self, name, parent_id=None, kind='other'):
+        """위치를 추가하고 ID를 반환합니다. closure는 트리거가 갱신합니다."""
+        try:
+            result = self.db.execute_query(
+                "INSERT INTO locations (name, parent_id, kind) VALUES (%s, %s, %s) RETURNING id",
+                (name, parent_id, kind)
+            )
+            location_id = result[0]['id']
+            self.bump_generation()
+            logger.info(f"Location added with ID: {location_id}")
+            return location_id
+        except psycopg2.IntegrityError as e:
+            raise ValueError(f"Cannot add location: {e.diag.message_primary}") from e
+        except Exception as e:
+            logger.error(f"Error adding location: {e}")
+            raise
+    
+    def update_location(self, location_id, changes):
+        """위치의 이름(name), 종류(kind), 부모(parent_id)를 바꿉니다.
+        
+        부모를 바꾸면 하위 트리 전체가 함께 옮겨지고, 트리거가 closure와 하위 자산의 레거시 location을 갱신합니다.
+        """
+        fields = [field for field in ('name', 'kind', 'parent_id') if field in changes]
+        if not fields:
+            return False
+        try:
+            assignments = ', '.join(f"{field} = %s" for field in fields)
+            params = tuple(changes[field] for field in fields) + (location_id,)
+            result = self.db.execute_query(f"UPDATE locations SET {assignments} WHERE id = %s", params)
+            if result > 0:
+                self.bump_generation()
+                logger.info(f"Location {location_id} updated")
+            return result > 0
+        except psycopg2.IntegrityError as e:
+            raise ValueError(f"Cannot update location: {e.diag.message_primary}") from e
+        except Exception as e:
+            logger.error(f"Error updating location {location_id}: {e}")
+            raise
+    
+    def delete_location(self, location_id):
+        """하위 위치와 자산이 없는 위치를 삭제합니다."""
+        try:
+            result = self.db.execute_query("DELETE FROM locations WHERE id = %s", (location_id,))
+            if result > 0:
+                self.bump_generation()
+                logger.info(f"Location {location_id} deleted")
+            return result > 0
+        except psycopg2.IntegrityError as e:
+            raise ValueError("Cannot delete a location that has child locations or assets") from e
+        except Exception as e:
+            logger.error(f"Error deleting location {location_id}: {e}")
+            raise
+    
+    def get_location_statistics(self, location_id):
+        """위치 하위 트리의 통계와 직속 하위 위치별 건수를 반환합니다. 위치가 없으면 None입니다."""
+        try:
+            location = self.get_location(location_id)
+            if location is None:
+                return None
+            statistics = self.get_asset_statistics(location_id)
+            children = self.db.execute_prepared('child_location_statistics', (location_id,), operation='stats')
+            return {'location': location, 'statistics': statistics, 'children': children}
+        except Exception as e:
+            logger.error(f"Error reading statistics for location {location_id}: {e}")
+            raise
+    
     def _log_history(self, asset_id, action, old_values, new_values):
         """자산 변경 이력을 기록합니다."""
         try:
-            query = """
-            INSERT INTO asset_history (asset_id, action, old_values, new_values)
-            VALUES (%s, %s, %s, %s)
-            """
-            
             old_json = json.dumps(old_values, default=str) if old_values else None
             new_json = json.dumps(new_values, default=str) if new_values else None
             
             params = (asset_id, action, old_json, new_json)
-            self.db.execute_query(query, params)
+            self.db.execute_prepared('insert_history', params)
             
         except Exception as e:
             logger.error(f"Error logging history: {e}")
-            # 이력 기록 실패는 자산 작업을 중단시키지 않음
+            # 이력은 자산 변경과 같은 트랜잭션에 속하므로 실패하면 변경도 함께 롤백됨
+            raise
     
     def close(self):
         """데이터베이스 연결을 종료합니다."""
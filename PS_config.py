@@ -22,3 +22,56 @@ DB_CONFIG = {
 #     'password': 'your_password'
 # }
 
+
+# Connection timeouts (seconds)
+# DB_CONNECT_TIMEOUT: budget for a single connection attempt
+# DB_WARMUP_TIMEOUT: total time the background warm-up keeps retrying
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', 3))
+DB_WARMUP_TIMEOUT = float(os.getenv('DB_WARMUP_TIMEOUT', 60))
+
+# Apply pending schema migrations automatically at startup.
+# When false, an outdated schema fails the connection (run schema_migrations.py by hand)
+DB_AUTO_MIGRATE = os.getenv('DB_AUTO_MIGRATE', 'true').lower() == 'true'
+
+# Server-side limit for sessions left idle inside a transaction (milliseconds, 0 disables)
+DB_IDLE_TX_TIMEOUT_MS = int(os.getenv('DB_IDLE_TX_TIMEOUT_MS', 60000))
+
+# Per-operation statement_timeout budgets (milliseconds)
+STATEMENT_TIMEOUTS = {
+    'search': int(os.getenv('DB_TIMEOUT_SEARCH_MS', 5000)),
+    'list': int(os.getenv('DB_TIMEOUT_LIST_MS', 10000)),
+    'export': int(os.getenv('DB_TIMEOUT_EXPORT_MS', 120000)),
+    'stats': int(os.getenv('DB_TIMEOUT_STATS_MS', 3000)),
+    'lookup': int(os.getenv('DB_TIMEOUT_LOOKUP_MS', 1000)),
+    'default': int(os.getenv('DB_TIMEOUT_DEFAULT_MS', 15000)),
+}
+
+# Circuit breaker: consecutive failures before opening, background probe interval (seconds)
+DB_BREAKER_FAILURE_THRESHOLD = int(os.getenv('DB_BREAKER_FAILURE_THRESHOLD', 3))
+DB_BREAKER_PROBE_INTERVAL = float(os.getenv('DB_BREAKER_PROBE_INTERVAL', 5))
+
+# Background jobs (web app /api/jobs imports and exports)
+# JOB_WORKERS: jobs run concurrently, JOB_QUEUE_LIMIT: cap on queued + running jobs
+# JOB_DIR: directory for uploads and artifacts, JOB_RETENTION_HOURS: how long finished jobs are kept
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', 20))
+JOB_DIR = os.getenv('JOB_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_files'))
+JOB_RETENTION_HOURS = int(os.getenv('JOB_RETENTION_HOURS', 24))
+
+# Disposed asset archive (/api/jobs/archive)
+# ARCHIVE_AFTER_DAYS: days after disposal before an asset moves to the archive table,
+# ARCHIVE_BATCH_SIZE: assets moved per batch (transaction)
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 1000))
+
+# Model name suggestions (/api/suggest)
+# SUGGEST_LIMIT: maximum model names returned,
+# SUGGEST_REFRESH_SECONDS: how often the index is rebuilt to pick up changes made by other processes
+SUGGEST_LIMIT = int(os.getenv('SUGGEST_LIMIT', 10))
+SUGGEST_REFRESH_SECONDS = int(os.getenv('SUGGEST_REFRESH_SECONDS', 300))
+
+# Query result cache (/api/search, /api/statistics)
+# REQUEST_CACHE_TTL_SECONDS: how long a result is reused (0 disables caching, concurrent requests are still coalesced),
+# REQUEST_CACHE_MAX_ENTRIES: cap on cached entries
+REQUEST_CACHE_TTL_SECONDS = float(os.getenv('REQUEST_CACHE_TTL_SECONDS', 5))
+REQUEST_CACHE_MAX_ENTRIES = int(os.getenv('REQUEST_CACHE_MAX_ENTRIES', 256))
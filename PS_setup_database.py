@@ -8,6 +8,7 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 import sys
 import os
+from schema_migrations import SchemaMigrator, MigrationError
 
 def create_database():
     """데이터베이스를 생성합니다."""
@@ -43,7 +44,7 @@ def create_database():
     return True
 
 def create_tables():
-    """테이블들을 생성합니다."""
+    """migrations/ 디렉터리의 스키마 마이그레이션을 적용합니다."""
     try:
         # it_asset_db에 연결
         conn = psycopg2.connect(
@@ -53,68 +54,13 @@ def create_tables():
             user="postgres",
             password="your_password"  # 실제 비밀번호로 변경하세요
         )
-        conn.autocommit = True
-        cursor = conn.cursor()
         
-        # IT 자산 테이블 생성
-        create_assets_table = """
-        CREATE TABLE IF NOT EXISTS assets (
-            id SERIAL PRIMARY KEY,
-            asset_type VARCHAR(10) NOT NULL CHECK (asset_type IN ('HW', 'SW', 'NW', 'STORAGE')),
-            model VARCHAR(255) NOT NULL,
-            purchase_date DATE,
-            warranty VARCHAR(255),
-            status VARCHAR(20) NOT NULL CHECK (status IN ('입고', '대기', '운영', '유휴', '폐기')),
-            location VARCHAR(100) NOT NULL CHECK (location IN ('본사 서버실', '개인지급', '프로젝트장소', '기타')),
-            reason TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-        
-        # 자산 이력 테이블 생성
-        create_history_table = """
-        CREATE TABLE IF NOT EXISTS asset_history (
-            id SERIAL PRIMARY KEY,
-            asset_id INTEGER REFERENCES assets(id) ON DELETE CASCADE,
-            action VARCHAR(20) NOT NULL,
-            old_values JSONB,
-            new_values JSONB,
-            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-        
-        cursor.execute(create_assets_table)
-        cursor.execute(create_history_table)
-        
-        # updated_at 트리거 함수 생성
-        create_trigger_function = """
-        CREATE OR REPLACE FUNCTION update_updated_at_column()
-        RETURNS TRIGGER AS $$
-        BEGIN
-            NEW.updated_at = CURRENT_TIMESTAMP;
-            RETURN NEW;
-        END;
-        $$ language 'plpgsql';
-        """
-        
-        # updated_at 트리거 생성
-        create_trigger = """
-        CREATE TRIGGER update_assets_updated_at 
-            BEFORE UPDATE ON assets 
-            FOR EACH ROW 
-            EXECUTE FUNCTION update_updated_at_column();
-        """
-        
-        cursor.execute(create_trigger_function)
-        cursor.execute(create_trigger)
-        
-        print("✅ 테이블과 트리거가 생성되었습니다.")
+        version = SchemaMigrator(conn).migrate()
+        print(f"✅ 스키마 마이그레이션이 적용되었습니다. (버전 {version})")
         
-        cursor.close()
         conn.close()
         
-    except psycopg2.Error as e:
+    except (psycopg2.Error, MigrationError) as e:
         print(f"❌ 테이블 생성 중 오류가 발생했습니다: {e}")
         return False
     
@@ -0,0 +1,139 @@
+"""
+유형별 자산 속성 (assets.attributes JSONB)
+HW의 CPU/RAM, SW의 라이선스 수, NW의 포트 수처럼 유형마다 다른 항목을 비고나 보증기간 텍스트에
+섞어 두지 않고, 유형별 스키마로 검증한 JSON 객체로 저장합니다.
+
+- validate_attributes()는 add_asset/update_asset에서 호출되어 알 수 없는 키를 거부하고,
+  폼에서 문자열로 들어온 숫자/날짜를 스키마의 타입으로 변환합니다. 빈 값은 저장하지 않습니다.
+- parse_attribute_filters()는 `attr.ram_gb=64` 같은 조회 매개변수를 같은 규칙으로 변환하여
+  `attributes @> {...}` 포함 조건(GIN jsonb_path_ops 인덱스 사용)에 쓸 객체를 만듭니다.
+- 시리얼 번호는 유일 인덱스로 조회하도록 assets.serial_number 컬럼에 저장합니다 (0009).
+- 같은 키는 모든 유형에서 같은 타입을 가지므로 필터는 유형을 몰라도 해석할 수 있습니다.
+"""
+
+from collections import namedtuple
+from datetime import date
+
+AttributeField = namedtuple('AttributeField', ['key', 'label', 'type'])
+
+STRING = 'string'
+INTEGER = 'integer'
+NUMBER = 'number'
+DATE = 'date'
+
+MAX_STRING_LENGTH = 255
+
+ATTRIBUTE_SCHEMAS = {
+    'HW': [
+        AttributeField('cpu', 'CPU', STRING),
+        AttributeField('ram_gb', 'RAM (GB)', INTEGER),
+        AttributeField('disk_gb', '디스크 (GB)', INTEGER),
+        AttributeField('os', '운영체제', STRING),
+    ],
+    'SW': [
+        AttributeField('license_seats', '라이선스 수', INTEGER),
+        AttributeField('license_key', '라이선스 키', STRING),
+        AttributeField('license_expiry', '라이선스 만료일', DATE),
+        AttributeField('vendor', '공급사', STRING),
+        AttributeField('version', '버전', STRING),
+    ],
+    'NW': [
+        AttributeField('port_count', '포트 수', INTEGER),
+        AttributeField('port_speed_gbps', '포트 속도 (Gbps)', NUMBER),
+        AttributeField('ip_address', 'IP 주소', STRING),
+        AttributeField('mac_address', 'MAC 주소', STRING),
+    ],
+    'STORAGE': [
+        AttributeField('capacity_tb', '용량 (TB)', NUMBER),
+        AttributeField('raid_level', 'RAID 레벨', STRING),
+        AttributeField('interface', '인터페이스', STRING),
+    ],
+}
+
+# 키 -> 타입 (필터 해석용)
+ATTRIBUTE_TYPES = {}
+for _fields in ATTRIBUTE_SCHEMAS.values():
+    for _field in _fields:
+        if ATTRIBUTE_TYPES.setdefault(_field.key, _field.type) != _field.type:
+            raise ValueError(f"속성 {_field.key}의 타입이 유형마다 다릅니다")
+
+FILTER_PREFIX = 'attr.'
+
+
+def _convert(field_type, value):
+    if isinstance(value, (bool, dict, list)):
+        raise TypeError
+    if field_type == STRING:
+        return str(value).strip()
+    if field_type == INTEGER:
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError
+            return int(value)
+        return int(str(value).strip())
+    if field_type == NUMBER:
+        number = value if isinstance(value, (int, float)) else float(str(value).strip())
+        # 정수로 표현되는 값은 정수로 저장하여 JSON 표현을 하나로 맞춤 (64.0 -> 64)
+        return int(number) if float(number).is_integer() else float(number)
+    if field_type == DATE:
+        if isinstance(value, date):
+            return value.isoformat()
+        return date.fromisoformat(str(value).strip()).isoformat()
+    raise ValueError
+
+
+def _coerce(field, value):
+    """값을 field 타입으로 변환합니다. 빈 값은 None을 반환합니다."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        value = _convert(field.type, value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field.label}({field.key}) 값이 올바르지 않습니다: {value!r}") from None
+    if field.type == STRING and len(value) > MAX_STRING_LENGTH:
+        raise ValueError(f"{field.label}은(는) {MAX_STRING_LENGTH}자를 넘을 수 없습니다")
+    return value
+
+
+def validate_attributes(asset_type, attributes):
+    """asset_type의 스키마로 attributes를 검증하고 정규화한 딕셔너리를 반환합니다."""
+    if attributes is None:
+        return {}
+    if not isinstance(attributes, dict):
+        raise ValueError("속성은 객체(딕셔너리)여야 합니다")
+
+    fields = {field.key: field for field in ATTRIBUTE_SCHEMAS.get(asset_type, [])}
+    unknown = sorted(set(attributes) - set(fields))
+    if unknown:
+        allowed = ', '.join(fields) or '없음'
+        raise ValueError(f"{asset_type} 유형에 없는 속성입니다: {', '.join(unknown)} (허용: {allowed})")
+
+    normalized = {}
+    for key, value in attributes.items():
+        value = _coerce(fields[key], value)
+        if value is not None:
+            normalized[key] = value
+    return normalized
+
+
+def parse_attribute_filters(args):
+    """조회 매개변수에서 attr.<키>=<값> 항목을 모아 포함 조건용 객체로 반환합니다. 없으면 None입니다."""
+    filters = {}
+    for name, value in args.items():
+        if not name.startswith(FILTER_PREFIX):
+            continue
+        key = name[len(FILTER_PREFIX):]
+        if key not in ATTRIBUTE_TYPES:
+            raise ValueError(f"알 수 없는 속성입니다: {key} (허용: {', '.join(sorted(ATTRIBUTE_TYPES))})")
+        value = _coerce(AttributeField(key, key, ATTRIBUTE_TYPES[key]), value)
+        if value is not None:
+            filters[key] = value
+    return filters or None
+
+
+def schema_as_dict():
+    """웹/GUI 폼을 그리기 위한 스키마 ({유형: [{"key", "label", "type"}, ...]})"""
+    return {
+        asset_type: [field._asdict() for field in fields]
+        for asset_type, fields in ATTRIBUTE_SCHEMAS.items()
+    }
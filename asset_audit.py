@@ -0,0 +1,269 @@
+"""
+실사(재고 조사) 대조
+위치별로 스캔한 태그 목록을 임시 테이블에 COPY로 적재하고, 조인 한 번으로 자산과 대조하여
+결과를 실사 회차(audit_runs)와 항목(audit_items)으로 저장합니다. 5만 건 단위의 스캔도 태그마다
+쿼리를 보내지 않고 해시 조인으로 처리합니다.
+
+- matched: 스캔한 자산이 실사 위치(하위 위치 포함)에 등록되어 있음
+- misplaced: 스캔한 자산이 다른 위치에 등록되어 있음
+- unexpected: 스캔한 태그와 일치하는 자산이 없음
+- missing: 실사 위치에 등록된 자산(폐기 제외)이 스캔되지 않음
+
+태그는 자산 태그(asset_tag) 또는 시리얼 번호(serial_number)와 비교하며, 같은 값이면 자산 태그를 우선합니다.
+apply_corrections()는 잘못된 위치의 자산을 실사 위치로 옮기고, 누락 자산의 상태를 한 번에 바꾸며
+바뀐 자산마다 이력을 남깁니다.
+"""
+
+import csv
+import io
+import logging
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ('matched', 'misplaced', 'unexpected', 'missing')
+
+# 한 회차에 받을 수 있는 스캔 태그 수
+MAX_SCAN_TAGS = 200000
+
+RUN_COLUMNS = """
+    r.id, r.location_id, l.name AS location_name, r.note, r.scanned_count, r.matched_count,
+    r.missing_count, r.unexpected_count, r.misplaced_count, r.created_at, r.corrected_at
+"""
+
+CREATE_SCAN_TABLE = "CREATE TEMP TABLE audit_scan (tag VARCHAR(128) PRIMARY KEY) ON COMMIT DROP"
+
+# 스캔한 태그를 자산 태그, 없으면 시리얼 번호로 해석 (두 번의 해시 조인, OR 조인 조건을 피함)
+RECONCILE = """
+    WITH scope AS (
+        SELECT descendant_id FROM location_closure WHERE ancestor_id = %(location_id)s
+    ),
+    scanned AS (
+        SELECT s.tag, COALESCE(t.id, sn.id) AS asset_id, COALESCE(t.location_id, sn.location_id) AS location_id
+        FROM audit_scan s
+        LEFT JOIN assets t ON t.asset_tag = s.tag
+        LEFT JOIN assets sn ON sn.serial_number = s.tag AND t.id IS NULL
+    )
+    INSERT INTO audit_items (run_id, outcome, tag, asset_id, recorded_location_id)
+    SELECT %(run_id)s,
+           CASE
+               WHEN s.asset_id IS NULL THEN 'unexpected'
+               WHEN s.location_id IN (SELECT descendant_id FROM scope) THEN 'matched'
+               ELSE 'misplaced'
+           END,
+           s.tag, s.asset_id, s.location_id
+    FROM scanned s
+    UNION ALL
+    SELECT %(run_id)s, 'missing', NULL, a.id, a.location_id
+    FROM assets a
+    WHERE a.location_id IN (SELECT descendant_id FROM scope)
+      AND a.status <> '폐기'
+      AND NOT EXISTS (SELECT 1 FROM scanned s WHERE s.asset_id = a.id)
+"""
+
+UPDATE_RUN_COUNTS = """
+    UPDATE audit_runs r
+    SET scanned_count = c.scanned,
+        matched_count = c.matched,
+        missing_count = c.missing,
+        unexpected_count = c.unexpected,
+        misplaced_count = c.misplaced
+    FROM (
+        SELECT COUNT(*) FILTER (WHERE outcome <> 'missing') AS scanned,
+               COUNT(*) FILTER (WHERE outcome = 'matched') AS matched,
+               COUNT(*) FILTER (WHERE outcome = 'missing') AS missing,
+               COUNT(*) FILTER (WHERE outcome = 'unexpected') AS unexpected,
+               COUNT(*) FILTER (WHERE outcome = 'misplaced') AS misplaced
+        FROM audit_items
+        WHERE run_id = %(run_id)s
+    ) c
+    WHERE r.id = %(run_id)s
+"""
+
+# 잘못된 위치의 자산을 실사 위치로 옮기고 이력을 남김.
+# UPDATE ... FROM에서 같은 테이블을 다시 조인한 prev는 갱신 전 행이므로 RETURNING에서 이전 값을 함께 얻을 수 있음
+MOVE_MISPLACED = """
+    WITH changed AS (
+        UPDATE assets a
+        SET location_id = r.location_id
+        FROM audit_items i
+        JOIN audit_runs r ON r.id = i.run_id
+        JOIN assets prev ON prev.id = i.asset_id
+        WHERE i.run_id = %(run_id)s
+          AND i.outcome = 'misplaced'
+          AND a.id = i.asset_id
+          AND a.location_id IS DISTINCT FROM r.location_id
+        RETURNING a.id, prev.location_id AS old_location_id, prev.location AS old_location,
+                  a.location_id, a.location
+    )
+    INSERT INTO asset_history (asset_id, action, old_values, new_values)
+    SELECT id, 'UPDATE',
+           jsonb_build_object('Location ID', old_location_id, 'Location', old_location),
+           jsonb_build_object('Location ID', location_id, 'Location', location, 'Audit Run', %(run_id)s)
+    FROM changed
+"""
+
+MARK_MISSING = """
+    WITH changed AS (
+        UPDATE assets a
+        SET status = %(status)s::asset_status_enum
+        FROM audit_items i
+        JOIN assets prev ON prev.id = i.asset_id
+        WHERE i.run_id = %(run_id)s
+          AND i.outcome = 'missing'
+          AND a.id = i.asset_id
+          AND a.status IS DISTINCT FROM %(status)s::asset_status_enum
+        RETURNING a.id, prev.status AS old_status, a.status
+    )
+    INSERT INTO asset_history (asset_id, action, old_values, new_values)
+    SELECT id, 'UPDATE',
+           jsonb_build_object('Status', old_status),
+           jsonb_build_object('Status', status, 'Audit Run', %(run_id)s)
+    FROM changed
+"""
+
+
+def normalize_tags(tags):
+    """앞뒤 공백을 제거하고 빈 값과 중복을 뺀 태그 목록을 스캔 순서대로 반환합니다."""
+    tags = list(dict.fromkeys(tag for tag in (str(tag).strip() for tag in tags if tag is not None) if tag))
+    if len(tags) > MAX_SCAN_TAGS:
+        raise ValueError(f"한 회차에 받을 수 있는 태그는 {MAX_SCAN_TAGS:,}개까지입니다 (요청: {len(tags):,}개)")
+    too_long = [tag for tag in tags if len(tag) > 128]
+    if too_long:
+        raise ValueError(f"태그는 128자를 넘을 수 없습니다: {too_long[0][:40]}...")
+    return tags
+
+
+def read_tag_file(stream):
+    """업로드한 텍스트/CSV 파일에서 태그를 읽습니다 (한 줄에 하나, 여러 열이면 첫 열)."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace')
+    return [row[0] for row in csv.reader(text) if row]
+
+
+def _copy_buffer(tags):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for tag in tags:
+        writer.writerow((tag,))
+    buffer.seek(0)
+    return buffer
+
+
+class AssetAuditor:
+    def __init__(self, manager, db_config):
+        """manager: ITAssetManager (회차 조회와 일괄 수정에 사용)
+        db_config: 스캔 목록을 COPY로 적재할 전용 연결의 설정
+        """
+        self.manager = manager
+        self.db = manager.db
+        self.db_config = db_config
+
+    def run_audit(self, location_id, tags, note=None):
+        """스캔한 태그를 location_id(하위 위치 포함)의 자산과 대조하여 회차를 저장하고 요약을 반환합니다.
+
+        적재, 대조, 건수 기록은 전용 연결의 한 트랜잭션에서 실행되므로 실패하면 회차가 남지 않습니다.
+        """
+        tags = normalize_tags(tags)
+        if self.manager.get_location(location_id) is None:
+            raise ValueError(f"ID {location_id}인 위치를 찾을 수 없습니다")
+
+        connection = psycopg2.connect(application_name='asset_audit', **self.db_config)
+        try:
+            with connection, connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO audit_runs (location_id, note) VALUES (%s, %s) RETURNING id",
+                    (location_id, note)
+                )
+                run_id = cursor.fetchone()[0]
+                cursor.execute(CREATE_SCAN_TABLE)
+                cursor.copy_expert("COPY audit_scan (tag) FROM STDIN WITH (FORMAT csv)", _copy_buffer(tags))
+                cursor.execute("ANALYZE audit_scan")
+                params = {'run_id': run_id, 'location_id': location_id}
+                cursor.execute(RECONCILE, params)
+                cursor.execute(UPDATE_RUN_COUNTS, params)
+        except Exception as e:
+            logger.error(f"위치 {location_id} 실사 대조 중 오류 발생: {e}")
+            raise
+        finally:
+            connection.close()
+
+        run = self.get_run(run_id)
+        logger.info(
+            f"실사 {run_id} 완료: 위치 {location_id}, 스캔 {run['scanned_count']}건, 일치 {run['matched_count']}건, "
+            f"누락 {run['missing_count']}건, 미등록 {run['unexpected_count']}건, 위치 불일치 {run['misplaced_count']}건"
+        )
+        return run
+
+    def get_run(self, run_id):
+        """회차 요약을 반환합니다. 없으면 None입니다."""
+        result = self.db.execute_query(
+            f"SELECT {RUN_COLUMNS} FROM audit_runs r JOIN locations l ON l.id = r.location_id WHERE r.id = %s",
+            (run_id,)
+        )
+        return result[0] if result else None
+
+    def list_runs(self, location_id=None, limit=50):
+        """최근 회차 요약을 반환합니다 (위치별 추이 보고용). location_id를 주면 그 위치의 회차만 반환합니다."""
+        where = "WHERE r.location_id = %s" if location_id is not None else ""
+        params = (location_id, limit) if location_id is not None else (limit,)
+        return self.db.execute_query(
+            f"""
+                SELECT {RUN_COLUMNS}
+                FROM audit_runs r JOIN locations l ON l.id = r.location_id
+                {where}
+                ORDER BY r.created_at DESC, r.id DESC
+                LIMIT %s
+            """,
+            params, operation='list'
+        )
+
+    def get_items(self, run_id, outcome=None):
+        """회차의 항목을 자산의 현재 정보(모델, 태그, 상태, 위치)와 함께 반환합니다."""
+        if outcome is not None and outcome not in OUTCOMES:
+            raise ValueError(f"알 수 없는 결과입니다: {outcome} (허용: {', '.join(OUTCOMES)})")
+        condition = "AND i.outcome = %s" if outcome is not None else ""
+        params = (run_id, outcome) if outcome is not None else (run_id,)
+        return self.db.execute_query(
+            f"""
+                SELECT i.outcome, i.tag, i.asset_id, i.recorded_location_id,
+                       a.model, a.asset_tag, a.serial_number, a.status, a.location_id, l.name AS location_name
+                FROM audit_items i
+                LEFT JOIN assets a ON a.id = i.asset_id
+                LEFT JOIN locations l ON l.id = a.location_id
+                WHERE i.run_id = %s {condition}
+                ORDER BY i.outcome, i.id
+            """,
+            params, operation='list'
+        )
+
+    def apply_corrections(self, run_id, move_misplaced=True, missing_status=None):
+        """회차 결과로 자산을 일괄 수정합니다.
+
+        move_misplaced: 위치 불일치 자산을 실사 위치로 옮김
+        missing_status: 주면 누락 자산의 상태를 이 값으로 바꿈 (예: '유휴')
+        이미 같은 값인 자산은 건너뛰며, 바뀐 자산마다 이력을 남기고 {"moved": n, "status_changed": n}을 반환합니다.
+        """
+        if self.get_run(run_id) is None:
+            raise ValueError(f"ID {run_id}인 실사 회차를 찾을 수 없습니다")
+        if missing_status is not None:
+            allowed = self.manager.get_labels()["Status"]
+            if missing_status not in allowed:
+                raise ValueError(f"Status 값이 올바르지 않습니다: {missing_status!r} (허용: {', '.join(allowed)})")
+
+        params = {'run_id': run_id, 'status': missing_status}
+        try:
+            with self.db.transaction():
+                moved = self.db.execute_query(MOVE_MISPLACED, params) if move_misplaced else 0
+                status_changed = self.db.execute_query(MARK_MISSING, params) if missing_status is not None else 0
+                self.db.execute_query(
+                    "UPDATE audit_runs SET corrected_at = CURRENT_TIMESTAMP WHERE id = %s", (run_id,)
+                )
+        except Exception as e:
+            logger.error(f"실사 {run_id} 일괄 수정 중 오류 발생: {e}")
+            raise
+
+        if moved or status_changed:
+            self.manager.bump_generation()
+        logger.info(f"실사 {run_id} 일괄 수정: 위치 이동 {moved}건, 상태 변경 {status_changed}건")
+        return {'moved': moved, 'status_changed': status_changed}
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+자산 데이터 내보내기 (CSV / Parquet / Arrow IPC / XLSX)
+ITAssetManager.iter_asset_batches()가 서버 측 커서에서 읽어 주는 행 배치를 받아
+배치 단위로 파일에 씁니다. 어떤 형식이든 메모리에는 한 배치만 올라가므로
+백만 건 이상의 내보내기에도 메모리 사용량이 일정합니다.
+
+- Parquet: 배치마다 row group 하나, zstd 압축, 날짜/정수 타입과 유형·상태·위치 사전 인코딩 유지
+- Arrow IPC: 같은 스키마의 파일 형식(.arrow), zstd 압축
+- 유형·상태·위치 사전은 모든 배치가 함께 쓰며 ENUM 레이블 순서로 시작합니다. 처음 보는 값(사용자가 추가한 위치 등)은
+  사전 끝에 덧붙이므로 앞 배치의 인덱스가 바뀌지 않고, Arrow IPC 파일에는 사전 추가분(delta)만 기록됩니다.
+- XLSX: 기존 "Asset Management.xlsx"와 같은 컬럼 배치, openpyxl write_only 모드
+- CSV: 기존 /export/csv와 같은 형식
+
+사용법:
+    python asset_export.py --format parquet -o assets.parquet
+    python asset_export.py --format xlsx -o "Asset Management.xlsx" --docker
+"""
+
+import argparse
+import csv
+import io
+import logging
+import os
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = ["ID", "Type", "Model", "Purchase Date", "Warranty", "Status", "Location", "Reason"]
+
+EXPORT_BATCH_SIZE = 10000
+
+# 형식 -> (MIME 타입, 확장자)
+FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', '.arrow'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+}
+
+XLSX_SHEET_TITLE = 'Asset Management'
+XLSX_COLUMN_WIDTHS = {
+    "ID": 8, "Type": 10, "Model": 30, "Purchase Date": 14,
+    "Warranty": 12, "Status": 10, "Location": 16, "Reason": 40,
+}
+
+
+# 사전 인코딩하는 컬럼 (ITAssetManager.get_labels()의 키와 같음)
+CATEGORY_COLUMNS = ("Type", "Status", "Location")
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    # 위치는 사용자가 관리하는 테이블이므로 int8(127개)로는 부족함
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('ID', pa.int32()),
+        ('Type', category),
+        ('Model', pa.string()),
+        ('Purchase Date', pa.date32()),
+        ('Warranty', pa.string()),
+        ('Status', category),
+        ('Location', category),
+        ('Reason', pa.string()),
+    ])
+
+
+class _CategoryEncoder:
+    """배치 사이에 공유하는 사전. 처음 보는 값은 끝에 추가되므로 이미 쓴 인덱스는 바뀌지 않습니다."""
+
+    def __init__(self, labels=()):
+        self.values = []
+        self.codes = {}
+        for label in labels:
+            self._code(label)
+
+    def _code(self, value):
+        if value is None:
+            return None
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values, dictionary_type):
+        import pyarrow as pa
+
+        indices = pa.array([self._code(value) for value in values], type=dictionary_type.index_type)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.values, type=dictionary_type.value_type))
+
+
+def _category_encoders(labels):
+    labels = labels or {}
+    return {column: _CategoryEncoder(labels.get(column, ())) for column in CATEGORY_COLUMNS}
+
+
+def _record_batch(rows, schema, encoders):
+    import pyarrow as pa
+
+    columns = []
+    for field in schema:
+        values = [row[field.name] for row in rows]
+        if field.name in encoders:
+            columns.append(encoders[field.name].encode(values, field.type))
+        else:
+            columns.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def write_parquet(batches, sink, labels=None):
+    """labels: 사전의 처음 값 ({"Type": (...), "Status": (...), "Location": (...)}, get_labels()와 같은 형태)"""
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema()
+    encoders = _category_encoders(labels)
+    rows_written = 0
+    with pq.ParquetWriter(sink, schema, compression='zstd') as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(rows, schema, encoders))
+            rows_written += len(rows)
+    return rows_written
+
+
+def write_arrow(batches, sink, labels=None):
+    """labels: write_parquet()와 같음"""
+    import pyarrow as pa
+
+    schema = arrow_schema()
+    encoders = _category_encoders(labels)
+    rows_written = 0
+    # IPC 파일 형식은 사전 교체를 허용하지 않으므로, 배치마다 늘어난 부분만 delta로 기록
+    options = pa.ipc.IpcWriteOptions(compression='zstd', emit_dictionary_deltas=True)
+    with pa.ipc.new_file(sink, schema, options=options) as writer:
+        for rows in batches:
+            writer.write_batch(_record_batch(rows, schema, encoders))
+            rows_written += len(rows)
+    return rows_written
+
+
+def write_xlsx(batches, sink):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(XLSX_SHEET_TITLE)
+    for index, column in enumerate(EXPORT_COLUMNS):
+        sheet.column_dimensions[get_column_letter(index + 1)].width = XLSX_COLUMN_WIDTHS[column]
+    sheet.freeze_panes = 'A2'
+
+    header = []
+    for column in EXPORT_COLUMNS:
+        cell = WriteOnlyCell(sheet, value=column)
+        cell.font = Font(bold=True)
+        header.append(cell)
+    sheet.append(header)
+
+    # write_only 모드의 행은 바로 임시 파일로 흘려보내지므로 메모리에 쌓이지 않음
+    rows_written = 0
+    for rows in batches:
+        for row in rows:
+            values = [row[column] for column in EXPORT_COLUMNS]
+            if values[3] is not None:
+                date_cell = WriteOnlyCell(sheet, value=values[3])
+                date_cell.number_format = 'yyyy-mm-dd'
+                values[3] = date_cell
+            sheet.append(values)
+        rows_written += len(rows)
+    workbook.save(sink)
+    return rows_written
+
+
+def write_csv(batches, sink):
+    if isinstance(sink, str):
+        text = open(sink, 'w', encoding='utf-8-sig', newline='')
+    else:
+        text = io.TextIOWrapper(sink, encoding='utf-8-sig', newline='')
+    rows_written = 0
+    try:
+        writer = csv.writer(text)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in batches:
+            writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in rows)
+            rows_written += len(rows)
+    finally:
+        if isinstance(sink, str):
+            text.close()
+        else:
+            # 호출자의 파일 객체는 닫지 않음
+            text.flush()
+            text.detach()
+    return rows_written
+
+
+# 사전 인코딩 컬럼이 있어 ENUM 레이블을 받는 형식
+CATEGORY_FORMATS = ('parquet', 'arrow')
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet,
+    'arrow': write_arrow,
+    'xlsx': write_xlsx,
+}
+
+
+def _with_progress(batches, progress):
+    # 다음 배치를 요청받은 시점에는 직전 배치가 이미 기록되어 있음
+    done = 0
+    for rows in batches:
+        yield rows
+        done += len(rows)
+        progress(done)
+
+
+def export_assets(manager, file_format, sink, batch_size=EXPORT_BATCH_SIZE, progress=None):
+    """manager의 자산을 file_format으로 sink(경로 또는 바이너리 파일 객체)에 쓰고 행 수를 반환합니다.
+
+    progress는 배치를 쓸 때마다 지금까지 쓴 행 수로 호출됩니다. 예외를 던지면 내보내기가 중단됩니다.
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {file_format}")
+    batches = manager.iter_asset_batches(batch_size)
+    if progress is not None:
+        batches = _with_progress(batches, progress)
+    if file_format in CATEGORY_FORMATS:
+        return WRITERS[file_format](batches, sink, labels=manager.get_labels())
+    return WRITERS[file_format](batches, sink)
+
+
+def format_for_path(path):
+    extension = os.path.splitext(path)[1].lower()
+    for file_format, (_, format_extension) in FORMATS.items():
+        if extension == format_extension:
+            return file_format
+    raise ValueError(f"확장자로 내보내기 형식을 알 수 없습니다: {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IT 자산 데이터 내보내기")
+    parser.add_argument('--format', choices=sorted(FORMATS), help="내보내기 형식 (생략하면 출력 파일 확장자로 판단)")
+    parser.add_argument('-o', '--output', required=True, help="출력 파일 경로")
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE)
+    parser.add_argument('--docker', action='store_true', help="DC_config (Docker) 설정 사용")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.docker:
+        from DC_asset_manager import ITAssetManager
+    else:
+        from PS_asset_manager import ITAssetManager
+
+    try:
+        file_format = args.format or format_for_path(args.output)
+        manager = ITAssetManager()
+        started = time.monotonic()
+        rows = export_assets(manager, file_format, args.output, args.batch_size)
+    except Exception as e:
+        print(f"❌ 내보내기 실패: {e}")
+        sys.exit(1)
+
+    elapsed = time.monotonic() - started
+    print(f"✅ {rows:,}건을 {args.output}({file_format})로 내보냈습니다. ({elapsed:.1f}초)")
+
+
+if __name__ == '__main__':
+    main()
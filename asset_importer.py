@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+CSV / JSON Lines / Parquet / Excel 자산 데이터 임포터
+구매·CMDB 시스템이 내보낸 파일을 배치 단위로 스트리밍하여 엑셀 마이그레이션과 같은
+변환/검증(asset_transform) 단계와 COPY 적재 경로로 데이터베이스에 넣습니다.
+입력 없이 실행되므로 야간 배치 작업에 그대로 사용할 수 있고, 연결 설정은 PS_config(.env/환경 변수)를 따릅니다.
+
+- CSV, JSONL은 줄 단위로 batch_size 행씩, Parquet은 row group을 batch_size 행씩 읽습니다.
+- 배치마다 자산 INSERT와 migration_checkpoints 기록을 한 트랜잭션으로 커밋하므로
+  중단된 작업을 같은 파일로 다시 실행하면 마지막으로 커밋된 행 다음부터 재개하고, 끝까지 가져온 파일(시트)은 건너뜁니다.
+  재개 위치는 행 수이며 엑셀 파일은 migrate_excel_data와 같은 체크포인트를 쓰므로, 배치 크기가 다르거나
+  다른 로더로 중단된 파일도 이어서 가져올 수 있습니다.
+- 거부된 행은 사유 코드와 함께 거부 파일(기본: <파일명>_rejects.csv)에 기록합니다.
+
+사용법:
+    python asset_importer.py assets.csv cmdb.jsonl procurement.parquet
+    python asset_importer.py export.csv --batch-size 50000 --rejects /var/log/assets_rejects.csv
+    python asset_importer.py export.parquet --dry-run      # 데이터베이스 없이 변환/검증만
+    python asset_importer.py export.csv --docker           # DC_config 설정 사용
+
+라이브러리로 사용:
+    from asset_importer import import_files
+    report = import_files(['assets.csv'], batch_size=50000)
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+import openpyxl
+import pandas as pd
+import psycopg2
+
+from asset_transform import RejectsWriter, map_source_columns, transform_frame
+from migrate_excel_data import (
+    Batch, DELETE_CHECKPOINTS, ExcelToPostgreSQLMigrator, SELECT_CHECKPOINTS, UPSERT_CHECKPOINT, file_sha256,
+    load_frame
+)
+from schema_migrations import SchemaMigrator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 50000
+
+FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.xlsx': 'xlsx',
+}
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {path} (지원: {', '.join(sorted(FORMATS))})")
+    return FORMATS[extension]
+
+
+def _read_csv(path, batch_size):
+    # 1행은 헤더이므로 데이터 행 번호는 2부터 시작
+    for chunk in pd.read_csv(path, chunksize=batch_size, dtype=str, encoding='utf-8-sig'):
+        chunk.index = chunk.index + 2
+        yield chunk
+
+
+def _read_jsonl(path, batch_size):
+    for chunk in pd.read_json(path, lines=True, chunksize=batch_size, dtype=False, convert_dates=False):
+        chunk.index = chunk.index + 1
+        yield chunk
+
+
+def _read_parquet(path, batch_size):
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    offset = 1
+    for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+        chunk = record_batch.to_pandas()
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+READERS = {
+    'csv': _read_csv,
+    'jsonl': _read_jsonl,
+    'parquet': _read_parquet,
+}
+
+
+def source_sheets(path, file_format=None):
+    """체크포인트를 기록하는 단위 목록을 반환합니다. 엑셀은 시트 이름들, 그 외 형식은 형식 이름 하나입니다."""
+    file_format = file_format or detect_format(path)
+    if file_format != 'xlsx':
+        return [file_format]
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+def iter_batches(path, batch_size=DEFAULT_BATCH_SIZE, file_format=None, skip=None, sheets=None):
+    """파일을 스트리밍으로 읽어 변환/검증된 Batch를 생성합니다.
+
+    skip은 {시트: 건너뛸 행 수}로, 앞에서부터 그만큼의 행은 읽기만 하고 변환하지 않습니다 (체크포인트 재개용).
+    엑셀 파일은 시트별로 나뉘며 (sheets로 선택), 그 외 형식의 시트 이름은 형식 이름입니다.
+    """
+    file_format = file_format or detect_format(path)
+    skip = skip or {}
+    if file_format == 'xlsx':
+        parser = ExcelToPostgreSQLMigrator(path, None)
+        yield from parser.iter_excel_batches(batch_size, sheets=sheets, skip=skip)
+        return
+
+    offset = skip.get(file_format, 0)
+    number = 0
+    for chunk in READERS[file_format](path, batch_size):
+        if offset >= len(chunk):
+            offset -= len(chunk)
+            continue
+        chunk = chunk.iloc[offset:]
+        offset = 0
+        number += 1
+        # 읽은 행 수(재개 위치)에는 값이 모두 빈 행도 포함
+        rows_read = len(chunk)
+        chunk = chunk.rename(columns=map_source_columns(chunk.columns)).dropna(how='all')
+        result = transform_frame(chunk)
+        yield Batch(file_format, number, result.valid, rows_read, result.rejects)
+
+
+class AssetImporter:
+    def __init__(self, db_config=None, batch_size=DEFAULT_BATCH_SIZE, rejects_path=None, resume=True):
+        self.db_config = db_config
+        self.batch_size = batch_size
+        self.rejects_path = rejects_path
+        self.resume = resume
+        self.connection = None
+
+    def connect(self):
+        if self.db_config is None:
+            from PS_config import DB_CONFIG, DB_CONNECT_TIMEOUT, DB_AUTO_MIGRATE
+            self.db_config = dict(DB_CONFIG, connect_timeout=DB_CONNECT_TIMEOUT)
+            auto_migrate = DB_AUTO_MIGRATE
+        else:
+            auto_migrate = True
+        self.connection = psycopg2.connect(application_name='asset_importer', **self.db_config)
+        SchemaMigrator(self.connection).ensure_schema(auto_migrate)
+        self.connection.autocommit = False
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def import_file(self, path, file_format=None, dry_run=False, progress=None):
+        """파일 하나를 가져오고 처리 결과를 반환합니다. dry_run이면 데이터베이스에 쓰지 않습니다.
+
+        progress는 배치가 커밋될 때마다 누적 결과 dict로 호출됩니다. 예외를 던지면 그 배치까지
+        커밋된 상태로 중단되며, 같은 파일을 다시 가져오면 체크포인트에서 재개합니다.
+        시트(엑셀 외 형식은 파일)의 마지막 배치까지 커밋하면 체크포인트에 완료로 기록합니다.
+        """
+        file_format = file_format or detect_format(path)
+        rejects_path = self.rejects_path or os.path.splitext(path)[0] + '_rejects.csv'
+        result = {
+            'file': path, 'format': file_format, 'batches': 0, 'resumed_from': 0,
+            'rows_read': 0, 'rows_rejected': 0, 'loaded': 0, 'skipped': 0,
+            'already_imported': [], 'rejects_file': None, 'dry_run': dry_run,
+        }
+        started = time.monotonic()
+
+        file_hash = None
+        checkpoints = {}
+        cursor = None
+        if not dry_run:
+            file_hash = file_sha256(path)
+            cursor = self.connection.cursor()
+            if self.resume:
+                cursor.execute(SELECT_CHECKPOINTS, (file_hash,))
+                checkpoints = {sheet: (rows_read, completed) for sheet, rows_read, completed in cursor.fetchall()}
+            else:
+                # 처음부터 다시 적재하므로 이전 실행의 재개 위치가 이번 실행의 행 수에 더해지지 않도록 지움
+                cursor.execute(DELETE_CHECKPOINTS, (file_hash,))
+            self.connection.commit()
+
+        sheets = []
+        for sheet in source_sheets(path, file_format):
+            if checkpoints.get(sheet, (0, False))[1]:
+                result['already_imported'].append(sheet)
+            else:
+                sheets.append(sheet)
+        if result['already_imported']:
+            logger.info(f"[{os.path.basename(path)}] 이미 가져온 시트를 건너뜁니다: {result['already_imported']}")
+        skip = {sheet: checkpoints[sheet][0] for sheet in sheets if sheet in checkpoints}
+        result['resumed_from'] = sum(skip.values())
+
+        with RejectsWriter(rejects_path) as rejects:
+            for sheet in sheets:
+                for batch in iter_batches(path, self.batch_size, file_format, skip=skip, sheets=[sheet]):
+                    if dry_run:
+                        loaded, skipped = 0, 0
+                    else:
+                        try:
+                            loaded, skipped = load_frame(cursor, batch.frame)
+                            cursor.execute(UPSERT_CHECKPOINT, (
+                                file_hash, batch.sheet, path, 1, batch.rows_read, loaded, skipped, False
+                            ))
+                            self.connection.commit()
+                        except Exception:
+                            self.connection.rollback()
+                            raise
+                    rejects.write(batch.rejects, path, batch.sheet)
+
+                    result['batches'] += 1
+                    result['rows_read'] += batch.rows_read
+                    result['rows_rejected'] += len(batch.rejects)
+                    result['loaded'] += loaded
+                    result['skipped'] += skipped
+                    elapsed = max(time.monotonic() - started, 1e-9)
+                    logger.info(
+                        f"[{os.path.basename(path)}] 배치 {batch.number}: 읽음 {batch.rows_read}, "
+                        f"삽입 {loaded}, 중복 {skipped}, 거부 {len(batch.rejects)} "
+                        f"({result['rows_read'] / elapsed:,.0f}행/초)"
+                    )
+                    if progress is not None:
+                        progress(result)
+                if not dry_run:
+                    cursor.execute(UPSERT_CHECKPOINT, (file_hash, sheet, path, 0, 0, 0, 0, True))
+                    self.connection.commit()
+            if rejects.count:
+                result['rejects_file'] = rejects_path
+
+        if not dry_run:
+            cursor.close()
+        result['elapsed_seconds'] = time.monotonic() - started
+        return result
+
+    def import_files(self, paths, file_format=None, dry_run=False):
+        results = []
+        if not dry_run:
+            self.connect()
+        try:
+            for path in paths:
+                results.append(self.import_file(path, file_format, dry_run))
+        finally:
+            self.close()
+        return results
+
+
+def import_files(paths, batch_size=DEFAULT_BATCH_SIZE, file_format=None, dry_run=False,
+                 rejects_path=None, db_config=None, resume=True):
+    """파일들을 순서대로 가져오고 파일별 결과 목록을 반환합니다. 연결 설정 기본값은 PS_config입니다."""
+    importer = AssetImporter(db_config, batch_size, rejects_path, resume)
+    return importer.import_files(paths, file_format, dry_run)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="CSV / JSONL / Parquet / Excel 자산 데이터 임포터",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('files', nargs='+', help="가져올 파일 (확장자로 형식 판단)")
+    parser.add_argument('--format', choices=sorted(set(FORMATS.values())), help="파일 형식 강제 지정")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--rejects', help="거부 행을 기록할 CSV 경로 (기본: <파일명>_rejects.csv)")
+    parser.add_argument('--dry-run', action='store_true', help="데이터베이스에 쓰지 않고 변환/검증만 실행")
+    parser.add_argument('--no-resume', action='store_true', help="체크포인트를 지우고 처음부터 적재")
+    parser.add_argument('--docker', action='store_true', help="DC_config (Docker) 설정 사용")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    missing = [path for path in args.files if not os.path.exists(path)]
+    if missing:
+        print(f"❌ 파일을 찾을 수 없습니다: {', '.join(missing)}")
+        sys.exit(2)
+
+    db_config = None
+    if args.docker:
+        from DC_config import DB_CONFIG, DB_CONNECT_TIMEOUT
+        db_config = dict(DB_CONFIG, connect_timeout=DB_CONNECT_TIMEOUT)
+
+    try:
+        results = import_files(
+            args.files, args.batch_size, args.format, args.dry_run, args.rejects, db_config,
+            resume=not args.no_resume,
+        )
+    except (psycopg2.Error, ValueError) as e:
+        print(f"❌ 가져오기 실패: {e}")
+        sys.exit(1)
+
+    for result in results:
+        print(
+            f"{'🔎' if result['dry_run'] else '✅'} {result['file']} ({result['format']}): "
+            f"읽음 {result['rows_read']:,}, 삽입 {result['loaded']:,}, 중복 {result['skipped']:,}, "
+            f"거부 {result['rows_rejected']:,}, {result['elapsed_seconds']:.1f}초"
+        )
+        if result['already_imported']:
+            print(f"   이미 가져온 시트 건너뜀: {', '.join(result['already_imported'])}")
+        if result['resumed_from']:
+            print(f"   체크포인트에서 재개: 앞의 {result['resumed_from']:,}행 건너뜀")
+        if result['rejects_file']:
+            print(f"   거부 행: {result['rejects_file']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""
+마이그레이션 DataFrame 변환/검증 단계
+엑셀 등 원본에서 읽은 행을 데이터베이스에 넣을 수 있는 형태로 정규화합니다.
+
+- 유형/상태/위치의 한글·영문 별칭을 조회 테이블로 표준 값에 맞춥니다.
+- 구매일(문자열, 날짜, 엑셀 일련번호)과 보증기간("3", "36개월", "3 years" 등)을 해석합니다.
+- 텍스트 컬럼의 앞뒤 공백을 제거합니다.
+- 해석할 수 없는 행은 덮어쓰지 않고 사유 코드와 함께 거부 목록으로 분리합니다.
+
+모든 연산은 컬럼 단위로 수행되며, 문자열 해석은 고유 값에만 한 번씩 적용한 뒤
+pd.factorize 코드로 전체 행에 펼치므로 행 수가 많아도 비용은 고유 값 수에 비례합니다.
+"""
+
+import csv
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+VALID_TYPES = ('HW', 'SW', 'NW', 'STORAGE')
+VALID_STATUSES = ('입고', '대기', '운영', '유휴', '폐기')
+VALID_LOCATIONS = ('본사 서버실', '개인지급', '프로젝트장소', '기타')
+
+OUTPUT_COLUMNS = ['Type', 'Model', 'Purchase Date', 'Warranty', 'Status', 'Location', 'Reason']
+
+# 별칭 -> 표준 값 (비교 시 대소문자와 공백은 무시)
+TYPE_ALIASES = {
+    'HW': ['hardware', '하드웨어', 'h/w'],
+    'SW': ['software', '소프트웨어', 's/w'],
+    'NW': ['network', '네트워크', 'n/w'],
+    'STORAGE': ['스토리지', '저장장치', 'stor'],
+}
+
+STATUS_ALIASES = {
+    '입고': ['in stock', 'stock', 'received', 'new', '신규'],
+    '대기': ['waiting', 'pending', 'standby', 'ready', '준비'],
+    '운영': ['operating', 'in use', 'active', 'production', '운용', '사용', '사용중'],
+    '유휴': ['idle', 'unused', 'spare', '미사용'],
+    '폐기': ['disposed', 'retired', 'scrapped', 'dispose', '불용'],
+}
+
+LOCATION_ALIASES = {
+    '본사 서버실': ['server room', 'hq server room', 'idc', '서버실', '본사'],
+    '개인지급': ['personal', 'assigned', 'user', '개인', '개인 지급'],
+    '프로젝트장소': ['project', 'project site', 'site', '프로젝트', '현장'],
+    '기타': ['other', 'others', 'etc', 'misc'],
+}
+
+# 거부 사유 코드
+MISSING_TYPE = 'MISSING_TYPE'
+MISSING_MODEL = 'MISSING_MODEL'
+MISSING_STATUS = 'MISSING_STATUS'
+MISSING_LOCATION = 'MISSING_LOCATION'
+INVALID_TYPE = 'INVALID_TYPE'
+INVALID_STATUS = 'INVALID_STATUS'
+INVALID_LOCATION = 'INVALID_LOCATION'
+INVALID_DATE = 'INVALID_DATE'
+MODEL_TOO_LONG = 'MODEL_TOO_LONG'
+WARRANTY_TOO_LONG = 'WARRANTY_TOO_LONG'
+
+MAX_MODEL_LENGTH = 255
+MAX_WARRANTY_LENGTH = 255
+MIN_PURCHASE_YEAR = 1980
+MAX_PURCHASE_YEAR = 2100
+
+# 엑셀 날짜 일련번호의 기준일 (1900 윤년 버그 보정 포함)
+EXCEL_EPOCH = '1899-12-30'
+
+_WARRANTY_YEARS = re.compile(r'^(\d+(?:\.\d+)?)\s*(?:년|years?|yrs?|y)?$', re.IGNORECASE)
+_WARRANTY_MONTHS = re.compile(r'^(\d+)\s*(?:개월|months?|mos?|m)$', re.IGNORECASE)
+
+TransformResult = namedtuple('TransformResult', ['valid', 'rejects'])
+
+# 원본 컬럼명 -> 변환 단계 입력 컬럼명 (엑셀 헤더와 데이터베이스 컬럼명 모두 허용, 대소문자/공백/_ 무시)
+SOURCE_COLUMNS = {
+    'ID': ['id', 'asset_id'],
+    'Type': ['type', 'asset_type', '유형'],
+    'Model': ['model', '모델', '모델명'],
+    'Purchase Date': ['purchase_date', 'purchased', '구매일'],
+    'Warranty': ['warranty', '보증기간'],
+    'Status': ['status', '상태'],
+    'Location': ['location', '위치'],
+    'Reason': ['reason', 'note', '비고'],
+}
+
+
+def _alias_key(value):
+    return re.sub(r'\s+', '', str(value)).lower()
+
+
+def _build_lookup(aliases):
+    lookup = {}
+    for canonical, names in aliases.items():
+        for name in [canonical, *names]:
+            lookup[_alias_key(name)] = canonical
+    return lookup
+
+
+def _column_key(value):
+    return re.sub(r'[\s_]+', '', str(value)).lower()
+
+
+_SOURCE_COLUMN_LOOKUP = {
+    _column_key(name): canonical
+    for canonical, names in SOURCE_COLUMNS.items()
+    for name in [canonical, *names]
+}
+
+
+def map_source_columns(columns):
+    """원본 컬럼명을 변환 단계 컬럼명으로 바꾸는 매핑을 반환합니다. 알 수 없는 컬럼은 제외합니다."""
+    mapping = {}
+    for column in columns:
+        canonical = _SOURCE_COLUMN_LOOKUP.get(_column_key(column))
+        if canonical and canonical not in mapping.values():
+            mapping[column] = canonical
+    return mapping
+
+
+TYPE_LOOKUP = _build_lookup(TYPE_ALIASES)
+STATUS_LOOKUP = _build_lookup(STATUS_ALIASES)
+LOCATION_LOOKUP = _build_lookup(LOCATION_ALIASES)
+
+
+def _by_unique(series, convert):
+    """고유 값에만 convert를 적용하고 결과를 전체 행으로 펼칩니다. 결측은 결측으로 둡니다."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if len(uniques) == 0:
+        return pd.Series([None] * len(series), index=series.index, dtype=object)
+    converted = np.asarray(convert(pd.Series(uniques, dtype=object)), dtype=object)
+    values = np.append(converted, None)  # -1(결측) 코드는 마지막 None을 가리킴
+    return pd.Series(values[codes], index=series.index, dtype=object)
+
+
+def _blank_to_na(series):
+    """문자열로 바꾸고 앞뒤 공백을 제거하며, 빈 문자열은 결측으로 바꿉니다."""
+    text = _by_unique(series, lambda u: u.astype(str).str.strip())
+    return text.where(text.notna() & (text != ''), None)
+
+
+def _lookup(text, table):
+    return _by_unique(text, lambda u: u.map(lambda v: table.get(_alias_key(v))))
+
+
+def _parse_dates(series):
+    def convert(uniques):
+        is_number = uniques.map(lambda v: isinstance(v, (int, float, np.number)) and not isinstance(v, bool))
+        parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+        if is_number.any():
+            parsed[is_number] = pd.to_datetime(
+                uniques[is_number].astype(float), unit='D', origin=EXCEL_EPOCH, errors='coerce'
+            )
+        text = ~is_number
+        if text.any():
+            values = uniques[text].astype(str).str.strip()
+            parsed_text = pd.to_datetime(values, errors='coerce', format='mixed')
+            # "2024.01.15", "2024/1/15" 형식 재시도
+            retry = parsed_text.isna()
+            if retry.any():
+                parsed_text[retry] = pd.to_datetime(
+                    values[retry].str.replace(r'[./]', '-', regex=True), errors='coerce', format='mixed'
+                )
+            parsed[text] = parsed_text
+        in_range = parsed.dt.year.between(MIN_PURCHASE_YEAR, MAX_PURCHASE_YEAR)
+        return parsed.where(in_range).dt.normalize()
+
+    return pd.to_datetime(_by_unique(series, convert))
+
+
+def _normalize_warranty(value):
+    text = str(value).strip()
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        text = f"{float(value):g}"
+    match = _WARRANTY_YEARS.match(text)
+    if match:
+        return f"{float(match.group(1)):g}년"
+    match = _WARRANTY_MONTHS.match(text)
+    if match:
+        months = int(match.group(1))
+        return f"{months // 12}년" if months and months % 12 == 0 else f"{months}개월"
+    return text
+
+
+def transform_frame(df):
+    """원본 DataFrame을 정규화하고 (유효 행, 거부 행)으로 나눕니다.
+
+    유효 행은 OUTPUT_COLUMNS 컬럼을 가지며 원본 인덱스를 유지합니다.
+    거부 행은 원본 값에 reason_code 컬럼(';'로 구분된 사유 코드)을 더한 DataFrame입니다.
+    """
+    def column(name):
+        if name in df.columns:
+            return df[name]
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    raw_type = _blank_to_na(column('Type'))
+    raw_status = _blank_to_na(column('Status'))
+    raw_location = _blank_to_na(column('Location'))
+    model = _blank_to_na(column('Model'))
+    raw_date = column('Purchase Date')
+
+    out = pd.DataFrame(index=df.index)
+    out['Type'] = _lookup(raw_type, TYPE_LOOKUP)
+    out['Model'] = model
+    out['Purchase Date'] = _parse_dates(raw_date)
+    out['Warranty'] = _by_unique(column('Warranty'), lambda u: u.map(_normalize_warranty)).fillna('')
+    out['Status'] = _lookup(raw_status, STATUS_LOOKUP)
+    out['Location'] = _lookup(raw_location, LOCATION_LOOKUP)
+    out['Reason'] = _blank_to_na(column('Reason')).fillna('')
+
+    date_given = _blank_to_na(raw_date).notna()
+    checks = [
+        (MISSING_TYPE, raw_type.isna()),
+        (INVALID_TYPE, raw_type.notna() & out['Type'].isna()),
+        (MISSING_MODEL, model.isna()),
+        (MODEL_TOO_LONG, model.astype('string').str.len() > MAX_MODEL_LENGTH),
+        (INVALID_DATE, date_given & out['Purchase Date'].isna()),
+        (WARRANTY_TOO_LONG, out['Warranty'].astype('string').str.len() > MAX_WARRANTY_LENGTH),
+        (MISSING_STATUS, raw_status.isna()),
+        (INVALID_STATUS, raw_status.notna() & out['Status'].isna()),
+        (MISSING_LOCATION, raw_location.isna()),
+        (INVALID_LOCATION, raw_location.notna() & out['Location'].isna()),
+    ]
+
+    # 검사마다 한 비트를 쓰고, 사유 문자열은 실제로 나온 비트 조합마다 한 번만 만듦
+    flags = np.zeros(len(df), dtype=np.int32)
+    for bit, (_, mask) in enumerate(checks):
+        flags |= mask.fillna(False).to_numpy(dtype=bool).astype(np.int32) << bit
+    rejected = flags != 0
+
+    combinations, inverse = np.unique(flags[rejected], return_inverse=True)
+    labels = np.array([
+        ';'.join(code for bit, (code, _) in enumerate(checks) if combination >> bit & 1)
+        for combination in combinations
+    ], dtype=object)
+
+    rejects = df.loc[rejected].copy()
+    rejects['reason_code'] = labels[inverse] if len(labels) else []
+    return TransformResult(out.loc[~rejected], rejects)
+
+
+class RejectsWriter:
+    """거부 행을 CSV 파일에 이어서 기록합니다. 헤더는 파일이 비어 있을 때만 씁니다."""
+
+    FIELDS = ['source', 'sheet', 'row', 'reason_code'] + [
+        'ID', 'Type', 'Model', 'Purchase Date', 'Warranty', 'Status', 'Location', 'Reason'
+    ]
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, rejects, source, sheet=''):
+        if rejects is None or len(rejects) == 0:
+            return
+        if self._file is None:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, 'a', newline='', encoding='utf-8-sig')
+            self._writer = csv.writer(self._file)
+            if new_file:
+                self._writer.writerow(self.FIELDS)
+
+        out = pd.DataFrame({
+            'source': os.path.basename(str(source)),
+            'sheet': sheet,
+            'row': rejects.index,
+            'reason_code': rejects['reason_code'],
+        }, index=rejects.index)
+        for name in self.FIELDS[4:]:
+            out[name] = rejects[name] if name in rejects.columns else None
+        out = out.astype(object).where(out.notna(), None)
+        self._writer.writerows(out.itertuples(index=False, name=None))
+        self._file.flush()
+        self.count += len(rejects)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,388 @@
+"""
+백그라운드 작업 (웹 앱의 가져오기/내보내기/폐기 자산 보관)
+요청 스레드를 막지 않도록 오래 걸리는 가져오기와 내보내기, 폐기 자산 보관을 제한된 크기의 작업자 풀에서 실행합니다.
+
+- 작업 상태와 진행률은 jobs 테이블에 저장되므로 웹 앱이 재시작되어도 조회할 수 있습니다.
+  재시작 시 실행 중이던 작업은 다시 대기열에 넣습니다 (가져오기는 체크포인트에서 재개).
+- 대기 중인 작업이 JOB_QUEUE_LIMIT개를 넘으면 새 작업을 거절합니다 (JobQueueFullError).
+- 취소는 배치 사이에서 확인하며, 실행 중인 쿼리도 서버에서 취소합니다. 취소 요청은
+  jobs.cancel_requested에도 기록되므로 다른 프로세스에서 실행 중인 작업도 다음 진행률 기록 때 멈춥니다.
+- 업로드한 파일과 결과 파일은 job_dir/<작업 ID>/ 아래에 두고, 보관 기간이 지나면 작업과 함께 삭제합니다.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import psycopg2
+from psycopg2.extensions import QueryCanceledError
+
+from asset_export import FORMATS as EXPORT_FORMATS, export_assets
+from asset_importer import AssetImporter, FORMATS as IMPORT_FORMATS
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('import', 'export', 'archive')
+
+# 진행률을 데이터베이스에 기록하는 최소 간격 (초)
+PROGRESS_INTERVAL = 1.0
+# 재시작으로 다시 실행하는 횟수의 상한 (이를 넘으면 실패로 처리)
+MAX_ATTEMPTS = 3
+# 시작 시 데이터베이스 연결을 기다리며 복구를 재시도하는 간격 (초)
+RECOVERY_RETRY_SECONDS = 5
+
+JOB_COLUMNS = """
+    id, kind, status, params, progress, artifact_name, error, cancel_requested,
+    created_at, started_at, finished_at
+"""
+
+
+class JobCancelled(Exception):
+    """작업이 취소 요청으로 중단될 때 발생합니다."""
+
+
+class JobQueueFullError(Exception):
+    """대기 중인 작업이 너무 많아 새 작업을 받을 수 없을 때 발생합니다."""
+
+    def __init__(self, limit):
+        super().__init__(f"대기 중인 작업이 너무 많습니다 (최대 {limit}개). 잠시 후 다시 시도하세요.")
+        self.limit = limit
+
+
+class JobManager:
+    def __init__(self, manager, db_config, job_dir, workers=2, queue_limit=20, retention_hours=24):
+        """manager: ITAssetManager (상태 기록과 내보내기에 사용)
+        db_config: 가져오기 작업이 전용 연결을 열 때 사용할 연결 설정
+        """
+        self.manager = manager
+        self.db = manager.db
+        self.db_config = db_config
+        self.job_dir = job_dir
+        self.queue_limit = queue_limit
+        self.retention_hours = retention_hours
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._cancel_events = {}
+        # 실행 중인 작업의 쿼리를 취소하는 함수 (작업 ID -> 함수)
+        self._cancellers = {}
+        self._started = False
+
+    # ---- 시작과 복구 ----
+
+    def start(self):
+        """백그라운드에서 데이터베이스 연결을 기다린 뒤 중단된 작업을 복구합니다. 여러 번 호출해도 한 번만 실행됩니다."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._recover, name='job-recovery', daemon=True).start()
+
+    def _recover(self):
+        while True:
+            try:
+                self.db.ensure_connected()
+                break
+            except psycopg2.Error:
+                time.sleep(RECOVERY_RETRY_SECONDS)
+
+        try:
+            failed = self._query("""
+                UPDATE jobs
+                SET status = 'failed', error = '재시작 후 재시도 횟수를 초과했습니다.',
+                    finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'running' AND attempts >= %s
+                RETURNING id
+            """, (MAX_ATTEMPTS,))
+            requeued = self._query("""
+                UPDATE jobs SET status = 'queued', updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'running'
+                RETURNING id
+            """)
+            queued = self._query("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at")
+        except Exception as e:
+            logger.error(f"작업 복구 중 오류 발생: {e}")
+            return
+
+        for row in queued:
+            self._enqueue(row['id'])
+        if queued or failed:
+            logger.info(
+                f"작업 복구: 대기열 {len(queued)}개 (중단된 작업 {len(requeued)}개 포함), "
+                f"재시도 초과로 실패 처리 {len(failed)}개"
+            )
+        self.purge_expired()
+
+    # ---- 작업 등록과 조회 ----
+
+    def submit(self, kind, params, upload=None):
+        """작업을 등록하고 작업 정보를 반환합니다.
+
+        upload는 가져오기 작업의 업로드 파일(werkzeug FileStorage)로, 작업 디렉터리에 저장됩니다.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"알 수 없는 작업 종류입니다: {kind}")
+        with self._lock:
+            if len(self._pending) >= self.queue_limit:
+                raise JobQueueFullError(self.queue_limit)
+
+        self.purge_expired()
+        job_id = uuid.uuid4().hex
+        directory = self._directory(job_id)
+        os.makedirs(directory, exist_ok=True)
+        params = dict(params)
+        if upload is not None:
+            # 원래 파일 이름은 표시용으로만 보관하고, 디스크에는 확장자만 유지한 이름으로 저장
+            extension = os.path.splitext(upload.filename or '')[1].lower()
+            params['filename'] = upload.filename
+            params['input'] = f"upload{extension}"
+            upload.save(os.path.join(directory, params['input']))
+
+        try:
+            rows = self._query(
+                f"INSERT INTO jobs (id, kind, params) VALUES (%s, %s, %s) RETURNING {JOB_COLUMNS}",
+                (job_id, kind, json.dumps(params)),
+            )
+        except Exception:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+
+        self._enqueue(job_id)
+        logger.info(f"작업 등록: {job_id} ({kind})")
+        return rows[0]
+
+    def get(self, job_id):
+        rows = self._query(f"SELECT {JOB_COLUMNS} FROM jobs WHERE id = %s", (job_id,))
+        return rows[0] if rows else None
+
+    def list(self, limit=20):
+        return self._query(f"SELECT {JOB_COLUMNS} FROM jobs ORDER BY created_at DESC LIMIT %s", (limit,))
+
+    def artifact_path(self, job):
+        """완료된 작업의 결과 파일 경로를 반환합니다. 없으면 None입니다."""
+        if job['status'] != 'succeeded' or not job['artifact_name']:
+            return None
+        path = os.path.join(self._directory(job['id']), job['artifact_name'])
+        return path if os.path.exists(path) else None
+
+    def cancel(self, job_id):
+        """작업 취소를 요청하고 갱신된 작업 정보를 반환합니다. 이미 끝난 작업은 그대로 반환합니다."""
+        rows = self._query("""
+            UPDATE jobs
+            SET cancel_requested = TRUE,
+                status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE status END,
+                finished_at = CASE WHEN status = 'queued' THEN CURRENT_TIMESTAMP ELSE finished_at END,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status IN ('queued', 'running')
+        """, (job_id,))
+        if rows:
+            with self._lock:
+                event = self._cancel_events.get(job_id)
+                canceller = self._cancellers.get(job_id)
+            if event is not None:
+                event.set()
+            if canceller is not None:
+                canceller()
+            logger.info(f"작업 취소 요청: {job_id}")
+        return self.get(job_id)
+
+    def purge_expired(self):
+        """보관 기간이 지난 완료 작업과 파일을 삭제합니다."""
+        try:
+            rows = self._query("""
+                DELETE FROM jobs
+                WHERE status NOT IN ('queued', 'running')
+                  AND finished_at < CURRENT_TIMESTAMP - make_interval(hours => %s)
+                RETURNING id
+            """, (self.retention_hours,))
+        except Exception as e:
+            logger.error(f"만료된 작업 정리 중 오류 발생: {e}")
+            return 0
+        for row in rows:
+            shutil.rmtree(self._directory(row['id']), ignore_errors=True)
+        return len(rows)
+
+    def shutdown(self, wait=False):
+        with self._lock:
+            events = list(self._cancel_events.values())
+        for event in events:
+            event.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    # ---- 실행 ----
+
+    def _enqueue(self, job_id):
+        with self._lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+            self._cancel_events[job_id] = threading.Event()
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        try:
+            rows = self._query("""
+                UPDATE jobs
+                SET status = 'running', attempts = attempts + 1,
+                    started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND status = 'queued'
+                RETURNING kind, params
+            """, (job_id,))
+            if not rows:
+                # 대기 중에 취소되었거나 다른 프로세스가 먼저 가져감
+                return
+
+            kind, params = rows[0]['kind'], rows[0]['params']
+            runner = {'import': self._run_import, 'export': self._run_export, 'archive': self._run_archive}[kind]
+            logger.info(f"작업 시작: {job_id} ({kind})")
+            artifact_name, progress = runner(job_id, params)
+            self._finish(job_id, 'succeeded', progress=progress, artifact_name=artifact_name)
+            logger.info(f"작업 완료: {job_id} ({kind})")
+
+        except (JobCancelled, QueryCanceledError) as e:
+            if self._cancel_requested(job_id):
+                self._finish(job_id, 'cancelled')
+                logger.info(f"작업 취소됨: {job_id}")
+            else:
+                self._finish(job_id, 'failed', error=str(e))
+                logger.error(f"작업 실패: {job_id}: {e}")
+        except Exception as e:
+            self._finish(job_id, 'failed', error=str(e))
+            logger.error(f"작업 실패: {job_id}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(job_id)
+                self._cancel_events.pop(job_id, None)
+                self._cancellers.pop(job_id, None)
+
+    def _run_import(self, job_id, params):
+        directory = self._directory(job_id)
+        path = os.path.join(directory, params['input'])
+        rejects_path = os.path.join(directory, 'rejects.csv')
+        importer = AssetImporter(self.db_config, rejects_path=rejects_path)
+        importer.connect()
+        reporter = self._reporter(job_id)
+        try:
+            with self._lock:
+                self._cancellers[job_id] = importer.connection.cancel
+            result = importer.import_file(path, progress=lambda result: reporter(self._import_progress(result)))
+        finally:
+            with self._lock:
+                self._cancellers.pop(job_id, None)
+            importer.close()
+            # 별도 연결로 적재하므로 중단되었더라도 커밋된 배치가 있을 수 있음
+            self.manager.bump_generation()
+
+        # 재시작 전 실행에서 기록된 거부 행도 같은 파일에 이어서 쌓임
+        artifact_name = os.path.basename(rejects_path) if os.path.exists(rejects_path) else None
+        return artifact_name, self._import_progress(result)
+
+    @staticmethod
+    def _import_progress(result):
+        return {
+            key: result[key]
+            for key in ('batches', 'rows_read', 'loaded', 'skipped', 'rows_rejected', 'resumed_from')
+        }
+
+    def _run_export(self, job_id, params):
+        file_format = params['format']
+        _, extension = EXPORT_FORMATS[file_format]
+        artifact_name = f'assets_{datetime.now().strftime("%Y%m%d_%H%M%S")}{extension}'
+        path = os.path.join(self._directory(job_id), artifact_name)
+        reporter = self._reporter(job_id)
+
+        stats = self.manager.get_asset_statistics()
+        total = stats.get('total_assets')
+        with self.db.request_scope(operation='export') as token:
+            with self._lock:
+                self._cancellers[job_id] = lambda: self.db.cancel_query(token)
+            rows = export_assets(
+                self.manager, file_format, path,
+                progress=lambda done: reporter({'rows': done, 'total': total}),
+            )
+        return artifact_name, {'rows': rows, 'total': total}
+
+    def _run_archive(self, job_id, params):
+        """폐기된 지 older_than_days일이 지난 자산을 배치 단위로 보관 테이블로 옮깁니다 (결과 파일 없음)."""
+        reporter = self._reporter(job_id)
+        with self.db.request_scope() as token:
+            with self._lock:
+                self._cancellers[job_id] = lambda: self.db.cancel_query(token)
+            archived = self.manager.archive_disposed_assets(
+                params['older_than_days'], params['batch_size'],
+                progress=lambda done: reporter({'archived': done}),
+            )
+        return None, {'archived': archived}
+
+    def _reporter(self, job_id):
+        """취소를 확인하고 진행률을 PROGRESS_INTERVAL마다 기록하는 함수를 반환합니다."""
+        event = self._cancel_events.get(job_id)
+        last_write = [0.0]
+
+        def report(progress):
+            if event is not None and event.is_set():
+                raise JobCancelled(f"작업이 취소되었습니다: {job_id}")
+            now = time.monotonic()
+            if now - last_write[0] < PROGRESS_INTERVAL:
+                return
+            last_write[0] = now
+            # 작업의 취소 토큰 범위와 분리하여 기록
+            with self.db.request_scope():
+                rows = self._query("""
+                    UPDATE jobs SET progress = %s, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                    RETURNING cancel_requested
+                """, (json.dumps(progress), job_id))
+            if rows and rows[0]['cancel_requested']:
+                raise JobCancelled(f"작업이 취소되었습니다: {job_id}")
+
+        return report
+
+    def _finish(self, job_id, status, progress=None, artifact_name=None, error=None):
+        try:
+            with self.db.request_scope():
+                self._query("""
+                    UPDATE jobs
+                    SET status = %s, progress = COALESCE(%s::jsonb, progress), artifact_name = %s,
+                        error = %s, finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = %s
+                """, (status, json.dumps(progress) if progress is not None else None, artifact_name, error, job_id))
+        except Exception as e:
+            logger.error(f"작업 상태 기록 중 오류 발생: {job_id}: {e}")
+
+    def _cancel_requested(self, job_id):
+        event = self._cancel_events.get(job_id)
+        if event is not None and event.is_set():
+            return True
+        try:
+            with self.db.request_scope():
+                job = self.get(job_id)
+        except Exception:
+            return False
+        return bool(job and job['cancel_requested'])
+
+    def _directory(self, job_id):
+        return os.path.join(self.job_dir, job_id)
+
+    def _query(self, query, params=None):
+        return self.db.execute_query(query, params)
+
+
+def validate_import_filename(filename):
+    """업로드 파일 이름의 확장자가 가져오기 형식인지 확인합니다."""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension not in IMPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {filename} (지원: {', '.join(sorted(IMPORT_FORMATS))})")
+    return IMPORT_FORMATS[extension]
+
+
+def validate_export_format(file_format):
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {file_format}")
+    return file_format
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+실사 대조 벤치마크
+임시 위치 아래에 자산 태그가 있는 자산(기본 5만 건)을 만들고, 일부를 빼고 미등록/다른 위치 태그를 섞은
+스캔 목록으로 AssetAuditor.run_audit()와 apply_corrections()의 실행 시간을 측정합니다.
+실행 중인 PostgreSQL이 필요하며, 만든 자산/위치/실사 회차는 끝나면 삭제합니다.
+
+사용법:
+    python benchmarks/bench_audit.py [--rows 50000] [--docker]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asset_audit import AssetAuditor
+
+TAG_PREFIX = 'BENCH-AUDIT-'
+
+# %%는 psycopg2 매개변수 이스케이프
+LOAD = f"""
+    INSERT INTO assets (asset_type, model, status, location, reason, asset_tag, location_id)
+    SELECT 'HW', 'bench_audit', '운영', '본사 서버실', '', '{TAG_PREFIX}' || g,
+           CASE WHEN g %% 50 = 0 THEN %s ELSE %s END
+    FROM generate_series(1, %s) g
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--docker', action='store_true', help="DC_config (Docker) 설정 사용")
+    args = parser.parse_args()
+
+    if args.docker:
+        from DC_asset_manager import ITAssetManager
+        from DC_config import DB_CONFIG
+    else:
+        from PS_asset_manager import ITAssetManager
+        from PS_config import DB_CONFIG
+
+    manager = ITAssetManager()
+    auditor = AssetAuditor(manager, DB_CONFIG)
+    db = manager.db
+    audited = manager.add_location('bench_audit room')
+    elsewhere = manager.add_location('bench_audit other')
+    try:
+        # 2%는 다른 위치에 등록, 1%는 스캔에서 빠짐, 미등록 태그 0.5%
+        db.execute_query(LOAD, (elsewhere, audited, args.rows))
+        db.execute_query("ANALYZE assets")
+        tags = [f"{TAG_PREFIX}{n}" for n in range(1, args.rows + 1) if n % 100 != 1]
+        tags += [f"BENCH-UNKNOWN-{n}" for n in range(args.rows // 200)]
+
+        started = time.perf_counter()
+        run = auditor.run_audit(audited, tags, note='bench_audit')
+        audit_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        corrections = auditor.apply_corrections(run['id'], move_misplaced=True, missing_status='유휴')
+        correction_seconds = time.perf_counter() - started
+
+        print(f"tags scanned: {len(tags):,}")
+        print(f"matched {run['matched_count']:,}, missing {run['missing_count']:,}, "
+              f"unexpected {run['unexpected_count']:,}, misplaced {run['misplaced_count']:,}")
+        print(f"run_audit:          {audit_seconds:8.2f} s")
+        print(f"apply_corrections:  {correction_seconds:8.2f} s  "
+              f"(moved {corrections['moved']:,}, status changed {corrections['status_changed']:,})")
+    finally:
+        db.execute_query("DELETE FROM audit_runs WHERE location_id IN (%s, %s)", (audited, elsewhere))
+        db.execute_query(
+            "DELETE FROM asset_history WHERE asset_id IN (SELECT id FROM assets WHERE model = 'bench_audit')"
+        )
+        db.execute_query("DELETE FROM assets WHERE model = 'bench_audit'")
+        manager.delete_location(audited)
+        manager.delete_location(elsewhere)
+        manager.close()
+
+
+if __name__ == '__main__':
+    main()
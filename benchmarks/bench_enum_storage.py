@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+유형/상태/위치 저장 방식 벤치마크 (VARCHAR + CHECK 대 ENUM)
+별도 스키마(bench_enum)에 같은 합성 데이터(기본 100만 행)를 가진 두 테이블을 만들고
+테이블/인덱스 크기와 대표 조회의 실행 시간을 비교합니다. 끝나면 스키마를 삭제합니다.
+
+- varchar: 마이그레이션 0006 이전 assets와 같은 VARCHAR 컬럼과 CHECK 제약
+- enum: 마이그레이션 0006 이후와 같은 ENUM 컬럼
+두 테이블 모두 idx_assets_type/status/location/model/type_model과 같은 인덱스를 가집니다.
+
+사용법:
+    python benchmarks/bench_enum_storage.py [--rows 1000000] [--repeat 5] [--docker]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import psycopg2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA = 'bench_enum'
+
+TYPES = ['HW', 'SW', 'NW', 'STORAGE']
+STATUSES = ['입고', '대기', '운영', '유휴', '폐기']
+LOCATIONS = ['본사 서버실', '개인지급', '프로젝트장소', '기타']
+
+
+def _labels(values):
+    return ', '.join(f"'{value}'" for value in values)
+
+
+SETUP = f"""
+    DROP SCHEMA IF EXISTS {SCHEMA} CASCADE;
+    CREATE SCHEMA {SCHEMA};
+    CREATE TYPE {SCHEMA}.asset_type_enum AS ENUM ({_labels(TYPES)});
+    CREATE TYPE {SCHEMA}.asset_status_enum AS ENUM ({_labels(STATUSES)});
+    CREATE TYPE {SCHEMA}.asset_location_enum AS ENUM ({_labels(LOCATIONS)});
+
+    CREATE TABLE {SCHEMA}.assets_varchar (
+        id SERIAL PRIMARY KEY,
+        asset_type VARCHAR(10) NOT NULL CHECK (asset_type IN ({_labels(TYPES)})),
+        model VARCHAR(255) NOT NULL,
+        purchase_date DATE,
+        warranty VARCHAR(255),
+        status VARCHAR(20) NOT NULL CHECK (status IN ({_labels(STATUSES)})),
+        location VARCHAR(100) NOT NULL CHECK (location IN ({_labels(LOCATIONS)})),
+        reason TEXT
+    );
+
+    CREATE TABLE {SCHEMA}.assets_enum (
+        id SERIAL PRIMARY KEY,
+        asset_type {SCHEMA}.asset_type_enum NOT NULL,
+        model VARCHAR(255) NOT NULL,
+        purchase_date DATE,
+        warranty VARCHAR(255),
+        status {SCHEMA}.asset_status_enum NOT NULL,
+        location {SCHEMA}.asset_location_enum NOT NULL,
+        reason TEXT
+    );
+"""
+
+# generate_series 행 번호로 값을 고르므로 두 테이블의 데이터가 같음 (%%는 psycopg2 매개변수 이스케이프)
+LOAD = f"""
+    INSERT INTO {SCHEMA}.assets_varchar (asset_type, model, purchase_date, warranty, status, location, reason)
+    SELECT (ARRAY[{_labels(TYPES)}])[1 + g %% {len(TYPES)}],
+           'Model-' || (g %% 50000),
+           DATE '2018-01-01' + (g %% 2500),
+           (ARRAY['1년', '3년', '5년'])[1 + g %% 3],
+           (ARRAY[{_labels(STATUSES)}])[1 + (g * 7) %% {len(STATUSES)}],
+           (ARRAY[{_labels(LOCATIONS)}])[1 + (g * 13) %% {len(LOCATIONS)}],
+           ''
+    FROM generate_series(1, %s) g;
+
+    INSERT INTO {SCHEMA}.assets_enum (asset_type, model, purchase_date, warranty, status, location, reason)
+    SELECT asset_type::{SCHEMA}.asset_type_enum, model, purchase_date, warranty,
+           status::{SCHEMA}.asset_status_enum, location::{SCHEMA}.asset_location_enum, reason
+    FROM {SCHEMA}.assets_varchar
+    ORDER BY id;
+"""
+
+INDEXES = [
+    ('type', 'asset_type'),
+    ('status', 'status'),
+    ('location', 'location'),
+    ('model', 'model'),
+    ('type_model', 'asset_type, model'),
+]
+
+QUERIES = [
+    ('status = 운영 (count)', "SELECT count(*) FROM {table} WHERE status = '운영'"),
+    ('type+location (count)', "SELECT count(*) FROM {table} WHERE asset_type = 'HW' AND location = '본사 서버실'"),
+    ('GROUP BY location', "SELECT location, count(*) FROM {table} GROUP BY location"),
+    ('GROUP BY type, status', "SELECT asset_type, status, count(*) FROM {table} GROUP BY asset_type, status"),
+    ('full scan status <> 폐기', "SELECT count(*) FROM {table} WHERE status <> '폐기'"),
+]
+
+TABLES = ['assets_varchar', 'assets_enum']
+
+
+def _size(cursor, sql, table):
+    cursor.execute(sql, (f"{SCHEMA}.{table}",))
+    return cursor.fetchone()[0]
+
+
+def _mb(value):
+    return f"{value / 1024 / 1024:,.1f} MB"
+
+
+def _time_query(cursor, sql, repeat):
+    cursor.execute(sql)  # 캐시 데우기
+    cursor.fetchall()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cursor.execute(sql)
+        cursor.fetchall()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5, help="조회마다 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument('--keep', action='store_true', help="측정 후 bench_enum 스키마를 남김")
+    parser.add_argument('--docker', action='store_true', help="DC_config (Docker) 설정 사용")
+    args = parser.parse_args()
+
+    if args.docker:
+        from DC_config import DB_CONFIG
+    else:
+        from PS_config import DB_CONFIG
+
+    connection = psycopg2.connect(application_name='bench_enum_storage', **DB_CONFIG)
+    connection.autocommit = True
+    cursor = connection.cursor()
+    try:
+        started = time.perf_counter()
+        cursor.execute(SETUP)
+        cursor.execute(LOAD, (args.rows,))
+        for table in TABLES:
+            for name, columns in INDEXES:
+                cursor.execute(f"CREATE INDEX {table}_{name} ON {SCHEMA}.{table} ({columns})")
+            cursor.execute(f"VACUUM ANALYZE {SCHEMA}.{table}")
+        print(f"rows: {args.rows:,}  (준비 {time.perf_counter() - started:.1f}초)\n")
+
+        sizes = {}
+        for table in TABLES:
+            sizes[table] = {
+                'heap': _size(cursor, "SELECT pg_relation_size(%s::regclass)", table),
+                'indexes': _size(cursor, "SELECT pg_indexes_size(%s::regclass)", table),
+                'total': _size(cursor, "SELECT pg_total_relation_size(%s::regclass)", table),
+            }
+        print(f"{'size':<28} {'varchar':>12} {'enum':>12} {'reduction':>10}")
+        for key in ('heap', 'indexes', 'total'):
+            before, after = sizes['assets_varchar'][key], sizes['assets_enum'][key]
+            print(f"{key:<28} {_mb(before):>12} {_mb(after):>12} {1 - after / before:>10.1%}")
+        for name, _ in INDEXES:
+            before = _size(cursor, "SELECT pg_relation_size(%s::regclass)", f"assets_varchar_{name}")
+            after = _size(cursor, "SELECT pg_relation_size(%s::regclass)", f"assets_enum_{name}")
+            print(f"{'  idx ' + name:<28} {_mb(before):>12} {_mb(after):>12} {1 - after / before:>10.1%}")
+
+        print(f"\n{'query (median ms)':<28} {'varchar':>12} {'enum':>12} {'speedup':>10}")
+        for label, template in QUERIES:
+            before = _time_query(cursor, template.format(table=f"{SCHEMA}.assets_varchar"), args.repeat)
+            after = _time_query(cursor, template.format(table=f"{SCHEMA}.assets_enum"), args.repeat)
+            print(f"{label:<28} {before * 1000:>12.1f} {after * 1000:>12.1f} {before / after:>9.2f}x")
+    finally:
+        if not args.keep:
+            cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+prepared statement 벤치마크
+get_asset, update_asset 쿼리를 일반 실행(execute_query)과 서버 측 prepared statement
+(execute_prepared)로 각각 반복 실행하여 호출당 시간을 비교합니다.
+실행 중인 PostgreSQL이 필요하며, 임시 자산 1건을 만들고 끝나면 삭제합니다.
+
+사용법:
+    python benchmarks/bench_prepared.py [--iterations 2000] [--docker]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_statements import statements
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--docker', action='store_true', help="DC_database (Docker 설정) 사용")
+    args = parser.parse_args()
+
+    if args.docker:
+        from DC_database import db_manager
+    else:
+        from PS_database import db_manager
+
+    insert = statements.get('insert_asset')
+    asset_id = db_manager.execute_query(
+        insert.text, ('HW', 'benchmark asset', None, '', '대기', '기타', 'bench_prepared', None, '{}', None, None)
+    )[0]['id']
+
+    try:
+        update_params = ('HW', 'benchmark asset', None, '', '운영', '기타', 'bench_prepared', None, '{}', None, None, asset_id, None)
+        cases = [
+            ('get_asset', (asset_id,)),
+            ('update_asset', update_params),
+        ]
+        print(f"{'statement':<14} {'plain (us)':>12} {'prepared (us)':>14} {'saved':>8}")
+        for name, params in cases:
+            text = statements.get(name).text
+            db_manager.execute_prepared(name, params)  # PREPARE는 측정에서 제외
+            plain = timed(lambda: db_manager.execute_query(text, params), args.iterations)
+            prepared = timed(lambda: db_manager.execute_prepared(name, params), args.iterations)
+            print(f"{name:<14} {plain:12.1f} {prepared:14.1f} {(1 - prepared / plain) * 100:7.1f}%")
+    finally:
+        db_manager.execute_query("DELETE FROM assets WHERE id = %s", (asset_id,))
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+시작 시간 벤치마크
+콜드 스타트(새 인터프리터)부터 웹 앱의 첫 응답, GUI의 첫 화면 표시까지 걸리는 시간을 측정합니다.
+데이터베이스가 없거나 응답하지 않아도 목표 시간 안에 떠야 합니다.
+
+사용법:
+    python benchmarks/bench_startup.py [--runs 5] [--target 2.0]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 콜드 스타트에서 첫 응답까지의 목표 시간 (초)
+STARTUP_TARGET_SECONDS = 2.0
+
+WEB_SNIPPET = """
+import web_app
+client = web_app.app.test_client()
+response = client.get('/')
+assert response.status_code == 200, response.status_code
+"""
+
+GUI_SNIPPET = """
+import tkinter as tk
+import DC_Asset_Management
+root = tk.Tk()
+DC_Asset_Management.ITAssetManagerGUI(root)
+root.update()
+root.destroy()
+"""
+
+
+def measure(snippet, runs):
+    """스니펫을 새 프로세스에서 runs번 실행하여 경과 시간 목록을 반환합니다."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', snippet], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, timings, target):
+    median = statistics.median(timings)
+    status = 'OK' if median <= target else 'FAIL'
+    print(f"{name:<20} median {median:6.3f}s  max {max(timings):6.3f}s  target {target:.1f}s  [{status}]")
+    return median <= target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target', type=float, default=STARTUP_TARGET_SECONDS)
+    args = parser.parse_args()
+
+    ok = report('web first request', measure(WEB_SNIPPET, args.runs), args.target)
+    if os.environ.get('DISPLAY') or sys.platform == 'win32':
+        ok = report('gui first paint', measure(GUI_SNIPPET, args.runs), args.target) and ok
+    else:
+        print("gui first paint      skipped (no display)")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+바코드 스캔 조회 벤치마크
+자산 태그가 있는 임시 자산(기본 10만 건)을 만들고 get_asset_by_tag(단건)와
+lookup_assets(일괄, 기본 200개씩)의 호출당 지연 시간(중앙값/p99)과 분당 처리 가능한 스캔 수를 측정합니다.
+실행 중인 PostgreSQL이 필요하며, 만든 자산은 끝나면 삭제합니다.
+
+사용법:
+    python benchmarks/bench_tag_lookup.py [--rows 100000] [--iterations 2000] [--batch 200] [--docker]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TAG_PREFIX = 'BENCH-TAG-'
+
+# %%는 psycopg2 매개변수 이스케이프
+LOAD = f"""
+    INSERT INTO assets (asset_type, model, status, location, reason, asset_tag, serial_number)
+    SELECT 'HW', 'bench_tag_lookup', '운영', '본사 서버실', '',
+           '{TAG_PREFIX}' || lpad(g::text, 8, '0'), 'BENCH-SN-' || g
+    FROM generate_series(1, %s) g
+"""
+
+CLEANUP = f"DELETE FROM assets WHERE asset_tag LIKE '{TAG_PREFIX}%%'"
+
+
+def _tag(number):
+    return f"{TAG_PREFIX}{number:08d}"
+
+
+def _measure(func, iterations):
+    func()  # prepared statement 준비는 측정에서 제외
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--batch', type=int, default=200, help="lookup_assets 한 번에 보내는 태그 수")
+    parser.add_argument('--docker', action='store_true', help="DC_asset_manager (Docker 설정) 사용")
+    args = parser.parse_args()
+
+    if args.docker:
+        from DC_asset_manager import ITAssetManager
+    else:
+        from PS_asset_manager import ITAssetManager
+
+    manager = ITAssetManager()
+    db = manager.db
+    try:
+        db.execute_query(CLEANUP)
+        db.execute_query(LOAD, (args.rows,))
+        db.execute_query("ANALYZE assets")
+
+        single = _measure(
+            lambda: manager.get_asset_by_tag(_tag(random.randint(1, args.rows))), args.iterations
+        )
+        # 일부는 없는 태그로 섞어 missing 처리 비용도 포함
+        batch = _measure(
+            lambda: manager.lookup_assets(
+                [_tag(random.randint(1, args.rows + args.rows // 10)) for _ in range(args.batch)]
+            ),
+            max(args.iterations // 10, 10)
+        )
+
+        print(f"rows: {args.rows:,}\n")
+        print(f"{'call':<28} {'median (ms)':>12} {'p99 (ms)':>10} {'scans/min':>12}")
+        for label, (median, p99), scans in (
+            ('get_asset_by_tag', single, 1),
+            (f'lookup_assets x{args.batch}', batch, args.batch),
+        ):
+            print(f"{label:<28} {median * 1000:>12.2f} {p99 * 1000:>10.2f} {scans / median * 60:>12,.0f}")
+    finally:
+        db.execute_query(CLEANUP)
+        manager.close()
+
+
+if __name__ == '__main__':
+    main()
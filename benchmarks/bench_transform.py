@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+마이그레이션 변환 단계 벤치마크
+별칭, 여러 날짜 형식, 보증기간 표기, 잘못된 값이 섞인 합성 DataFrame(기본 100만 행)을 만들어
+asset_transform.transform_frame과 COPY 버퍼 생성의 초당 처리 행 수를 측정합니다.
+비교용으로 기존 방식(iterrows 안에서 행마다 변환)을 표본 행에 대해 측정합니다.
+데이터베이스는 필요하지 않습니다.
+
+사용법:
+    python benchmarks/bench_transform.py [--rows 1000000] [--legacy-sample 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asset_transform import transform_frame
+from migrate_excel_data import frame_to_copy_buffer
+
+TYPES = ['HW', 'SW', 'NW', 'STORAGE', 'hardware', '소프트웨어', ' network ', 'PRINTER']
+STATUSES = ['운영', '대기', '입고', 'in use', 'Idle', '폐기', 'retired', '???']
+LOCATIONS = ['본사 서버실', '개인지급', '프로젝트장소', '기타', 'Server Room', 'personal', '창고']
+WARRANTIES = ['3년', '1년', 3, 5.0, '36개월', '2 years', '18 months', None, '제조사 보증']
+DATES = ['2024-01-15', '2023.12.10', '2024/3/1', 45000, None, 'unknown', pd.Timestamp('2022-06-30')]
+
+
+def synthetic_frame(rows, seed=42):
+    rng = np.random.default_rng(seed)
+
+    def pick(values):
+        return pd.Series(np.array(values, dtype=object)[rng.integers(0, len(values), rows)])
+
+    return pd.DataFrame({
+        'ID': np.arange(1, rows + 1),
+        'Type': pick(TYPES),
+        'Model': pd.Series([f"  Model-{n}  " for n in rng.integers(0, 50_000, rows)], dtype=object),
+        'Purchase Date': pick(DATES),
+        'Warranty': pick(WARRANTIES),
+        'Status': pick(STATUSES),
+        'Location': pick(LOCATIONS),
+        'Reason': pick(['', None, '개발팀 업무용', '  교체 예정  ']),
+    })
+
+
+def legacy_per_row(df):
+    """기존 migrate_data의 iterrows 루프 안 변환만 재현합니다."""
+    rows = []
+    for _, row in df.iterrows():
+        rows.append((
+            row['Type'],
+            str(row['Model']),
+            row['Purchase Date'] if pd.notna(row['Purchase Date']) else None,
+            str(row['Warranty']) if pd.notna(row['Warranty']) else '',
+            row['Status'],
+            row['Location'],
+            str(row['Reason']) if pd.notna(row['Reason']) else '',
+        ))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--legacy-sample', type=int, default=50_000,
+                        help="기존 행 단위 방식을 측정할 표본 행 수 (0이면 생략)")
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+
+    start = time.perf_counter()
+    result = transform_frame(df)
+    transform_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame_to_copy_buffer(result.valid)
+    copy_seconds = time.perf_counter() - start
+
+    print(f"rows: {args.rows:,}  valid: {len(result.valid):,}  rejected: {len(result.rejects):,}")
+    print(f"{'stage':<22} {'seconds':>9} {'rows/s':>14}")
+    print(f"{'transform_frame':<22} {transform_seconds:9.2f} {args.rows / transform_seconds:14,.0f}")
+    print(f"{'COPY buffer':<22} {copy_seconds:9.2f} {len(result.valid) / max(copy_seconds, 1e-9):14,.0f}")
+
+    if args.legacy_sample:
+        sample = df.head(args.legacy_sample)
+        start = time.perf_counter()
+        legacy_per_row(sample)
+        legacy_seconds = time.perf_counter() - start
+        print(f"{'legacy iterrows':<22} {legacy_seconds:9.2f} {len(sample) / legacy_seconds:14,.0f}")
+
+    print("\nreject reasons:")
+    reasons = result.rejects['reason_code'].str.split(';').explode().value_counts()
+    for code, count in reasons.items():
+        print(f"  {code:<20} {count:>10,}")
+
+
+if __name__ == '__main__':
+    main()
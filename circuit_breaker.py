@@ -0,0 +1,88 @@
+"""
+데이터베이스 서킷 브레이커
+연속된 연결 오류가 임계값을 넘으면 회로를 열어 이후 요청을 즉시 거절하고,
+백그라운드 스레드가 주기적으로 데이터베이스를 확인하여 회복되면 회로를 닫습니다.
+요청 스레드가 죽은 데이터베이스를 기다리며 쌓이지 않도록 하는 것이 목적입니다.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """데이터베이스가 비정상으로 판단되어 요청을 즉시 거절할 때 발생합니다."""
+
+    def __init__(self, retry_after):
+        super().__init__("데이터베이스를 일시적으로 사용할 수 없습니다. 잠시 후 다시 시도하세요.")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    CLOSED = 'closed'
+    OPEN = 'open'
+
+    def __init__(self, probe, failure_threshold=3, probe_interval=5.0, name='database'):
+        """probe: 인자 없이 호출되어 정상이면 반환하고 비정상이면 예외를 발생시키는 함수"""
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.name = name
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._probe_thread = None
+
+    def allow(self):
+        """회로가 열려 있으면 CircuitOpenError를 발생시킵니다."""
+        if self.state == self.OPEN:
+            self.rejected += 1
+            raise CircuitOpenError(retry_after=max(1, int(self.probe_interval)))
+
+    def record_success(self):
+        if self.consecutive_failures:
+            with self._lock:
+                self.consecutive_failures = 0
+
+    def record_failure(self, error):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = error
+            if self.state == self.OPEN or self.consecutive_failures < self.failure_threshold:
+                return
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            logger.warning(f"[{self.name}] 서킷 브레이커 열림 (연속 실패 {self.consecutive_failures}회): {error}")
+            self._probe_thread = threading.Thread(
+                target=self._probe_loop, name=f'{self.name}-breaker-probe', daemon=True
+            )
+            self._probe_thread.start()
+
+    def _probe_loop(self):
+        while self.state == self.OPEN:
+            time.sleep(self.probe_interval)
+            try:
+                self.probe()
+            except Exception as e:
+                self.last_error = e
+                logger.info(f"[{self.name}] 상태 확인 실패, 회로 유지: {e}")
+                continue
+            with self._lock:
+                self.state = self.CLOSED
+                self.consecutive_failures = 0
+                self.opened_at = None
+            logger.info(f"[{self.name}] 상태 확인 성공, 서킷 브레이커 닫힘")
+
+    def status(self):
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'open_seconds': time.monotonic() - self.opened_at if self.opened_at else 0.0,
+            'rejected': self.rejected,
+            'last_error': str(self.last_error) if self.last_error else None,
+        }
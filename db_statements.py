@@ -0,0 +1,159 @@
+"""
+자주 실행되는 쿼리의 prepared statement 레지스트리
+ITAssetManager의 핫 쿼리에 이름을 붙여 등록해 두면, 데이터베이스 매니저가 연결마다 한 번
+서버 측 PREPARE를 실행하고 이후에는 EXECUTE만 보내 파싱/계획 비용을 줄입니다.
+읽기/쓰기 분류와 결과 행 반환 여부는 등록 시점에 한 번만 결정합니다.
+"""
+
+import re
+from collections import namedtuple
+
+READ = 'read'
+WRITE = 'write'
+
+_NAME_PATTERN = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+Statement = namedtuple('Statement', ['name', 'text', 'sql', 'param_count', 'kind', 'returns_rows'])
+
+
+class StatementRegistry:
+    def __init__(self):
+        self._statements = {}
+
+    def register(self, name, text, kind=None):
+        """psycopg2 형식(%s) 쿼리를 등록합니다. kind를 생략하면 첫 키워드로 분류합니다."""
+        if not _NAME_PATTERN.match(name):
+            raise ValueError(f"잘못된 statement 이름: {name}")
+        if name in self._statements:
+            raise ValueError(f"이미 등록된 statement: {name}")
+
+        text = text.strip()
+        count = 0
+
+        def placeholder(match):
+            nonlocal count
+            count += 1
+            return f'${count}'
+
+        sql = re.sub(r'%s', placeholder, text)
+        verb = sql.split(None, 1)[0].upper()
+        if kind is None:
+            kind = READ if verb == 'SELECT' else WRITE
+        returns_rows = verb == 'SELECT' or re.search(r'\bRETURNING\b', sql, re.IGNORECASE) is not None
+
+        statement = Statement(name, text, sql, count, kind, returns_rows)
+        self._statements[name] = statement
+        return statement
+
+    def get(self, name):
+        return self._statements[name]
+
+    def __iter__(self):
+        return iter(self._statements.values())
+
+    @staticmethod
+    def prepare_sql(statement):
+        return f"PREPARE {statement.name} AS {statement.sql}"
+
+    @staticmethod
+    def execute_sql(statement):
+        if not statement.param_count:
+            return f"EXECUTE {statement.name}"
+        return f"EXECUTE {statement.name} ({', '.join(['%s'] * statement.param_count)})"
+
+
+statements = StatementRegistry()
+
+statements.register('get_asset', "SELECT * FROM assets WHERE id = %s")
+
+# location_id가 NULL이면 resolve_assets_location 트리거가 레거시 location으로 위치 노드를 정함
+statements.register('insert_asset', """
+    INSERT INTO assets (asset_type, model, purchase_date, warranty, status, location, reason, location_id, attributes,
+                        asset_tag, serial_number)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    RETURNING id
+""")
+
+# location_id를 보내지 않는 기존 클라이언트의 수정은 현재 위치 노드를 유지
+# 마지막 매개변수(기대한 버전)가 NULL이면 버전을 확인하지 않음
+statements.register('update_asset', """
+    UPDATE assets
+    SET asset_type = %s, model = %s, purchase_date = %s, warranty = %s,
+        status = %s, location = %s, reason = %s, location_id = COALESCE(%s, location_id),
+        attributes = %s, asset_tag = %s, serial_number = %s
+    WHERE id = %s AND version = COALESCE(%s, version)
+""")
+
+# 스캔한 라벨은 자산 태그나 시리얼 번호 중 하나이므로 두 유일 인덱스를 BitmapOr로 함께 조회
+statements.register('asset_by_tag', "SELECT * FROM assets WHERE asset_tag = %s OR serial_number = %s")
+
+statements.register('lookup_asset_tags', """
+    SELECT * FROM assets
+    WHERE asset_tag = ANY(%s::varchar[]) OR serial_number = ANY(%s::varchar[])
+""")
+
+statements.register('delete_asset', "DELETE FROM assets WHERE id = %s")
+
+statements.register('insert_history', """
+    INSERT INTO asset_history (asset_id, action, old_values, new_values)
+    VALUES (%s, %s, %s, %s)
+""")
+
+# 통계 카드 항목 (ITAssetManager.get_dashboard()도 같은 항목을 계산)
+STATISTICS_COLUMNS = """
+        COUNT(*) as total_assets,
+        COUNT(CASE WHEN status = '입고' THEN 1 END) as in_stock,
+        COUNT(CASE WHEN status = '대기' THEN 1 END) as waiting,
+        COUNT(CASE WHEN status = '운영' THEN 1 END) as operating,
+        COUNT(CASE WHEN status = '유휴' THEN 1 END) as idle,
+        COUNT(CASE WHEN status = '폐기' THEN 1 END) as disposed,
+        COUNT(CASE WHEN asset_type = 'HW' THEN 1 END) as hardware,
+        COUNT(CASE WHEN asset_type = 'SW' THEN 1 END) as software,
+        COUNT(CASE WHEN asset_type = 'NW' THEN 1 END) as network,
+        COUNT(CASE WHEN asset_type = 'STORAGE' THEN 1 END) as storage
+"""
+
+statements.register('asset_statistics', f"""
+    SELECT {STATISTICS_COLUMNS}
+    FROM assets
+""")
+
+# 하위 트리 통계: closure에서 자손 위치를 찾고 idx_assets_location_id(location_id, status, asset_type)만 읽음
+statements.register('subtree_statistics', f"""
+    SELECT {STATISTICS_COLUMNS}
+    FROM location_closure c
+    JOIN assets a ON a.location_id = c.descendant_id
+    WHERE c.ancestor_id = %s
+""")
+
+# 보관된 폐기 자산 통계 (include_archived로 요청할 때만 실행)
+statements.register('archive_statistics', f"""
+    SELECT {STATISTICS_COLUMNS}
+    FROM assets_archive
+""")
+
+statements.register('archive_subtree_statistics', f"""
+    SELECT {STATISTICS_COLUMNS}
+    FROM location_closure c
+    JOIN assets_archive a ON a.location_id = c.descendant_id
+    WHERE c.ancestor_id = %s
+""")
+
+statements.register('child_location_statistics', """
+    SELECT l.id, l.name, l.kind, COUNT(a.id) AS total_assets,
+           COUNT(CASE WHEN a.status = '운영' THEN 1 END) AS operating
+    FROM locations l
+    JOIN location_closure c ON c.ancestor_id = l.id
+    LEFT JOIN assets a ON a.location_id = c.descendant_id
+    WHERE l.parent_id = %s
+    GROUP BY l.id, l.name, l.kind
+    ORDER BY l.name
+""")
+
+statements.register('enum_labels', """
+    SELECT t.typname AS enum_type, e.enumlabel AS label
+    FROM pg_enum e
+    JOIN pg_type t ON t.oid = e.enumtypid
+    WHERE t.typname IN ('asset_type_enum', 'asset_status_enum', 'asset_location_enum')
+    ORDER BY t.typname, e.enumsortorder
+""")
@@ -0,0 +1,26 @@
+#!/bin/bash
+# IT 자산 관리 시스템 초기화 스크립트
+# migrations/*.sql을 번호 순서대로 적용하고 schema_version에 기록합니다.
+# schema_migrations.py와 같은 파일, 같은 기록 형식(버전, 이름, sha256)을 사용하므로
+# 이후 웹 앱은 버전 확인만 하고 바로 시작합니다.
+set -euo pipefail
+
+PSQL=(psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB")
+
+"${PSQL[@]}" -c "
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"
+
+for file in /migrations/[0-9]*_*.sql; do
+    base=$(basename "$file" .sql)
+    version=$((10#${base%%_*}))
+    name=${base#*_}
+    checksum=$(sha256sum "$file" | cut -d' ' -f1)
+    echo "마이그레이션 적용 중: $base"
+    "${PSQL[@]}" --single-transaction -f "$file" \
+        -c "INSERT INTO schema_version (version, name, checksum) VALUES ($version, '$name', '$checksum')"
+done
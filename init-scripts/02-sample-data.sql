@@ -0,0 +1,8 @@
+-- 샘플 데이터 삽입 (스키마는 01-migrate.sh가 migrations/에서 생성)
+INSERT INTO assets (asset_type, model, purchase_date, warranty, status, location, reason) VALUES
+('HW', 'Dell OptiPlex 7090', '2024-01-15', '3년', '운영', '본사 서버실', '개발팀 업무용'),
+('SW', 'Visual Studio Code', '2024-02-01', '1년', '운영', '개인지급', '개발자 코딩 도구'),
+('NW', 'Cisco Catalyst 2960', '2023-12-10', '5년', '운영', '본사 서버실', '네트워크 스위치'),
+('STORAGE', 'Seagate IronWolf 4TB', '2024-01-20', '3년', '입고', '본사 서버실', '백업 저장소'),
+('HW', 'HP EliteBook 840', '2024-03-01', '3년', '대기', '개인지급', '신입사원 지급 예정')
+ON CONFLICT DO NOTHING;
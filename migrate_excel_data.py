@@ -4,23 +4,298 @@
 기존 Asset Management.xlsx 파일의 데이터를 PostgreSQL 데이터베이스로 이전합니다.
 """
 
+import openpyxl
 import pandas as pd
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import sys
 import os
 from datetime import datetime
+import hashlib
+import io
 import logging
+import multiprocessing
+import queue as queue_module
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_transform import RejectsWriter, transform_frame
+from schema_migrations import SchemaMigrator
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+EXPECTED_COLUMNS = ["ID", "Type", "Model", "Purchase Date", "Warranty", "Status", "Location", "Reason"]
+
+# 읽어 들인 배치: 변환을 통과한 행(frame)과 사유 코드가 붙은 거부 행(rejects)
+# 두 DataFrame의 인덱스는 엑셀 행 번호입니다.
+Batch = namedtuple('Batch', ['sheet', 'number', 'frame', 'rows_read', 'rejects'])
+
+# 스트리밍 모드의 기본 배치 크기 (행)
+DEFAULT_BATCH_SIZE = 5000
+
+# 병렬 파싱 시 로더가 처리하지 못한 청크를 작업자당 최대 몇 개까지 쌓아 둘지
+QUEUE_CHUNKS_PER_WORKER = 2
+
+# 재개 위치는 커밋된 청크들이 읽은 행 수(rows_read, 빈 행 제외)입니다. 청크 번호가 아닌 행 수로 재개하므로
+# 중단된 실행과 다른 배치 크기로 다시 실행해도 행을 건너뛰거나 두 번 읽지 않습니다.
+# last_chunk는 커밋된 청크 수입니다.
+SELECT_CHECKPOINTS = """
+    SELECT sheet_name, rows_read, completed
+    FROM migration_checkpoints
+    WHERE file_hash = %s
+"""
+
+UPSERT_CHECKPOINT = """
+    INSERT INTO migration_checkpoints
+        (file_hash, sheet_name, file_path, last_chunk, rows_read, rows_loaded, rows_skipped, completed)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON CONFLICT (file_hash, sheet_name) DO UPDATE SET
+        file_path = EXCLUDED.file_path,
+        last_chunk = migration_checkpoints.last_chunk + EXCLUDED.last_chunk,
+        rows_read = migration_checkpoints.rows_read + EXCLUDED.rows_read,
+        rows_loaded = migration_checkpoints.rows_loaded + EXCLUDED.rows_loaded,
+        rows_skipped = migration_checkpoints.rows_skipped + EXCLUDED.rows_skipped,
+        completed = migration_checkpoints.completed OR EXCLUDED.completed,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# 체크포인트를 무시하고 처음부터 다시 적재할 때 이전 실행의 재개 위치와 완료 표시를 지움
+DELETE_CHECKPOINTS = "DELETE FROM migration_checkpoints WHERE file_hash = %s"
+
+
+# 증분 동기화: 원본 행을 COPY할 임시 테이블과 원본/DB 비교 쿼리
+COPY_COLUMNS = ['asset_type', 'model', 'purchase_date', 'warranty', 'status', 'location', 'reason']
+
+# 유형/상태/위치는 assets와 같은 ENUM 타입이므로 assets와의 비교와 INSERT ... SELECT에 변환이 필요 없음
+_SOURCE_COLUMNS = """
+        seq BIGSERIAL,
+        asset_type asset_type_enum,
+        model VARCHAR(255),
+        purchase_date DATE,
+        warranty VARCHAR(255),
+        status asset_status_enum,
+        location asset_location_enum,
+        reason TEXT
+"""
+
+CREATE_SYNC_SOURCE = f"CREATE TEMP TABLE sync_source ({_SOURCE_COLUMNS}) ON COMMIT DROP"
+
+# 일반/스트리밍 적재: 배치를 COPY한 뒤 (유형, 모델)이 이미 있는 행과 배치 안의 중복을 제외하고 한 번에 삽입
+# (보관 테이블로 옮긴 폐기 자산도 이미 있는 행으로 취급)
+CREATE_LOAD_BATCH = f"CREATE TEMP TABLE IF NOT EXISTS load_batch ({_SOURCE_COLUMNS}) ON COMMIT DELETE ROWS"
+
+INSERT_LOAD_BATCH = """
+    INSERT INTO assets (asset_type, model, purchase_date, warranty, status, location, reason)
+    SELECT asset_type, model, purchase_date, COALESCE(warranty, ''), status, location, COALESCE(reason, '')
+    FROM (
+        SELECT l.*, row_number() OVER (PARTITION BY l.asset_type, l.model ORDER BY l.seq) AS occurrence
+        FROM load_batch l
+    ) batch
+    WHERE occurrence = 1
+      AND NOT EXISTS (
+          SELECT 1 FROM assets a WHERE a.asset_type = batch.asset_type AND a.model = batch.model
+      )
+      AND NOT EXISTS (
+          SELECT 1 FROM assets_archive a WHERE a.asset_type = batch.asset_type AND a.model = batch.model
+      )
+    ORDER BY seq
+"""
+
+# (asset_type, model, 같은 키 안에서의 순번)으로 원본과 DB 행을 짝지은 뒤 지문을 비교합니다.
+# 변경 없는 행은 저장하지 않습니다. 보관된 폐기 자산도 짝짓기에 포함하여 원본에 남아 있는 폐기 행이
+# 다시 삽입되지 않게 합니다. 보관된 행은 반영 쿼리가 건드리지 않으므로 수정/삭제로 분류하지 않고,
+# 원본에 남아 있으면 'archived'로 따로 세며 원본에 없으면 제외합니다.
+CREATE_SYNC_DIFF = """
+    CREATE TEMP TABLE sync_diff ON COMMIT DROP AS
+    WITH src AS (
+        SELECT s.*,
+               asset_row_fingerprint(s.asset_type::text, s.model, s.purchase_date, s.warranty,
+                                     s.status::text, s.location::text, s.reason) AS row_fingerprint,
+               row_number() OVER (PARTITION BY s.asset_type, s.model ORDER BY s.seq) AS occurrence
+        FROM sync_source s
+    ), dst AS (
+        SELECT a.id, a.asset_type, a.model, a.row_fingerprint, a.archived,
+               row_number() OVER (PARTITION BY a.asset_type, a.model ORDER BY a.id) AS occurrence
+        FROM (
+            SELECT id, asset_type, model, row_fingerprint, false AS archived FROM assets
+            UNION ALL
+            SELECT id, asset_type, model, row_fingerprint, true FROM assets_archive
+        ) a
+    )
+    SELECT change, asset_id, asset_type, model, purchase_date, warranty, status, location, reason
+    FROM (
+        SELECT CASE
+                   WHEN dst.id IS NULL THEN 'insert'
+                   WHEN dst.archived THEN CASE WHEN src.seq IS NOT NULL THEN 'archived' END
+                   WHEN src.seq IS NULL THEN 'delete'
+                   WHEN src.row_fingerprint IS DISTINCT FROM dst.row_fingerprint THEN 'update'
+               END AS change,
+               dst.id AS asset_id,
+               COALESCE(src.asset_type, dst.asset_type) AS asset_type,
+               COALESCE(src.model, dst.model) AS model,
+               src.purchase_date, src.warranty, src.status, src.location, src.reason
+        FROM src
+        FULL OUTER JOIN dst
+          ON src.asset_type = dst.asset_type
+         AND src.model = dst.model
+         AND src.occurrence = dst.occurrence
+    ) diff
+    WHERE change IS NOT NULL
+"""
+
+# asset_history에는 애플리케이션과 같은 형태("Type", "Model", ...)로 기록합니다
+_HISTORY_JSON = """jsonb_build_object(
+        'Type', {0}.asset_type, 'Model', {0}.model, 'Purchase Date', {0}.purchase_date,
+        'Warranty', {0}.warranty, 'Status', {0}.status, 'Location', {0}.location, 'Reason', {0}.reason)"""
+
+APPLY_SYNC_INSERTS = f"""
+    WITH inserted AS (
+        INSERT INTO assets (asset_type, model, purchase_date, warranty, status, location, reason)
+        SELECT asset_type, model, purchase_date, COALESCE(warranty, ''), status, location, COALESCE(reason, '')
+        FROM sync_diff
+        WHERE change = 'insert'
+        RETURNING *
+    )
+    INSERT INTO asset_history (asset_id, action, old_values, new_values)
+    SELECT id, 'SYNC_INSERT', NULL, {_HISTORY_JSON.format('inserted')}
+    FROM inserted
+"""
+
+APPLY_SYNC_UPDATES = f"""
+    WITH previous AS (
+        SELECT a.*
+        FROM assets a
+        JOIN sync_diff d ON d.asset_id = a.id AND d.change = 'update'
+    ), updated AS (
+        UPDATE assets a
+        SET asset_type = d.asset_type, model = d.model, purchase_date = d.purchase_date,
+            warranty = COALESCE(d.warranty, ''), status = d.status, location = d.location,
+            reason = COALESCE(d.reason, '')
+        FROM sync_diff d
+        WHERE d.asset_id = a.id AND d.change = 'update'
+        RETURNING a.*
+    )
+    INSERT INTO asset_history (asset_id, action, old_values, new_values)
+    SELECT updated.id, 'SYNC_UPDATE', {_HISTORY_JSON.format('previous')}, {_HISTORY_JSON.format('updated')}
+    FROM updated
+    JOIN previous ON previous.id = updated.id
+"""
+
+APPLY_SYNC_DELETES = f"""
+    WITH deleted AS (
+        DELETE FROM assets a
+        USING sync_diff d
+        WHERE d.asset_id = a.id AND d.change = 'delete'
+        RETURNING a.*
+    )
+    INSERT INTO asset_history (asset_id, action, old_values, new_values)
+    SELECT id, 'SYNC_DELETE', {_HISTORY_JSON.format('deleted')}, NULL
+    FROM deleted
+"""
+
+
+def sync_report(counts, source_rows, rejected_rows, delete_missing, dry_run):
+    """sync_diff의 change별 건수로 동기화 보고서를 만듭니다.
+    
+    insert/update/delete는 반영 쿼리가 실제로 바꾸는 건수와 같습니다. 보관된 자산과 짝지어진 원본 행(archived)은
+    반영 대상이 아니므로 변경 건수에 넣지 않습니다.
+    """
+    report = {
+        'source_rows': source_rows,
+        'rejected_rows': rejected_rows,
+        'insert': counts.get('insert', 0),
+        'update': counts.get('update', 0),
+        'delete': counts.get('delete', 0) if delete_missing else 0,
+        'missing_in_source': counts.get('delete', 0),
+        'archived': counts.get('archived', 0),
+        'dry_run': dry_run,
+        'samples': {},
+    }
+    report['unchanged'] = source_rows - report['insert'] - report['update'] - report['archived']
+    return report
+
+
+def copy_sql(table):
+    return f"COPY {table} ({', '.join(COPY_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+
+
+def frame_to_copy_buffer(df):
+    """정리된 DataFrame을 COPY ... FROM STDIN (FORMAT csv)용 버퍼로 변환합니다. 빈 값은 NULL입니다."""
+    out = pd.DataFrame({
+        'asset_type': df['Type'],
+        'model': df['Model'].astype(str),
+        'purchase_date': pd.to_datetime(df['Purchase Date'], errors='coerce').dt.strftime('%Y-%m-%d'),
+        'warranty': df['Warranty'],
+        'status': df['Status'],
+        'location': df['Location'],
+        'reason': df['Reason'],
+    })
+    buffer = io.StringIO()
+    out.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def load_frame(cursor, df):
+    """변환된 DataFrame을 COPY로 올린 뒤 (유형, 모델) 중복을 제외하고 한 번에 삽입합니다.
+    
+    (삽입 수, 건너뛴 수)를 반환하며, 커밋은 호출자가 합니다.
+    """
+    if len(df) == 0:
+        return 0, 0
+    cursor.execute(CREATE_LOAD_BATCH)
+    cursor.execute("TRUNCATE load_batch")
+    cursor.copy_expert(copy_sql('load_batch'), frame_to_copy_buffer(df))
+    cursor.execute(INSERT_LOAD_BATCH)
+    return cursor.rowcount, len(df) - cursor.rowcount
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    """체크포인트 키로 쓰는 파일 내용의 sha256을 반환합니다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _put_until_stopped(queue, item, stop):
+    """큐에 자리가 날 때까지 기다리되, 로더가 중단되면 False를 반환합니다."""
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.5)
+            return True
+        except queue_module.Full:
+            continue
+    return False
+
+
+def _parse_sheet(file_path, file_hash, sheet_name, batch_size, skip_rows, queue, stop):
+    """작업자 프로세스: 시트 하나를 읽어 변환·검증된 배치를 큐에 넣습니다.
+    
+    마지막에 배치가 None인 종료 표시를 넣으며, 실패하면 오류 메시지를 함께 넣습니다.
+    """
+    try:
+        parser = ExcelToPostgreSQLMigrator(file_path, None)
+        for batch in parser.iter_excel_batches(batch_size, sheets=[sheet_name], skip={sheet_name: skip_rows}):
+            if not _put_until_stopped(queue, (file_hash, sheet_name, batch, None), stop):
+                return
+    except Exception as e:
+        _put_until_stopped(queue, (file_hash, sheet_name, None, str(e)), stop)
+    else:
+        _put_until_stopped(queue, (file_hash, sheet_name, None, None), stop)
+
 class ExcelToPostgreSQLMigrator:
-    def __init__(self, excel_file_path, db_config):
+    def __init__(self, excel_file_path, db_config, rejects_path=None):
         self.excel_file_path = excel_file_path
         self.db_config = db_config
         self.connection = None
+        # 변환 단계에서 거부된 행은 버리지 않고 이 CSV에 사유 코드와 함께 기록
+        self.rejects_path = rejects_path or os.path.splitext(excel_file_path)[0] + '_rejects.csv'
+        self.rejects = RejectsWriter(self.rejects_path)
     
     def connect_database(self):
         """PostgreSQL 데이터베이스에 연결합니다."""
@@ -43,95 +318,140 @@ class ExcelToPostgreSQLMigrator:
             df = pd.read_excel(self.excel_file_path)
             logger.info(f"엑셀 파일에서 {len(df)}개의 행을 읽었습니다.")
             
-            # 컬럼명 확인 및 매핑
-            expected_columns = ["ID", "Type", "Model", "Purchase Date", "Warranty", "Status", "Location", "Reason"]
-            
-            if not all(col in df.columns for col in expected_columns):
-                logger.warning("일부 예상 컬럼이 없습니다. 사용 가능한 컬럼:")
-                logger.warning(f"사용 가능한 컬럼: {list(df.columns)}")
-                
-                # 컬럼명이 다른 경우 매핑 시도
-                column_mapping = {}
-                for expected_col in expected_columns:
-                    # 대소문자 구분 없이 매핑
-                    for actual_col in df.columns:
-                        if expected_col.lower() == actual_col.lower():
-                            column_mapping[expected_col] = actual_col
-                            break
-                
-                if len(column_mapping) >= 6:  # 최소 6개 컬럼은 필요
-                    logger.info("컬럼 매핑을 시도합니다.")
-                    df = df.rename(columns=column_mapping)
-                else:
-                    logger.error("충분한 컬럼을 매핑할 수 없습니다.")
-                    return None
-            
-            # 데이터 정리
-            df = df.dropna(subset=['Type', 'Model', 'Status', 'Location'])  # 필수 필드가 비어있는 행 제거
-            
-            # ID 컬럼이 숫자가 아닌 경우 처리
-            if 'ID' in df.columns:
-                try:
-                    df['ID'] = pd.to_numeric(df['ID'], errors='coerce')
-                    df = df.dropna(subset=['ID'])
-                except:
-                    logger.warning("ID 컬럼을 숫자로 변환할 수 없습니다. 새 ID를 생성합니다.")
-                    df = df.drop('ID', axis=1)
-            
-            # 날짜 컬럼 처리
-            if 'Purchase Date' in df.columns:
-                df['Purchase Date'] = pd.to_datetime(df['Purchase Date'], errors='coerce')
+            column_mapping = self.map_columns(list(df.columns))
+            if column_mapping is None:
+                return None
+            df = df.rename(columns=column_mapping)
+            if not self.validate_data(df):
+                return None
             
-            logger.info(f"정리 후 {len(df)}개의 유효한 행이 남았습니다.")
-            return df
+            # 인덱스를 엑셀 행 번호로 맞춤 (1행은 헤더)
+            df.index = df.index + 2
+            df = df.dropna(how='all')
+            result = self.transform(df)
+            self.rejects.write(result.rejects, self.excel_file_path)
+            logger.info(f"변환 후 {len(result.valid)}개의 유효한 행이 남았습니다.")
+            return result.valid
             
         except Exception as e:
             logger.error(f"엑셀 파일 읽기 실패: {e}")
             return None
     
-    def validate_data(self, df):
-        """데이터 유효성을 검증합니다."""
+    def map_columns(self, columns):
+        """실제 컬럼명을 예상 컬럼명으로 바꾸는 매핑을 반환합니다. 매핑할 수 없으면 None입니다."""
+        if all(col in columns for col in EXPECTED_COLUMNS):
+            return {}
+        
+        logger.warning("일부 예상 컬럼이 없습니다. 사용 가능한 컬럼:")
+        logger.warning(f"사용 가능한 컬럼: {list(columns)}")
+        
+        # 컬럼명이 다른 경우 매핑 시도
+        column_mapping = {}
+        for expected_col in EXPECTED_COLUMNS:
+            # 대소문자 구분 없이 매핑
+            for actual_col in columns:
+                if expected_col.lower() == str(actual_col).strip().lower():
+                    column_mapping[actual_col] = expected_col
+                    break
+        
+        if len(column_mapping) >= 6:  # 최소 6개 컬럼은 필요
+            logger.info("컬럼 매핑을 시도합니다.")
+            return column_mapping
+        
+        logger.error("충분한 컬럼을 매핑할 수 없습니다.")
+        return None
+    
+    def transform(self, df, sheet_name=''):
+        """변환/검증 단계를 적용합니다. 거부 행은 사유별 건수를 로그로 남깁니다."""
+        result = transform_frame(df)
+        if len(result.rejects):
+            reasons = result.rejects['reason_code'].str.split(';').explode().value_counts()
+            summary = ', '.join(f"{code} {count}" for code, count in reasons.items())
+            logger.warning(f"[{sheet_name or os.path.basename(self.excel_file_path)}] "
+                           f"{len(result.rejects)}개 행 거부 ({summary})")
+        return result
+    
+    def iter_excel_batches(self, batch_size=DEFAULT_BATCH_SIZE, sheets=None, skip=None):
+        """openpyxl read_only 모드로 모든 시트를 순회하며 정리·검증된 배치를 생성합니다.
+        
+        워크북 전체를 메모리에 올리지 않고 행 단위로 읽으므로 파일 크기와 관계없이
+        메모리 사용량은 batch_size에 비례합니다. Batch를 생성하며, skip은 {시트명: 건너뛸 행 수}로
+        앞에서부터 그만큼의 데이터 행(빈 행 제외, 체크포인트의 rows_read와 같은 기준)을 변환·검증하지 않고 건너뜁니다.
+        """
+        skip = skip or {}
+        workbook = openpyxl.load_workbook(self.excel_file_path, read_only=True, data_only=True)
+        started = time.monotonic()
+        total_rows = 0
         try:
-            # 필수 컬럼 확인
-            required_columns = ["Type", "Model", "Status", "Location"]
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                logger.error(f"필수 컬럼이 누락되었습니다: {missing_columns}")
-                return False
-            
-            # 데이터 타입 검증
-            valid_types = ['HW', 'SW', 'NW', 'STORAGE']
-            valid_statuses = ['입고', '대기', '운영', '유휴', '폐기']
-            valid_locations = ['본사 서버실', '개인지급', '프로젝트장소', '기타']
-            
-            # Type 검증
-            invalid_types = df[~df['Type'].isin(valid_types)]['Type'].unique()
-            if len(invalid_types) > 0:
-                logger.warning(f"유효하지 않은 Type 값이 있습니다: {invalid_types}")
-                # 유효하지 않은 값은 '기타'로 변경
-                df.loc[~df['Type'].isin(valid_types), 'Type'] = 'HW'
-            
-            # Status 검증
-            invalid_statuses = df[~df['Status'].isin(valid_statuses)]['Status'].unique()
-            if len(invalid_statuses) > 0:
-                logger.warning(f"유효하지 않은 Status 값이 있습니다: {invalid_statuses}")
-                # 유효하지 않은 값은 '대기'로 변경
-                df.loc[~df['Status'].isin(valid_statuses), 'Status'] = '대기'
-            
-            # Location 검증
-            invalid_locations = df[~df['Location'].isin(valid_locations)]['Location'].unique()
-            if len(invalid_locations) > 0:
-                logger.warning(f"유효하지 않은 Location 값이 있습니다: {invalid_locations}")
-                # 유효하지 않은 값은 '기타'로 변경
-                df.loc[~df['Location'].isin(valid_locations), 'Location'] = '기타'
-            
-            logger.info("데이터 검증이 완료되었습니다.")
-            return True
-            
-        except Exception as e:
-            logger.error(f"데이터 검증 실패: {e}")
+            for sheet_name in sheets or workbook.sheetnames:
+                rows = workbook[sheet_name].iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    logger.info(f"[{sheet_name}] 빈 시트를 건너뜁니다.")
+                    continue
+                
+                columns = [str(col).strip() if col is not None else f"Unnamed: {i}" for i, col in enumerate(header)]
+                column_mapping = self.map_columns(columns)
+                if column_mapping is None:
+                    logger.error(f"[{sheet_name}] 컬럼을 매핑할 수 없어 시트를 건너뜁니다.")
+                    continue
+                columns = [column_mapping.get(col, col) for col in columns]
+                if not self.validate_data(pd.DataFrame(columns=columns)):
+                    logger.error(f"[{sheet_name}] 필수 컬럼이 없어 시트를 건너뜁니다.")
+                    continue
+                
+                batch_no = 0
+                skip_rows = skip.get(sheet_name, 0)
+                if skip_rows:
+                    logger.info(f"[{sheet_name}] 체크포인트: 앞의 {skip_rows}행을 건너뜁니다.")
+                buffer = []
+                row_numbers = []
+                for row_number, row in enumerate(rows, start=2):
+                    if row is None or all(value is None for value in row):
+                        continue
+                    if skip_rows:
+                        skip_rows -= 1
+                        continue
+                    # 셀 수가 헤더보다 적은 행은 빈 값으로 채움
+                    buffer.append(tuple(row[:len(columns)]) + (None,) * (len(columns) - len(row)))
+                    row_numbers.append(row_number)
+                    if len(buffer) < batch_size:
+                        continue
+                    batch_no += 1
+                    total_rows += len(buffer)
+                    yield self._prepare_batch(sheet_name, batch_no, buffer, row_numbers, columns)
+                    self._log_rate(sheet_name, total_rows, started)
+                    buffer = []
+                    row_numbers = []
+                
+                if buffer:
+                    batch_no += 1
+                    total_rows += len(buffer)
+                    yield self._prepare_batch(sheet_name, batch_no, buffer, row_numbers, columns)
+                    self._log_rate(sheet_name, total_rows, started)
+        finally:
+            workbook.close()
+    
+    def _prepare_batch(self, sheet_name, batch_no, rows, row_numbers, columns):
+        """읽은 행 묶음을 DataFrame으로 만들어 변환하고 검증합니다."""
+        df = pd.DataFrame.from_records(rows, columns=columns, index=row_numbers)
+        result = self.transform(df, sheet_name)
+        return Batch(sheet_name, batch_no, result.valid, len(rows), result.rejects)
+    
+    @staticmethod
+    def _log_rate(sheet_name, total_rows, started):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        logger.info(f"[{sheet_name}] 누적 {total_rows}행 읽음 ({total_rows / elapsed:,.0f}행/초)")
+    
+    def validate_data(self, df):
+        """필수 컬럼이 있는지 검증합니다. 행 단위 검증은 transform()이 담당합니다."""
+        required_columns = ["Type", "Model", "Status", "Location"]
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        
+        if missing_columns:
+            logger.error(f"필수 컬럼이 누락되었습니다: {missing_columns}")
             return False
+        return True
     
     def migrate_data(self, df):
         """데이터를 PostgreSQL로 마이그레이션합니다."""
@@ -144,58 +464,7 @@ class ExcelToPostgreSQLMigrator:
             logger.info(f"기존 데이터 수: {existing_count}")
             
             # 마이그레이션 시작
-            migrated_count = 0
-            skipped_count = 0
-            
-            for index, row in df.iterrows():
-                try:
-                    # 데이터 준비
-                    asset_data = {
-                        'asset_type': row['Type'],
-                        'model': str(row['Model']),
-                        'purchase_date': row['Purchase Date'] if pd.notna(row['Purchase Date']) else None,
-                        'warranty': str(row['Warranty']) if pd.notna(row['Warranty']) else '',
-                        'status': row['Status'],
-                        'location': row['Location'],
-                        'reason': str(row['Reason']) if pd.notna(row['Reason']) else ''
-                    }
-                    
-                    # 중복 체크 (Model과 Type으로)
-                    cursor.execute(
-                        "SELECT id FROM assets WHERE model = %s AND asset_type = %s",
-                        (asset_data['model'], asset_data['asset_type'])
-                    )
-                    
-                    if cursor.fetchone():
-                        logger.debug(f"중복 데이터 건너뛰기: {asset_data['model']} ({asset_data['asset_type']})")
-                        skipped_count += 1
-                        continue
-                    
-                    # 데이터 삽입
-                    insert_query = """
-                    INSERT INTO assets (asset_type, model, purchase_date, warranty, status, location, reason)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """
-                    
-                    cursor.execute(insert_query, (
-                        asset_data['asset_type'],
-                        asset_data['model'],
-                        asset_data['purchase_date'],
-                        asset_data['warranty'],
-                        asset_data['status'],
-                        asset_data['location'],
-                        asset_data['reason']
-                    ))
-                    
-                    migrated_count += 1
-                    
-                    if migrated_count % 10 == 0:
-                        logger.info(f"진행률: {migrated_count}/{len(df)}")
-                
-                except Exception as e:
-                    logger.error(f"행 {index} 마이그레이션 실패: {e}")
-                    skipped_count += 1
-                    continue
+            migrated_count, skipped_count = load_frame(cursor, df)
             
             # 변경사항 커밋
             self.connection.commit()
@@ -215,14 +484,275 @@ class ExcelToPostgreSQLMigrator:
             self.connection.rollback()
             return 0
     
+    def migrate_streaming(self, batch_size=DEFAULT_BATCH_SIZE, workers=1, files=None):
+        """엑셀 파일을 청크 단위로 스트리밍하며 PostgreSQL로 마이그레이션합니다.
+        
+        청크마다 자산 INSERT와 체크포인트를 한 트랜잭션으로 커밋하므로, 중단된 실행을
+        같은 파일로 다시 시작하면 (파일 해시, 시트)별로 커밋된 행 다음부터 재개합니다 (배치 크기가 달라도 됨).
+        workers가 2 이상이면 작업자 프로세스들이 시트를 병렬로 읽고 검증하며,
+        데이터베이스 쓰기는 이 프로세스의 로더 하나가 담당합니다.
+        반환값은 시트별 대사(reconciliation) 보고서입니다. 실패하면 None입니다.
+        """
+        files = files or [self.excel_file_path]
+        missing = [path for path in files if not os.path.exists(path)]
+        if missing:
+            logger.error(f"엑셀 파일을 찾을 수 없습니다: {missing}")
+            return None
+        
+        cursor = self.connection.cursor()
+        try:
+            SchemaMigrator(self.connection).ensure_schema()
+            
+            tasks, report = self._plan_chunks(cursor, files)
+            cursor.execute("SELECT COUNT(*) FROM assets")
+            count_before = cursor.fetchone()[0]
+            self.connection.commit()
+            started = time.monotonic()
+            
+            for file_hash, sheet_name, batch, error in self._chunk_events(tasks, batch_size, workers):
+                entry = report[(file_hash, sheet_name)]
+                if batch is None:
+                    if error:
+                        entry['error'] = error
+                        logger.error(f"[{sheet_name}] 시트 처리 실패: {error}")
+                        continue
+                    cursor.execute(UPSERT_CHECKPOINT, (file_hash, sheet_name, entry['file'], 0, 0, 0, 0, True))
+                    self.connection.commit()
+                    entry['completed'] = True
+                    continue
+                
+                try:
+                    loaded, skipped = load_frame(cursor, batch.frame)
+                    cursor.execute(UPSERT_CHECKPOINT, (
+                        file_hash, sheet_name, entry['file'], 1, batch.rows_read, loaded, skipped, False
+                    ))
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+                # 커밋된 청크의 거부 행만 기록하여 재개 시 중복 기록을 피함
+                self.rejects.write(batch.rejects, entry['file'], sheet_name)
+                
+                entry['chunks'] += 1
+                entry['rows_read'] += batch.rows_read
+                entry['rows_valid'] += len(batch.frame)
+                entry['loaded'] += loaded
+                entry['skipped'] += skipped
+                logger.info(f"[{sheet_name}] 청크 {batch.number} 커밋: {loaded}개 삽입, {skipped}개 건너뜀")
+            
+            cursor.execute("SELECT COUNT(*) FROM assets")
+            count_after = cursor.fetchone()[0]
+            self.connection.commit()
+            
+            elapsed = max(time.monotonic() - started, 1e-9)
+            summary = self._reconcile(report, count_before, count_after, elapsed)
+            return summary
+            
+        except Exception as e:
+            logger.error(f"데이터 마이그레이션 실패 (커밋된 청크까지는 재실행 시 재개됩니다): {e}")
+            self.connection.rollback()
+            return None
+        finally:
+            cursor.close()
+    
+    def _plan_chunks(self, cursor, files):
+        """파일별 시트 목록과 체크포인트를 읽어 처리할 (파일, 해시, 시트, 건너뛸 행 수) 목록을 만듭니다."""
+        tasks = []
+        report = {}
+        for path in files:
+            file_hash = file_sha256(path)
+            cursor.execute(SELECT_CHECKPOINTS, (file_hash,))
+            checkpoints = {sheet: (rows_read, completed) for sheet, rows_read, completed in cursor.fetchall()}
+            
+            workbook = openpyxl.load_workbook(path, read_only=True)
+            sheet_names = workbook.sheetnames
+            workbook.close()
+            
+            for sheet_name in sheet_names:
+                rows_done, completed = checkpoints.get(sheet_name, (0, False))
+                report[(file_hash, sheet_name)] = {
+                    'file': path, 'sheet': sheet_name, 'resumed_from': rows_done,
+                    'chunks': 0, 'rows_read': 0, 'rows_valid': 0, 'loaded': 0, 'skipped': 0,
+                    'completed': completed, 'error': None,
+                }
+                if completed:
+                    logger.info(f"[{sheet_name}] 이미 완료된 시트입니다 ({os.path.basename(path)}).")
+                    continue
+                tasks.append((path, file_hash, sheet_name, rows_done))
+        return tasks, report
+    
+    def _chunk_events(self, tasks, batch_size, workers):
+        """(파일 해시, 시트, Batch, 오류)를 생성합니다.
+        
+        시트마다 Batch가 None인 종료 이벤트로 끝납니다. 한 시트의 청크는 항상 순서대로 옵니다.
+        """
+        if workers <= 1 or len(tasks) <= 1:
+            for path, file_hash, sheet_name, skip_rows in tasks:
+                parser = ExcelToPostgreSQLMigrator(path, None)
+                for batch in parser.iter_excel_batches(batch_size, sheets=[sheet_name], skip={sheet_name: skip_rows}):
+                    yield file_hash, sheet_name, batch, None
+                yield file_hash, sheet_name, None, None
+            return
+        
+        workers = min(workers, len(tasks))
+        with multiprocessing.Manager() as manager:
+            # 큐 크기를 제한해 로더가 느릴 때 작업자가 기다리도록 함 (메모리 상한)
+            queue = manager.Queue(maxsize=workers * QUEUE_CHUNKS_PER_WORKER)
+            stop = manager.Event()
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                for path, file_hash, sheet_name, skip_rows in tasks:
+                    pool.submit(_parse_sheet, path, file_hash, sheet_name, batch_size, skip_rows, queue, stop)
+                
+                remaining = len(tasks)
+                while remaining:
+                    event = queue.get()
+                    if event[2] is None:
+                        remaining -= 1
+                    yield event
+            finally:
+                # 로더가 실패해 중간에 끝나도 큐에서 기다리는 작업자가 남지 않도록 함
+                stop.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _reconcile(self, report, count_before, count_after, elapsed):
+        """시트별 처리 결과와 assets 행 수 변화를 대조한 보고서를 로그로 남기고 반환합니다."""
+        entries = list(report.values())
+        loaded = sum(entry['loaded'] for entry in entries)
+        processed = sum(entry['rows_read'] for entry in entries)
+        summary = {
+            'sheets': entries,
+            'rows_read': processed,
+            'rows_loaded': loaded,
+            'rows_skipped': sum(entry['skipped'] for entry in entries),
+            'rows_rejected': sum(entry['rows_read'] - entry['rows_valid'] for entry in entries),
+            'rejects_file': self.rejects_path if self.rejects.count else None,
+            'assets_before': count_before,
+            'assets_after': count_after,
+            'balanced': count_after - count_before == loaded,
+            'incomplete': [entry['sheet'] for entry in entries if not entry['completed']],
+            'elapsed_seconds': elapsed,
+        }
+        
+        logger.info("=" * 60)
+        logger.info("마이그레이션 대사 보고서")
+        for entry in entries:
+            state = '완료' if entry['completed'] else ('실패' if entry['error'] else '미완료')
+            logger.info(
+                f"  {os.path.basename(entry['file'])} / {entry['sheet']}: {state}, "
+                f"청크 {entry['chunks']}개 (재개 위치 {entry['resumed_from']}행), "
+                f"읽음 {entry['rows_read']}, 거부 {entry['rows_read'] - entry['rows_valid']}, "
+                f"삽입 {entry['loaded']}, 건너뜀 {entry['skipped']}"
+            )
+        logger.info(f"  assets 행 수: {count_before} → {count_after} (이번 실행 삽입 {loaded})")
+        if summary['rejects_file']:
+            logger.info(f"  거부 행 {self.rejects.count}개는 {summary['rejects_file']}에 기록되었습니다.")
+        if summary['balanced']:
+            logger.info("  ✅ 삽입 수와 assets 행 수 변화가 일치합니다.")
+        else:
+            logger.warning("  ⚠️ 삽입 수와 assets 행 수 변화가 다릅니다. 동시에 다른 쓰기가 있었는지 확인하세요.")
+        if summary['incomplete']:
+            logger.warning(f"  미완료 시트: {summary['incomplete']} - 다시 실행하면 체크포인트에서 재개합니다.")
+        logger.info(f"  소요 시간 {elapsed:.1f}초, {processed / elapsed:,.0f}행/초")
+        logger.info("=" * 60)
+        return summary
+    
+    def sync(self, batch_size=DEFAULT_BATCH_SIZE, delete_missing=False, dry_run=False, sample_size=10):
+        """엑셀과 데이터베이스를 증분 동기화합니다.
+        
+        원본 행을 스트리밍으로 읽어 임시 테이블에 COPY한 뒤, 양쪽 행 지문을 한 번의 집합 연산으로
+        비교하여 추가/변경(/삭제) 대상만 반영합니다. 변경이 없는 워크북을 다시 동기화하면
+        assets의 어떤 행도 건드리지 않습니다. dry_run=True이면 비교 보고서만 만들고 롤백합니다.
+        반환값은 동기화 보고서이며, 실패하면 None입니다.
+        """
+        if not os.path.exists(self.excel_file_path):
+            logger.error(f"엑셀 파일을 찾을 수 없습니다: {self.excel_file_path}")
+            return None
+        
+        started = time.monotonic()
+        cursor = self.connection.cursor()
+        try:
+            SchemaMigrator(self.connection).ensure_schema()
+            
+            if not dry_run:
+                # 비교와 반영 사이에 다른 쓰기가 끼어들지 않도록 함 (읽기는 막지 않음)
+                cursor.execute("LOCK TABLE assets IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute(CREATE_SYNC_SOURCE)
+            
+            source_rows = 0
+            rejected_rows = 0
+            for batch in self.iter_excel_batches(batch_size):
+                self.rejects.write(batch.rejects, self.excel_file_path, batch.sheet)
+                rejected_rows += len(batch.rejects)
+                if len(batch.frame) == 0:
+                    continue
+                cursor.copy_expert(copy_sql('sync_source'), frame_to_copy_buffer(batch.frame))
+                source_rows += len(batch.frame)
+            
+            cursor.execute(CREATE_SYNC_DIFF)
+            cursor.execute("SELECT change, COUNT(*) FROM sync_diff GROUP BY change")
+            report = sync_report(dict(cursor.fetchall()), source_rows, rejected_rows, delete_missing, dry_run)
+            
+            for change in ('insert', 'update', 'delete'):
+                cursor.execute(
+                    "SELECT asset_id, asset_type, model, status, location FROM sync_diff "
+                    "WHERE change = %s ORDER BY asset_type, model, asset_id LIMIT %s",
+                    (change, sample_size)
+                )
+                report['samples'][change] = cursor.fetchall()
+            
+            if dry_run:
+                self.connection.rollback()
+            else:
+                if report['insert']:
+                    cursor.execute(APPLY_SYNC_INSERTS)
+                if report['update']:
+                    cursor.execute(APPLY_SYNC_UPDATES)
+                if report['delete']:
+                    cursor.execute(APPLY_SYNC_DELETES)
+                self.connection.commit()
+            
+            report['elapsed_seconds'] = time.monotonic() - started
+            self._log_sync_report(report, delete_missing)
+            return report
+            
+        except Exception as e:
+            logger.error(f"동기화 실패: {e}")
+            self.connection.rollback()
+            return None
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _log_sync_report(report, delete_missing):
+        logger.info("=" * 60)
+        logger.info("동기화 비교 보고서" + (" (dry-run, 반영하지 않음)" if report['dry_run'] else ""))
+        logger.info(f"  원본 행: {report['source_rows']} (거부 {report['rejected_rows']}), 변경 없음: {report['unchanged']}, "
+                    f"보관된 자산과 일치(반영 안 함): {report['archived']}")
+        logger.info(f"  추가: {report['insert']}, 변경: {report['update']}, "
+                    f"원본에 없음: {report['missing_in_source']}" + ("" if delete_missing else " (삭제 안 함)"))
+        labels = {'insert': '추가', 'update': '변경', 'delete': '원본에 없음'}
+        for change, rows in report['samples'].items():
+            for asset_id, asset_type, model, status, location in rows:
+                logger.info(f"    [{labels[change]}] ID={asset_id or '-'} {asset_type} {model} {status or ''} {location or ''}")
+        logger.info(f"  소요 시간 {report['elapsed_seconds']:.1f}초")
+        logger.info("=" * 60)
+    
     def close_connection(self):
         """데이터베이스 연결을 종료합니다."""
+        self.rejects.close()
         if self.connection:
             self.connection.close()
             logger.info("데이터베이스 연결이 종료되었습니다.")
     
-    def run_migration(self):
-        """전체 마이그레이션 프로세스를 실행합니다."""
+    def run_migration(self, streaming=False, batch_size=DEFAULT_BATCH_SIZE, workers=1, files=None,
+                      sync=False, dry_run=False, delete_missing=False):
+        """전체 마이그레이션 프로세스를 실행합니다.
+        
+        streaming=True이면 워크북 전체를 읽지 않고 모든 시트를 batch_size 행씩 청크로 나눠
+        커밋하며, 중단된 경우 다시 실행하면 체크포인트에서 재개합니다.
+        sync=True이면 이미 이전된 데이터와 비교하여 바뀐 행만 반영하는 증분 동기화를 실행합니다.
+        """
         logger.info("엑셀 데이터 마이그레이션을 시작합니다...")
         
         try:
@@ -230,6 +760,22 @@ class ExcelToPostgreSQLMigrator:
             if not self.connect_database():
                 return False
             
+            if sync:
+                report = self.sync(batch_size, delete_missing=delete_missing, dry_run=dry_run)
+                if report is None:
+                    logger.error("❌ 동기화에 실패했습니다.")
+                    return False
+                logger.info("✅ 동기화가 완료되었습니다.")
+                return True
+            
+            if streaming:
+                summary = self.migrate_streaming(batch_size, workers=workers, files=files)
+                if summary is not None and not summary['incomplete']:
+                    logger.info(f"✅ 마이그레이션이 성공적으로 완료되었습니다! {summary['rows_loaded']}개 데이터 이전")
+                    return True
+                logger.error("❌ 마이그레이션에 실패했습니다.")
+                return False
+            
             # 2. 엑셀 데이터 읽기
             df = self.read_excel_data()
             if df is None or len(df) == 0:
@@ -263,9 +809,10 @@ def main():
     print("=" * 60)
     
     # 설정
-    excel_file_path = input("엑셀 파일 경로를 입력하세요 (기본값: Asset Management.xlsx): ").strip()
+    excel_file_path = input("엑셀 파일 경로를 입력하세요 (여러 개는 쉼표로 구분, 기본값: Asset Management.xlsx): ").strip()
     if not excel_file_path:
         excel_file_path = "Asset Management.xlsx"
+    excel_files = [path.strip() for path in excel_file_path.split(',') if path.strip()]
     
     # 데이터베이스 설정
     print("\n📊 데이터베이스 연결 정보를 입력하세요:")
@@ -287,10 +834,30 @@ def main():
         'password': db_password
     }
     
+    # 대용량 파일은 스트리밍 모드 권장
+    # 이미 이전한 데이터가 있으면 증분 동기화로 바뀐 행만 반영
+    sync = len(excel_files) == 1 and input("\n기존 데이터와 증분 동기화할까요? (y/N): ").strip().lower() == 'y'
+    dry_run = delete_missing = False
+    if sync:
+        dry_run = input("변경 내용만 확인하는 dry-run으로 실행할까요? (Y/n): ").strip().lower() != 'n'
+        delete_missing = input("엑셀에 없는 자산을 삭제할까요? (y/N): ").strip().lower() == 'y'
+    
+    # 여러 파일은 항상 스트리밍(청크/재개) 모드로 처리
+    streaming = not sync and (
+        len(excel_files) > 1 or input("\n대용량 스트리밍 모드로 실행할까요? (y/N): ").strip().lower() == 'y'
+    )
+    batch_size = DEFAULT_BATCH_SIZE
+    workers = 1
+    if streaming:
+        batch_size = int(input(f"배치 크기 (기본값: {DEFAULT_BATCH_SIZE}): ").strip() or DEFAULT_BATCH_SIZE)
+        default_workers = min(4, os.cpu_count() or 1)
+        workers = int(input(f"병렬 파싱 작업자 수 (기본값: {default_workers}): ").strip() or default_workers)
+    
     # 마이그레이션 실행
-    migrator = ExcelToPostgreSQLMigrator(excel_file_path, db_config)
+    migrator = ExcelToPostgreSQLMigrator(excel_files[0], db_config)
     
-    if migrator.run_migration():
+    if migrator.run_migration(streaming=streaming, batch_size=batch_size, workers=workers, files=excel_files,
+                              sync=sync, dry_run=dry_run, delete_missing=delete_missing):
         print("\n🎉 마이그레이션이 성공적으로 완료되었습니다!")
         print("\n📝 다음 단계:")
         print("1. PS_Asset_Management.py를 실행하여 애플리케이션을 시작하세요")
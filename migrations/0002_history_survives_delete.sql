@@ -0,0 +1,6 @@
+-- 0002: 자산 삭제 후에도 변경 이력을 보존
+-- 삭제 이력은 자산 삭제와 같은 트랜잭션에서 기록되므로, ON DELETE CASCADE 외래키가 있으면
+-- 이력 INSERT가 실패하거나 기존 이력이 함께 지워집니다. 이력은 감사 기록이므로 외래키를 제거합니다.
+
+ALTER TABLE asset_history DROP CONSTRAINT IF EXISTS asset_history_asset_id_fkey;
+CREATE INDEX IF NOT EXISTS idx_asset_history_asset_id ON asset_history(asset_id);
@@ -0,0 +1,16 @@
+-- 0003: 엑셀 마이그레이션 체크포인트
+-- 청크마다 자산 INSERT와 같은 트랜잭션에서 기록되므로, 중단된 실행은
+-- (파일 해시, 시트)별 마지막으로 커밋된 청크 다음부터 재개할 수 있습니다.
+
+CREATE TABLE IF NOT EXISTS migration_checkpoints (
+    file_hash CHAR(64) NOT NULL,
+    sheet_name VARCHAR(255) NOT NULL,
+    file_path TEXT,
+    last_chunk INTEGER NOT NULL DEFAULT 0,
+    rows_read INTEGER NOT NULL DEFAULT 0,
+    rows_loaded INTEGER NOT NULL DEFAULT 0,
+    rows_skipped INTEGER NOT NULL DEFAULT 0,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (file_hash, sheet_name)
+);
@@ -0,0 +1,39 @@
+-- 0004: 엑셀 증분 동기화를 위한 행 지문(row_fingerprint)
+-- 비교 대상 컬럼의 md5를 트리거가 INSERT/UPDATE 때마다 계산해 저장합니다.
+-- 동기화 시 원본 행도 같은 함수로 계산하므로 양쪽 지문이 항상 같은 규칙을 따릅니다.
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS row_fingerprint CHAR(32);
+
+CREATE OR REPLACE FUNCTION asset_row_fingerprint(
+    p_asset_type TEXT, p_model TEXT, p_purchase_date DATE, p_warranty TEXT,
+    p_status TEXT, p_location TEXT, p_reason TEXT
+) RETURNS CHAR(32) AS $$
+    SELECT md5(concat_ws(chr(31),
+        p_asset_type, p_model, COALESCE(to_char(p_purchase_date, 'YYYY-MM-DD'), ''),
+        COALESCE(p_warranty, ''), p_status, p_location, COALESCE(p_reason, '')))
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION set_asset_row_fingerprint()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.row_fingerprint = asset_row_fingerprint(
+        NEW.asset_type, NEW.model, NEW.purchase_date, NEW.warranty,
+        NEW.status, NEW.location, NEW.reason);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- 기존 행 채우기 (updated_at이 바뀌지 않도록 트리거를 잠시 끔)
+ALTER TABLE assets DISABLE TRIGGER update_assets_updated_at;
+UPDATE assets SET row_fingerprint = asset_row_fingerprint(
+    asset_type, model, purchase_date, warranty, status, location, reason)
+WHERE row_fingerprint IS NULL;
+ALTER TABLE assets ENABLE TRIGGER update_assets_updated_at;
+
+DROP TRIGGER IF EXISTS set_assets_row_fingerprint ON assets;
+CREATE TRIGGER set_assets_row_fingerprint
+    BEFORE INSERT OR UPDATE ON assets
+    FOR EACH ROW
+    EXECUTE FUNCTION set_asset_row_fingerprint();
+
+CREATE INDEX IF NOT EXISTS idx_assets_type_model ON assets(asset_type, model);
@@ -0,0 +1,23 @@
+-- 0005: 백그라운드 작업 (웹 앱의 가져오기/내보내기)
+-- 작업 상태와 진행률을 데이터베이스에 두므로 웹 앱이 재시작되어도 상태를 조회할 수 있고,
+-- 실행 중이던 작업은 시작 시 다시 대기열에 넣습니다.
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id CHAR(32) PRIMARY KEY,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('import', 'export')),
+    status VARCHAR(20) NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+    params JSONB NOT NULL DEFAULT '{}',
+    progress JSONB NOT NULL DEFAULT '{}',
+    artifact_name TEXT,
+    error TEXT,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_jobs_active ON jobs(status) WHERE status IN ('queued', 'running');
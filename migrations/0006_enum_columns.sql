@@ -0,0 +1,46 @@
+-- 0006: asset_type, status, location을 ENUM으로 저장
+-- 한글 레이블 문자열('본사 서버실' 등) 대신 행마다 4바이트 ENUM 값을 저장하여 테이블과
+-- idx_assets_type/status/location/type_model 인덱스 크기를 줄이고, 비교도 콜레이션 문자열 비교 대신
+-- 정수 비교로 바꿉니다. 쿼리 결과와 입력은 계속 레이블 문자열이므로 API 형태는 그대로입니다.
+-- 허용 값은 ENUM이 검사하므로 기존 CHECK 제약은 제거합니다.
+
+DO $$
+BEGIN
+    CREATE TYPE asset_type_enum AS ENUM ('HW', 'SW', 'NW', 'STORAGE');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    CREATE TYPE asset_status_enum AS ENUM ('입고', '대기', '운영', '유휴', '폐기');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+DO $$
+BEGIN
+    CREATE TYPE asset_location_enum AS ENUM ('본사 서버실', '개인지급', '프로젝트장소', '기타');
+EXCEPTION WHEN duplicate_object THEN NULL;
+END $$;
+
+ALTER TABLE assets
+    DROP CONSTRAINT IF EXISTS assets_asset_type_check,
+    DROP CONSTRAINT IF EXISTS assets_status_check,
+    DROP CONSTRAINT IF EXISTS assets_location_check;
+
+-- 한 번의 테이블 재작성으로 세 컬럼을 바꾸고 관련 인덱스를 다시 만듭니다
+ALTER TABLE assets
+    ALTER COLUMN asset_type TYPE asset_type_enum USING asset_type::asset_type_enum,
+    ALTER COLUMN status TYPE asset_status_enum USING status::asset_status_enum,
+    ALTER COLUMN location TYPE asset_location_enum USING location::asset_location_enum;
+
+-- ENUM은 text로 암시적 변환되지 않으므로 지문 함수 호출에 명시적으로 변환합니다.
+-- 레이블 문자열은 그대로이므로 기존 row_fingerprint 값은 다시 계산할 필요가 없습니다.
+CREATE OR REPLACE FUNCTION set_asset_row_fingerprint()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.row_fingerprint = asset_row_fingerprint(
+        NEW.asset_type::text, NEW.model, NEW.purchase_date, NEW.warranty,
+        NEW.status::text, NEW.location::text, NEW.reason);
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
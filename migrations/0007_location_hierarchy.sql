@@ -0,0 +1,149 @@
+-- 0007: 계층형 위치 (사이트 -> 건물 -> 실 -> 랙)
+-- locations는 인접 목록(parent_id)으로, location_closure는 모든 (조상, 자손, 거리) 쌍으로 계층을 저장합니다.
+-- "건물 B 아래의 모든 자산"은 closure의 (ancestor_id) 인덱스로 자손 위치를 찾고
+-- assets의 (location_id, ...) 인덱스로 세므로 재귀 쿼리 없이 인덱스만으로 답할 수 있습니다.
+-- 기존 location 컬럼은 호환을 위해 유지하며, 네 레거시 값마다 하나씩 만든 위치 노드(legacy_location)와
+-- 트리거로 서로 맞춥니다.
+
+CREATE TABLE IF NOT EXISTS locations (
+    id SERIAL PRIMARY KEY,
+    parent_id INTEGER REFERENCES locations(id) ON DELETE RESTRICT,
+    name VARCHAR(100) NOT NULL,
+    kind VARCHAR(20) NOT NULL DEFAULT 'other'
+        CHECK (kind IN ('site', 'building', 'room', 'rack', 'other')),
+    legacy_location asset_location_enum,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 같은 부모 아래에서 이름은 유일 (최상위는 parent_id가 NULL이므로 0으로 취급)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_locations_parent_name ON locations (COALESCE(parent_id, 0), name);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_locations_legacy ON locations (legacy_location) WHERE legacy_location IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS location_closure (
+    ancestor_id INTEGER NOT NULL REFERENCES locations(id) ON DELETE CASCADE,
+    descendant_id INTEGER NOT NULL REFERENCES locations(id) ON DELETE CASCADE,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_location_closure_descendant ON location_closure (descendant_id, depth);
+
+-- 위치 추가/이동 시 closure 갱신
+CREATE OR REPLACE FUNCTION maintain_location_closure()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, NEW.id, depth + 1
+        FROM location_closure
+        WHERE descendant_id = NEW.parent_id
+        UNION ALL
+        SELECT NEW.id, NEW.id, 0;
+        RETURN NEW;
+    END IF;
+
+    IF NEW.parent_id IS NOT DISTINCT FROM OLD.parent_id THEN
+        RETURN NEW;
+    END IF;
+
+    IF NEW.parent_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM location_closure WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+    ) THEN
+        RAISE EXCEPTION '위치 %을(를) 자신의 하위 위치 % 아래로 옮길 수 없습니다', NEW.id, NEW.parent_id
+            USING ERRCODE = 'check_violation';
+    END IF;
+
+    -- 하위 트리와 바깥 조상 사이의 연결을 끊고 새 부모의 조상들과 다시 연결
+    DELETE FROM location_closure
+    WHERE descendant_id IN (SELECT descendant_id FROM location_closure WHERE ancestor_id = NEW.id)
+      AND ancestor_id NOT IN (SELECT descendant_id FROM location_closure WHERE ancestor_id = NEW.id);
+
+    INSERT INTO location_closure (ancestor_id, descendant_id, depth)
+    SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+    FROM location_closure above
+    CROSS JOIN location_closure below
+    WHERE above.descendant_id = NEW.parent_id
+      AND below.ancestor_id = NEW.id;
+
+    -- 옮긴 하위 트리 자산의 레거시 location을 새 위치에 맞춤
+    UPDATE assets a
+    SET location = moved.legacy
+    FROM (
+        SELECT below.descendant_id AS location_id, location_legacy_label(below.descendant_id) AS legacy
+        FROM location_closure below
+        WHERE below.ancestor_id = NEW.id
+    ) moved
+    WHERE a.location_id = moved.location_id
+      AND moved.legacy IS NOT NULL
+      AND a.location IS DISTINCT FROM moved.legacy;
+
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- 가장 가까운 레거시 노드(자신 포함)의 레이블
+CREATE OR REPLACE FUNCTION location_legacy_label(p_location_id INTEGER)
+RETURNS asset_location_enum AS $$
+    SELECT l.legacy_location
+    FROM location_closure c
+    JOIN locations l ON l.id = c.ancestor_id
+    WHERE c.descendant_id = p_location_id
+      AND l.legacy_location IS NOT NULL
+    ORDER BY c.depth
+    LIMIT 1
+$$ LANGUAGE sql STABLE;
+
+DROP TRIGGER IF EXISTS maintain_locations_closure ON locations;
+CREATE TRIGGER maintain_locations_closure
+    AFTER INSERT OR UPDATE OF parent_id ON locations
+    FOR EACH ROW
+    EXECUTE FUNCTION maintain_location_closure();
+
+-- 레거시 위치 노드
+INSERT INTO locations (name, legacy_location)
+SELECT label::text, label
+FROM unnest(enum_range(NULL::asset_location_enum)) AS label
+WHERE NOT EXISTS (SELECT 1 FROM locations WHERE legacy_location = label);
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS location_id INTEGER REFERENCES locations(id) ON DELETE RESTRICT;
+
+-- 자산의 location_id와 레거시 location 맞추기
+-- - location_id 없이 저장하면(기존 클라이언트, 엑셀 적재) 레거시 노드로 지정
+-- - location_id를 지정하면 가장 가까운 레거시 노드의 레이블로 location을 채움
+-- - location만 바꾸면(기존 클라이언트) 현재 노드의 레이블과 다를 때 해당 레거시 노드로 옮김
+CREATE OR REPLACE FUNCTION resolve_asset_location()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.location_id IS NOT DISTINCT FROM OLD.location_id THEN
+        IF NEW.location IS DISTINCT FROM OLD.location THEN
+            IF NEW.location_id IS NULL OR NEW.location IS DISTINCT FROM location_legacy_label(NEW.location_id) THEN
+                NEW.location_id := (SELECT id FROM locations WHERE legacy_location = NEW.location);
+            END IF;
+        END IF;
+    ELSIF NEW.location_id IS NULL THEN
+        NEW.location_id := (SELECT id FROM locations WHERE legacy_location = NEW.location);
+    ELSE
+        NEW.location := COALESCE(location_legacy_label(NEW.location_id), NEW.location);
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+-- 행 지문 트리거(set_assets_row_fingerprint)보다 먼저 실행되도록 이름 순서를 맞춤
+DROP TRIGGER IF EXISTS resolve_assets_location ON assets;
+CREATE TRIGGER resolve_assets_location
+    BEFORE INSERT OR UPDATE OF location, location_id ON assets
+    FOR EACH ROW
+    EXECUTE FUNCTION resolve_asset_location();
+
+-- 기존 행 채우기 (updated_at이 바뀌지 않도록 트리거를 잠시 끔)
+ALTER TABLE assets DISABLE TRIGGER update_assets_updated_at;
+UPDATE assets a
+SET location_id = l.id
+FROM locations l
+WHERE l.legacy_location = a.location
+  AND a.location_id IS NULL;
+ALTER TABLE assets ENABLE TRIGGER update_assets_updated_at;
+
+-- 하위 트리 건수/상태별 통계를 인덱스만으로 계산할 수 있도록 상태와 유형을 함께 둠
+CREATE INDEX IF NOT EXISTS idx_assets_location_id ON assets (location_id, status, asset_type);
@@ -0,0 +1,12 @@
+-- 0008: 유형별 속성 (attributes JSONB)
+-- HW의 CPU/RAM, SW의 라이선스 수처럼 유형마다 다른 항목을 JSON 객체로 저장합니다.
+-- 키와 값 타입은 asset_attributes.py의 유형별 스키마로 애플리케이션에서 검증합니다.
+-- jsonb_path_ops GIN 인덱스는 @> 포함 조건만 지원하지만 jsonb_ops보다 작고 빠르므로
+-- `attributes @> '{"ram_gb": 64}'` 형태의 조회(/api/assets?attr.ram_gb=64)에 맞춥니다.
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS attributes JSONB NOT NULL DEFAULT '{}'::jsonb;
+
+ALTER TABLE assets DROP CONSTRAINT IF EXISTS assets_attributes_object;
+ALTER TABLE assets ADD CONSTRAINT assets_attributes_object CHECK (jsonb_typeof(attributes) = 'object');
+
+CREATE INDEX IF NOT EXISTS idx_assets_attributes ON assets USING GIN (attributes jsonb_path_ops);
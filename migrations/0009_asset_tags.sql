@@ -0,0 +1,34 @@
+-- 0009: 자산 태그/시리얼 번호 (바코드 스캔 조회)
+-- 서버실 핸드헬드 스캐너가 읽은 라벨을 search_assets의 ILIKE 검색 없이 유일 인덱스 한 번으로 찾도록
+-- asset_tag(관리 라벨)와 serial_number(제조사 시리얼)를 컬럼으로 두고 각각 유일 인덱스를 만듭니다.
+-- NULL은 서로 다른 값으로 취급되므로 태그가 없는 자산은 제약에 걸리지 않습니다.
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS asset_tag VARCHAR(64);
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS serial_number VARCHAR(128);
+
+-- 0008에서 attributes의 serial 키로 저장하던 시리얼을 컬럼으로 옮김.
+-- 같은 시리얼이 여러 자산에 있으면 가장 작은 ID만 컬럼으로 옮기고 나머지는 비고에 남깁니다.
+ALTER TABLE assets DISABLE TRIGGER update_assets_updated_at;
+
+WITH serials AS (
+    SELECT id, btrim(attributes->>'serial') AS serial,
+           row_number() OVER (PARTITION BY btrim(attributes->>'serial') ORDER BY id) AS occurrence
+    FROM assets
+    WHERE attributes ? 'serial'
+)
+UPDATE assets a
+SET serial_number = CASE WHEN s.occurrence = 1 AND s.serial <> '' THEN s.serial END,
+    reason = CASE
+        WHEN s.occurrence > 1 AND s.serial <> ''
+            THEN concat_ws(E'\n', NULLIF(a.reason, ''), '중복 시리얼: ' || s.serial)
+        ELSE a.reason
+    END,
+    attributes = a.attributes - 'serial'
+FROM serials s
+WHERE a.id = s.id
+  AND a.serial_number IS NULL;
+
+ALTER TABLE assets ENABLE TRIGGER update_assets_updated_at;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_assets_asset_tag ON assets (asset_tag);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_assets_serial_number ON assets (serial_number);
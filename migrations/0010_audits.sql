@@ -0,0 +1,35 @@
+-- 0010: 실사(재고 조사) 기록
+-- 위치별로 스캔한 태그 목록을 자산과 대조한 결과를 실사 회차(audit_runs)와 항목(audit_items)으로 남깁니다.
+-- 회차마다 건수를 함께 저장하므로 위치별 추이는 audit_runs만 읽어 보고할 수 있습니다.
+-- 항목의 asset_id는 이력과 마찬가지로 자산이 삭제된 뒤에도 남도록 외래키를 두지 않습니다.
+
+CREATE TABLE IF NOT EXISTS audit_runs (
+    id SERIAL PRIMARY KEY,
+    location_id INTEGER NOT NULL REFERENCES locations(id) ON DELETE RESTRICT,
+    note TEXT,
+    scanned_count INTEGER NOT NULL DEFAULT 0,
+    matched_count INTEGER NOT NULL DEFAULT 0,
+    missing_count INTEGER NOT NULL DEFAULT 0,
+    unexpected_count INTEGER NOT NULL DEFAULT 0,
+    misplaced_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    corrected_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_runs_location ON audit_runs (location_id, created_at DESC);
+
+-- outcome
+-- - matched: 스캔한 태그의 자산이 실사 위치(하위 포함)에 등록되어 있음
+-- - misplaced: 스캔한 태그의 자산이 다른 위치에 등록되어 있음 (recorded_location_id)
+-- - unexpected: 스캔한 태그와 일치하는 자산이 없음
+-- - missing: 실사 위치에 등록된 자산(폐기 제외)이 스캔되지 않음 (tag는 NULL)
+CREATE TABLE IF NOT EXISTS audit_items (
+    id BIGSERIAL PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES audit_runs(id) ON DELETE CASCADE,
+    outcome VARCHAR(12) NOT NULL CHECK (outcome IN ('matched', 'misplaced', 'unexpected', 'missing')),
+    tag VARCHAR(128),
+    asset_id INTEGER,
+    recorded_location_id INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_items_run ON audit_items (run_id, outcome);
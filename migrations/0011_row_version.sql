@@ -0,0 +1,20 @@
+-- 0011: 낙관적 동시성 제어를 위한 행 버전
+-- 행이 바뀔 때마다 version을 1씩 올리고, 클라이언트는 읽은 버전을 조건으로 수정합니다
+-- (UPDATE ... WHERE id = ? AND version = ?). 다른 사용자가 먼저 수정했다면 조건에 맞는 행이 없으므로
+-- 웹 모달이나 GUI 다이얼로그에서 편집하는 동안 행 잠금을 잡고 있지 않아도 덮어쓰기를 막을 수 있습니다.
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION bump_asset_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.version = OLD.version + 1;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS bump_assets_version ON assets;
+CREATE TRIGGER bump_assets_version
+    BEFORE UPDATE ON assets
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_asset_version();
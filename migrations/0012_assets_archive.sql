@@ -0,0 +1,59 @@
+-- 0012: 폐기 자산 보관 계층 (assets_archive)
+-- 폐기 자산이 assets에 계속 남으면 교체 주기가 몇 번 지나면서 행의 대부분을 차지하고,
+-- 목록/검색/통계가 매번 이 행들까지 읽게 됩니다. 폐기된 지 일정 기간이 지난 자산은
+-- 백그라운드 작업이 배치 단위로 assets_archive로 옮겨, 기본 조회는 운영 중인 자산 수에만 비례하도록 합니다.
+--
+-- - disposed_at은 상태가 '폐기'로 바뀐 시각이며 트리거가 관리합니다 (다른 상태로 바꾸면 NULL).
+-- - assets_archive는 assets와 같은 컬럼에 archived_at을 더한 테이블입니다.
+--   assets에 컬럼을 추가하는 마이그레이션은 assets_archive에도 같은 컬럼을 추가해야 합니다.
+-- - 자산 태그/시리얼 번호는 운영 자산끼리만 유일하므로 보관 테이블에는 일반 인덱스만 둡니다
+--   (같은 태그를 재사용한 자산이 다시 폐기되어 보관될 수 있음).
+-- - asset_history는 자산 삭제 후에도 남으므로 (0002) 보관된 자산의 이력도 그대로 조회할 수 있습니다.
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS disposed_at TIMESTAMP;
+
+CREATE OR REPLACE FUNCTION set_asset_disposed_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.status <> '폐기' THEN
+        NEW.disposed_at := NULL;
+    ELSIF TG_OP = 'INSERT' OR OLD.status IS DISTINCT FROM NEW.status THEN
+        NEW.disposed_at := COALESCE(NEW.disposed_at, CURRENT_TIMESTAMP);
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS set_assets_disposed_at ON assets;
+CREATE TRIGGER set_assets_disposed_at
+    BEFORE INSERT OR UPDATE OF status ON assets
+    FOR EACH ROW
+    EXECUTE FUNCTION set_asset_disposed_at();
+
+-- 이미 폐기된 자산은 마지막 수정 시각을 폐기 시각으로 간주
+-- (updated_at과 version이 바뀌지 않도록 트리거를 잠시 끔)
+ALTER TABLE assets DISABLE TRIGGER update_assets_updated_at;
+ALTER TABLE assets DISABLE TRIGGER bump_assets_version;
+UPDATE assets
+SET disposed_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)
+WHERE status = '폐기' AND disposed_at IS NULL;
+ALTER TABLE assets ENABLE TRIGGER bump_assets_version;
+ALTER TABLE assets ENABLE TRIGGER update_assets_updated_at;
+
+-- 보관 대상 선택 (폐기 자산만 담는 작은 부분 인덱스)
+CREATE INDEX IF NOT EXISTS idx_assets_disposed_at ON assets (disposed_at) WHERE status = '폐기';
+
+CREATE TABLE IF NOT EXISTS assets_archive (
+    LIKE assets INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_assets_archive_archived_at ON assets_archive (archived_at);
+CREATE INDEX IF NOT EXISTS idx_assets_archive_location_id ON assets_archive (location_id);
+CREATE INDEX IF NOT EXISTS idx_assets_archive_asset_tag ON assets_archive (asset_tag) WHERE asset_tag IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_assets_archive_serial_number ON assets_archive (serial_number) WHERE serial_number IS NOT NULL;
+
+-- 보관 작업을 백그라운드 작업 종류에 추가
+ALTER TABLE jobs DROP CONSTRAINT IF EXISTS jobs_kind_check;
+ALTER TABLE jobs ADD CONSTRAINT jobs_kind_check CHECK (kind IN ('import', 'export', 'archive'));
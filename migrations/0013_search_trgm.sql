@@ -0,0 +1,10 @@
+-- 0013: 모델/비고 부분 일치 검색용 트라이그램 인덱스
+-- search_assets()는 모델과 비고를 ILIKE '%검색어%'로 찾으므로 B-tree 인덱스를 쓸 수 없어 매번 전체 테이블을 읽었습니다.
+-- pg_trgm GIN 인덱스는 ILIKE의 부분 일치를 인덱스에서 찾으므로, 검색 결과와 패싯 건수(GROUPING SETS)가
+-- 전체 자산 수가 아니라 검색 결과 수에 비례한 시간으로 계산됩니다.
+-- 보관 테이블(assets_archive)은 요청할 때만 검색하므로 인덱스를 두지 않습니다.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_assets_model_trgm ON assets USING gin (model gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_assets_reason_trgm ON assets USING gin (reason gin_trgm_ops);
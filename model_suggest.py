@@ -0,0 +1,115 @@
+"""
+모델명 자동 완성 (웹 검색창의 /api/suggest)
+자산 테이블의 모델명을 메모리의 트라이(접두사 트리)로 색인하여, 입력 중인 접두사로 시작하는
+모델명을 자산 수가 많은 순서로 돌려줍니다. 키 입력마다 데이터베이스에 가지 않습니다.
+
+- 색인은 모델명별 자산 수를 세는 쿼리 한 번으로 만들며, 노드마다 상위 limit개의 모델명을 미리 담아 두므로
+  조회는 접두사 길이만큼 트라이를 내려가는 것으로 끝납니다.
+- ITAssetManager.generation이 바뀌거나(이 프로세스를 통한 변경) refresh_seconds가 지나면
+  (GUI 등 다른 프로세스의 변경) 다음 조회 때 다시 만듭니다. 다시 만드는 동안 다른 요청은 이전 색인으로 응답합니다.
+- 대소문자를 구분하지 않으며 (casefold), 보관된 폐기 자산의 모델명은 포함하지 않습니다.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MODEL_COUNTS = """
+    SELECT model, COUNT(*) AS count
+    FROM assets
+    WHERE model <> ''
+    GROUP BY model
+    ORDER BY count DESC, model
+"""
+
+
+class _Node:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+def build_trie(model_counts, limit):
+    """(모델명, 자산 수) 목록을 자산 수가 많은 순서로 받아 트라이의 루트 노드를 반환합니다.
+
+    순서대로 넣으므로 각 노드에 먼저 도착한 limit개가 그 접두사의 상위 모델명입니다.
+    """
+    root = _Node()
+    for model, count in model_counts:
+        entry = {'model': model, 'count': count}
+        node = root
+        if len(node.top) < limit:
+            node.top.append(entry)
+        for char in model.casefold():
+            node = node.children.setdefault(char, _Node())
+            if len(node.top) < limit:
+                node.top.append(entry)
+    return root
+
+
+class ModelSuggester:
+    def __init__(self, manager, limit=10, refresh_seconds=300):
+        """manager: ITAssetManager (모델명 조회와 데이터 세대 번호에 사용)"""
+        self.manager = manager
+        self.limit = limit
+        self.refresh_seconds = refresh_seconds
+        self._root = None
+        self._generation = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def suggest(self, prefix, limit=None):
+        """prefix로 시작하는 모델명을 자산 수가 많은 순서로 반환합니다 ([{"model", "count"}, ...])."""
+        limit = min(limit or self.limit, self.limit)
+        prefix = (prefix or '').strip().casefold()
+        if not prefix:
+            return []
+
+        node = self._current()
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.top[:limit]
+
+    def invalidate(self):
+        """다음 조회 때 색인을 다시 만들도록 합니다."""
+        self._generation = None
+
+    def _stale(self):
+        return (
+            self._root is None
+            or self._generation != self.manager.generation
+            or time.monotonic() - self._built_at > self.refresh_seconds
+        )
+
+    def _current(self):
+        if not self._stale():
+            return self._root
+        # 다시 만드는 요청은 하나만, 나머지는 이전 색인이 있으면 그대로 사용
+        if not self._lock.acquire(blocking=self._root is None):
+            return self._root
+        try:
+            if self._stale():
+                self._rebuild()
+            return self._root
+        finally:
+            self._lock.release()
+
+    def _rebuild(self):
+        # 쿼리 전에 세대를 읽어, 조회 중에 바뀐 변경은 다음 조회 때 다시 반영되도록 함
+        generation = self.manager.generation
+        started = time.monotonic()
+        try:
+            rows = self.manager.db.execute_query(MODEL_COUNTS, operation='stats')
+        except Exception as e:
+            logger.error(f"모델명 색인 생성 중 오류 발생: {e}")
+            raise
+        self._root = build_trie(((row['model'], row['count']) for row in rows), self.limit)
+        self._generation = generation
+        self._built_at = time.monotonic()
+        logger.info(f"모델명 색인 생성: {len(rows)}개 ({self._built_at - started:.2f}초)")
@@ -0,0 +1,81 @@
+"""
+쿼리 감시 타이머
+서버가 statement_timeout에 응답하지 못하는 경우(네트워크 정체 등)에 대비해, 예산과 여유 시간이 지나도
+끝나지 않은 쿼리를 클라이언트 측에서 취소합니다.
+
+쿼리마다 타이머 스레드를 만들지 않고, 하나의 감시 스레드가 기한 힙을 보며 기다립니다.
+등록/해제는 잠금 안에서 힙에 넣고 표시만 지우는 것으로 끝나므로 짧은 조회의 비용에 스레드 생성이 더해지지 않습니다.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class QueryWatchdog:
+    def __init__(self, on_expire, name='query-watchdog'):
+        """on_expire: 기한이 지난 토큰으로 감시 스레드에서 호출되는 함수"""
+        self.on_expire = on_expire
+        self.name = name
+        self._heap = []  # (기한, 핸들), 해제된 항목은 기한이 되거나 힙을 다시 만들 때 버림
+        self._active = {}  # 핸들 -> (기한, 토큰)
+        self._handles = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def arm(self, token, seconds):
+        """seconds 뒤에 token으로 on_expire를 호출하도록 등록하고 해제용 핸들을 반환합니다."""
+        deadline = time.monotonic() + seconds
+        with self._condition:
+            handle = next(self._handles)
+            self._active[handle] = (deadline, token)
+            heapq.heappush(self._heap, (deadline, handle))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            elif self._heap[0][1] == handle:
+                # 가장 이른 기한이 바뀌었으므로 기다리는 시간을 다시 계산
+                self._condition.notify()
+        return handle
+
+    def disarm(self, handle):
+        with self._condition:
+            self._active.pop(handle, None)
+            if len(self._heap) > 2 * len(self._active) + 64:
+                # 긴 예산(내보내기 등) 동안 해제된 항목이 쌓이지 않도록 힙을 다시 만듦
+                self._heap = [(deadline, handle) for handle, (deadline, _) in self._active.items()]
+                heapq.heapify(self._heap)
+
+    def _expired(self):
+        """기한이 지난 토큰이 생길 때까지 기다렸다가 반환합니다."""
+        with self._condition:
+            while True:
+                while self._heap and self._heap[0][1] not in self._active:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                now = time.monotonic()
+                if self._heap[0][0] > now:
+                    self._condition.wait(self._heap[0][0] - now)
+                    continue
+                expired = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, handle = heapq.heappop(self._heap)
+                    entry = self._active.pop(handle, None)
+                    if entry is not None:
+                        expired.append(entry[1])
+                if expired:
+                    return expired
+
+    def _run(self):
+        while True:
+            for token in self._expired():
+                try:
+                    self.on_expire(token)
+                except Exception as e:
+                    logger.warning(f"[{self.name}] 기한이 지난 쿼리 취소 실패: {e}")
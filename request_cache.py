@@ -0,0 +1,111 @@
+"""
+조회 결과 캐시와 요청 합치기 (웹 앱의 /api/search, /api/statistics)
+여러 대시보드가 같은 통계/검색을 거의 동시에 요청하면 요청마다 같은 쿼리가 실행됩니다.
+같은 키의 요청은 실행 중인 쿼리 하나의 결과를 함께 받고(single-flight), 결과는 짧은 TTL 동안 캐시합니다.
+
+- 키에는 호출하는 쪽이 정규화한 매개변수와 데이터 세대 번호(ITAssetManager.generation)를 넣습니다.
+  이 프로세스를 통한 변경은 세대 번호를 올리므로 바로 다른 키가 되고, 다른 프로세스의 변경은 TTL 안에 반영됩니다.
+- 오류는 캐시하지 않습니다. 먼저 실행한 요청이 retry_on의 예외(예: 그 클라이언트의 취소)로 실패하면
+  기다리던 요청 중 하나가 다시 실행하고, 그 밖의 오류(시간 초과 등)는 기다리던 요청 모두에 그대로 전달합니다.
+- 캐시한 결과는 요청 사이에 공유되므로 호출하는 쪽에서 고치지 않습니다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class RequestCache:
+    def __init__(self, ttl_seconds=5.0, max_entries=256, retry_on=()):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.retry_on = retry_on
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'hits': 0, 'coalesced': 0, 'misses': 0, 'errors': 0, 'evictions': 0}
+
+    def get_or_compute(self, key, compute):
+        """key의 결과를 반환합니다.
+
+        캐시에 있으면 그대로, 같은 key를 실행 중인 요청이 있으면 그 결과를 기다려 반환하고,
+        둘 다 아니면 compute()를 실행하여 결과를 캐시합니다.
+        """
+        with self._lock:
+            self._stats['requests'] += 1
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return entry[1]
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+
+            if leader:
+                return self._run(key, flight, compute)
+
+            flight.done.wait()
+            if flight.error is None:
+                with self._lock:
+                    self._stats['coalesced'] += 1
+                return flight.value
+            if not isinstance(flight.error, self.retry_on):
+                raise flight.error
+            # 먼저 실행한 요청만의 사정(취소)으로 실패했으므로 다시 시도
+
+    def _run(self, key, flight, compute):
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        else:
+            with self._lock:
+                self._stats['misses'] += 1
+                if self.ttl_seconds > 0:
+                    self._store(key, flight.value)
+            return flight.value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _store(self, key, value):
+        now = time.monotonic()
+        self._entries[key] = (now + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        # 만료된 항목을 먼저, 그래도 넘치면 가장 오래 쓰지 않은 항목부터 버림
+        for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[stale]
+            self._stats['evictions'] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """캐시 지표 (요청 수, 캐시 적중, 합쳐진 요청, 실행한 쿼리, 아낀 쿼리, 적중률)"""
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries), in_flight=len(self._flights))
+        stats['saved_queries'] = stats['hits'] + stats['coalesced']
+        stats['hit_rate'] = stats['saved_queries'] / stats['requests'] if stats['requests'] else 0.0
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
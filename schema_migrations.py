@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+버전 기반 스키마 마이그레이션
+migrations/ 디렉터리의 NNNN_설명.sql 파일을 번호 순서대로 한 번씩 적용하고
+schema_version 테이블에 기록합니다.
+
+애플리케이션 시작 시에는 schema_version을 한 번 조회하여 적용된 파일의 체크섬을 확인하는 것이 전부이며,
+적용할 마이그레이션이 있을 때만 advisory lock을 잡고 적용하므로
+여러 워커가 동시에 시작해도 안전합니다.
+이미 적용된 파일이 바뀌었으면 (체크섬 불일치) 시작과 migrate 모두 MigrationError로 중단합니다.
+
+사용법:
+    python schema_migrations.py status      # 현재 버전과 대기 중인 마이그레이션 표시
+    python schema_migrations.py migrate     # 대기 중인 마이그레이션 적용
+    python schema_migrations.py migrate --docker   # DC_config 설정 사용
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import sys
+from collections import namedtuple
+
+import psycopg2
+import psycopg2.errors
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+# pg_advisory_lock 키 - 동시에 시작하는 모든 워커가 같은 키로 직렬화됩니다
+MIGRATION_LOCK_KEY = 4_954_414_001
+
+_FILENAME_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+CREATE_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+Migration = namedtuple('Migration', ['version', 'name', 'path'])
+
+
+class MigrationError(Exception):
+    """스키마 버전이 맞지 않거나 마이그레이션 파일이 잘못된 경우 발생합니다."""
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """마이그레이션 목록을 버전 순서로 반환합니다 (파일 내용은 읽지 않음)."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = _FILENAME_PATTERN.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2),
+                                        os.path.join(directory, filename)))
+    migrations.sort()
+
+    versions = [m.version for m in migrations]
+    duplicates = sorted({v for v in versions if versions.count(v) > 1})
+    if duplicates:
+        raise MigrationError(f"중복된 마이그레이션 버전: {duplicates}")
+    return migrations
+
+
+def read_migration(migration):
+    """마이그레이션 SQL과 sha256 체크섬을 반환합니다."""
+    with open(migration.path, 'rb') as f:
+        content = f.read()
+    return content.decode('utf-8'), hashlib.sha256(content).hexdigest()
+
+
+class SchemaMigrator:
+    def __init__(self, connection, directory=MIGRATIONS_DIR):
+        self.connection = connection
+        self.migrations = load_migrations(directory)
+
+    @property
+    def latest_version(self):
+        return self.migrations[-1].version if self.migrations else 0
+
+    def current_version(self):
+        """적용된 최신 버전을 반환합니다. schema_version이 없으면 0입니다."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+            version = cursor.fetchone()[0]
+            if not self.connection.autocommit:
+                self.connection.rollback()
+            return version
+        except psycopg2.errors.UndefinedTable:
+            self.connection.rollback()
+            return 0
+        finally:
+            cursor.close()
+
+    def applied_checksums(self):
+        """적용된 버전별 체크섬을 반환합니다. schema_version이 없으면 빈 딕셔너리입니다."""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT version, checksum FROM schema_version")
+            applied = {version: checksum.strip() for version, checksum in cursor.fetchall()}
+            if not self.connection.autocommit:
+                self.connection.rollback()
+            return applied
+        except psycopg2.errors.UndefinedTable:
+            self.connection.rollback()
+            return {}
+        finally:
+            cursor.close()
+
+    def modified(self, applied):
+        """적용된 뒤에 내용이 바뀐 마이그레이션 목록을 반환합니다."""
+        return [
+            migration for migration in self.migrations
+            if migration.version in applied and read_migration(migration)[1] != applied[migration.version]
+        ]
+
+    def verify_checksums(self, applied=None):
+        """이미 적용된 마이그레이션 파일이 바뀌었으면 MigrationError를 발생시킵니다."""
+        if applied is None:
+            applied = self.applied_checksums()
+        modified = self.modified(applied)
+        if modified:
+            names = ', '.join(f"{m.version:04d}_{m.name}" for m in modified)
+            raise MigrationError(
+                f"이미 적용된 마이그레이션 파일이 바뀌었습니다: {names}. "
+                f"파일을 적용된 내용으로 되돌리고, 스키마 변경은 새 마이그레이션으로 추가하세요."
+            )
+
+    def pending(self, current=None):
+        """아직 적용되지 않은 마이그레이션 목록을 반환합니다."""
+        if current is None:
+            current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+
+    def ensure_schema(self, auto_migrate=True):
+        """시작 시 호출합니다. 최신이면 적용 기록 조회 한 번과 체크섬 확인으로 끝납니다."""
+        applied = self.applied_checksums()
+        self.verify_checksums(applied)
+        current = max(applied, default=0)
+        if current >= self.latest_version:
+            return current
+        if not auto_migrate:
+            raise MigrationError(
+                f"데이터베이스 스키마 버전 {current}이(가) 필요한 버전 {self.latest_version}보다 낮습니다. "
+                f"'python schema_migrations.py migrate'를 실행하세요."
+            )
+        return self.migrate()
+
+    def migrate(self):
+        """advisory lock을 잡고 대기 중인 마이그레이션을 하나씩 트랜잭션으로 적용합니다."""
+        autocommit = self.connection.autocommit
+        self.connection.autocommit = True
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            cursor.execute(CREATE_VERSION_TABLE)
+            self.connection.autocommit = False
+            self.verify_checksums()
+
+            # 다른 워커가 먼저 적용했을 수 있으므로 잠금을 잡은 뒤 다시 확인
+            for migration in self.pending():
+                sql, checksum = read_migration(migration)
+                logger.info(f"마이그레이션 적용 중: {migration.version:04d}_{migration.name}")
+                try:
+                    cursor.execute(sql)
+                    cursor.execute(
+                        "INSERT INTO schema_version (version, name, checksum) VALUES (%s, %s, %s)",
+                        (migration.version, migration.name, checksum)
+                    )
+                    self.connection.commit()
+                except psycopg2.Error as e:
+                    self.connection.rollback()
+                    raise MigrationError(
+                        f"마이그레이션 {migration.version:04d}_{migration.name} 적용 실패: {e}"
+                    ) from e
+
+            return self.current_version()
+        finally:
+            self.connection.rollback()
+            self.connection.autocommit = True
+            cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+            cursor.close()
+            self.connection.autocommit = autocommit
+
+    def status(self):
+        """적용 기록과 파일을 비교한 상태 목록을 반환합니다 (체크섬 불일치 포함)."""
+        applied = self.applied_checksums()
+        rows = []
+        for migration in self.migrations:
+            _, checksum = read_migration(migration)
+            if migration.version not in applied:
+                state = 'pending'
+            elif applied[migration.version] != checksum:
+                state = 'modified'
+            else:
+                state = 'applied'
+            rows.append((migration, state))
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IT 자산 관리 시스템 스키마 마이그레이션")
+    parser.add_argument('command', choices=['status', 'migrate'])
+    parser.add_argument('--docker', action='store_true', help="DC_config (Docker) 설정 사용")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.docker:
+        from DC_config import DB_CONFIG
+    else:
+        from PS_config import DB_CONFIG
+
+    connection = psycopg2.connect(**DB_CONFIG)
+    try:
+        migrator = SchemaMigrator(connection)
+        if args.command == 'migrate':
+            version = migrator.migrate()
+            print(f"✅ 스키마 버전: {version}")
+        else:
+            for migration, state in migrator.status():
+                print(f"{migration.version:04d}  {state:<9} {migration.name}")
+    except MigrationError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
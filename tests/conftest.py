@@ -0,0 +1,111 @@
+import csv
+import os
+import sys
+
+import pytest
+
+# 저장소 루트의 모듈(asset_export, request_cache 등)을 가져올 수 있도록 함
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeLoadDatabase:
+    """migration_checkpoints와 COPY 적재 경로만 흉내 내는 연결 (데이터베이스 없이 재개 동작을 확인)
+
+    커밋 전의 적재/체크포인트는 rollback()에서 버려집니다. fail_on_load번째 적재에서 오류를 내어 중단을 흉내 냅니다.
+    """
+
+    def __init__(self):
+        import migrate_excel_data
+
+        self.sql = migrate_excel_data
+        self.assets = []  # 커밋된 (유형, 모델)
+        self.checkpoints = {}  # (파일 해시, 시트) -> dict
+        self.fail_on_load = None
+        self.loads = 0
+        self.autocommit = False
+        self._pending_assets = []
+        self._pending_checkpoints = {}
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.assets.extend(self._pending_assets)
+        self.checkpoints.update(self._pending_checkpoints)
+        self.rollback()
+
+    def rollback(self):
+        self._pending_assets = []
+        self._pending_checkpoints = {}
+
+    def close(self):
+        pass
+
+    def checkpoint(self, key):
+        return self._pending_checkpoints.get(key) or self.checkpoints.get(key)
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = -1
+        self._result = []
+        self._copied = []
+
+    def execute(self, sql, params=None):
+        db = self.db
+        if sql == db.sql.SELECT_CHECKPOINTS:
+            self._result = [
+                (sheet, entry['rows_read'], entry['completed'])
+                for (file_hash, sheet), entry in db.checkpoints.items() if file_hash == params[0]
+            ]
+        elif sql == db.sql.DELETE_CHECKPOINTS:
+            for key in [key for key in db.checkpoints if key[0] == params[0]]:
+                del db.checkpoints[key]
+        elif sql == db.sql.UPSERT_CHECKPOINT:
+            file_hash, sheet, _, chunks, rows_read, loaded, skipped, completed = params
+            entry = dict(db.checkpoint((file_hash, sheet)) or {
+                'last_chunk': 0, 'rows_read': 0, 'rows_loaded': 0, 'rows_skipped': 0, 'completed': False,
+            })
+            entry['last_chunk'] += chunks
+            entry['rows_read'] += rows_read
+            entry['rows_loaded'] += loaded
+            entry['rows_skipped'] += skipped
+            entry['completed'] = entry['completed'] or completed
+            db._pending_checkpoints[(file_hash, sheet)] = entry
+        elif sql == db.sql.INSERT_LOAD_BATCH:
+            db.loads += 1
+            if db.fail_on_load == db.loads:
+                raise RuntimeError("적재 중단")
+            seen = set(db.assets) | set(db._pending_assets)
+            inserted = 0
+            for key in self._copied:
+                if key not in seen:
+                    seen.add(key)
+                    db._pending_assets.append(key)
+                    inserted += 1
+            self.rowcount = inserted
+        elif sql == "SELECT COUNT(*) FROM assets":
+            self._result = [(len(db.assets) + len(db._pending_assets),)]
+        elif sql == "TRUNCATE load_batch":
+            self._copied = []
+
+    def copy_expert(self, sql, buffer):
+        self._copied = [(row[0], row[1]) for row in csv.reader(buffer)]
+
+    def fetchall(self):
+        return self._result
+
+    def fetchone(self):
+        return self._result[0]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def load_db(monkeypatch):
+    from schema_migrations import SchemaMigrator
+
+    monkeypatch.setattr(SchemaMigrator, 'ensure_schema', lambda self, auto_migrate=True: None)
+    return FakeLoadDatabase()
@@ -0,0 +1,97 @@
+"""asset_export 작성기 단위 테스트 (데이터베이스 없이 행 배치를 직접 넘김)"""
+
+import csv
+import io
+from datetime import date
+
+import pytest
+
+from asset_export import EXPORT_COLUMNS, write_arrow, write_csv, write_parquet, write_xlsx
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def _row(asset_id, location, status='운영', purchase_date=date(2023, 5, 1)):
+    return {
+        "ID": asset_id, "Type": "HW", "Model": f"Model {asset_id}", "Purchase Date": purchase_date,
+        "Warranty": "3년", "Status": status, "Location": location, "Reason": "",
+    }
+
+
+def _read_arrow(data):
+    return pa.ipc.open_file(pa.BufferReader(data)).read_all()
+
+
+def _read_parquet(data):
+    return pq.read_table(io.BytesIO(data))
+
+
+READERS = [(write_arrow, _read_arrow), (write_parquet, _read_parquet)]
+
+
+@pytest.mark.parametrize('writer, reader', READERS)
+def test_batches_with_different_categories(writer, reader):
+    batches = [[_row(1, 'A')], [_row(2, 'B', status='대기')], [_row(3, 'A', purchase_date=None)]]
+    sink = io.BytesIO()
+
+    assert writer(batches, sink) == 3
+
+    table = reader(sink.getvalue())
+    assert table.column('Location').to_pylist() == ['A', 'B', 'A']
+    assert table.column('Status').to_pylist() == ['운영', '대기', '운영']
+    assert table.column('Purchase Date').to_pylist() == [date(2023, 5, 1), date(2023, 5, 1), None]
+
+
+@pytest.mark.parametrize('writer, reader', READERS)
+def test_more_categories_than_int8(writer, reader):
+    locations = [f'위치 {n}' for n in range(200)]
+    batches = [[_row(n, location) for n, location in enumerate(locations[start:start + 50], start)]
+               for start in range(0, len(locations), 50)]
+    sink = io.BytesIO()
+
+    assert writer(batches, sink) == 200
+    assert reader(sink.getvalue()).column('Location').to_pylist() == locations
+
+
+@pytest.mark.parametrize('writer, reader', READERS)
+def test_labels_seed_dictionary(writer, reader):
+    labels = {"Type": ("HW", "SW"), "Status": ("운영", "대기"), "Location": ("본사",)}
+    sink = io.BytesIO()
+
+    writer([[_row(1, '지사')], [_row(2, '본사')]], sink, labels=labels)
+
+    column = reader(sink.getvalue()).column('Location')
+    assert column.to_pylist() == ['지사', '본사']
+    # 레이블은 정의 순서대로 사전 앞쪽을 차지함
+    assert column.chunk(0).dictionary.to_pylist()[0] == '본사'
+
+
+def test_empty_export_keeps_schema():
+    sink = io.BytesIO()
+
+    assert write_arrow([], sink) == 0
+    assert _read_arrow(sink.getvalue()).column_names == EXPORT_COLUMNS
+
+
+def test_csv_writes_header_and_rows():
+    sink = io.BytesIO()
+
+    assert write_csv([[_row(1, 'A')], [_row(2, 'B')]], sink) == 2
+
+    rows = list(csv.reader(io.StringIO(sink.getvalue().decode('utf-8-sig'))))
+    assert rows[0] == EXPORT_COLUMNS
+    assert [row[6] for row in rows[1:]] == ['A', 'B']
+
+
+def test_xlsx_writes_rows_across_batches():
+    openpyxl = pytest.importorskip('openpyxl')
+    sink = io.BytesIO()
+
+    assert write_xlsx([[_row(1, 'A')], [_row(2, 'B', purchase_date=None)]], sink) == 2
+
+    sheet = openpyxl.load_workbook(io.BytesIO(sink.getvalue())).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert [row[6] for row in rows[1:]] == ['A', 'B']
+    assert rows[2][3] is None
@@ -0,0 +1,97 @@
+"""asset_importer 체크포인트 재개/완료 기록 테스트 (데이터베이스 없이 conftest의 FakeLoadDatabase 사용)"""
+
+import pandas as pd
+import pytest
+
+from asset_importer import AssetImporter, iter_batches
+from migrate_excel_data import ExcelToPostgreSQLMigrator, file_sha256
+from test_migration_resume import ROWS, _workbook
+
+MODELS = [f'model-{i:02d}' for i in range(1, ROWS + 1)]
+
+
+def _csv(path):
+    pd.DataFrame({
+        'asset_type': ['HW'] * ROWS, 'model': MODELS, 'status': ['운영'] * ROWS, 'location': ['IDC'] * ROWS,
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def _importer(load_db, batch_size, **kwargs):
+    importer = AssetImporter(batch_size=batch_size, **kwargs)
+    importer.connection = load_db
+    return importer
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _interrupt_after(batches):
+    def progress(result):
+        if result['batches'] == batches:
+            raise _Interrupted()
+    return progress
+
+
+def test_csv_skip_is_a_row_offset(tmp_path):
+    path = _csv(tmp_path / 'assets.csv')
+
+    batches = list(iter_batches(path, 7, skip={'csv': 10}))
+
+    assert [batch.rows_read for batch in batches] == [4, 7, 2]
+    assert [model for batch in batches for model in batch.frame['Model']] == MODELS[10:]
+    # 행 번호는 원본 파일의 줄 번호 그대로 (1행은 헤더)
+    assert batches[0].frame.index[0] == 12
+
+
+def test_csv_resume_with_different_batch_size(tmp_path, load_db):
+    path = _csv(tmp_path / 'assets.csv')
+    with pytest.raises(_Interrupted):
+        _importer(load_db, 4).import_file(path, progress=_interrupt_after(2))
+
+    result = _importer(load_db, 10).import_file(path)
+
+    assert result['resumed_from'] == 8
+    assert result['rows_read'] == ROWS - 8
+    assert sorted(model for _, model in load_db.assets) == MODELS
+    checkpoint = load_db.checkpoint((file_sha256(path), 'csv'))
+    assert (checkpoint['rows_read'], checkpoint['rows_skipped'], checkpoint['completed']) == (ROWS, 0, True)
+
+
+def test_finished_file_is_skipped(tmp_path, load_db):
+    path = _csv(tmp_path / 'assets.csv')
+    _importer(load_db, 10).import_file(path)
+
+    result = _importer(load_db, 10).import_file(path)
+
+    assert result['already_imported'] == ['csv']
+    assert result['batches'] == 0
+
+
+def test_no_resume_resets_the_checkpoint(tmp_path, load_db):
+    path = _csv(tmp_path / 'assets.csv')
+    _importer(load_db, 10).import_file(path)
+
+    result = _importer(load_db, 10, resume=False).import_file(path)
+
+    assert result['rows_read'] == ROWS
+    assert result['skipped'] == ROWS
+    assert load_db.checkpoint((file_sha256(path), 'csv'))['rows_read'] == ROWS
+
+
+def test_xlsx_resumes_a_streaming_migration_run(tmp_path, load_db):
+    path = _workbook(tmp_path / 'assets.xlsx')
+    load_db.fail_on_load = 3
+    migrator = ExcelToPostgreSQLMigrator(path, None)
+    migrator.connection = load_db
+    assert migrator.migrate_streaming(batch_size=5) is None
+    load_db.fail_on_load = None
+
+    result = _importer(load_db, 50000).import_file(path)
+
+    assert result['resumed_from'] == 10
+    assert result['rows_read'] == ROWS - 10
+    assert result['skipped'] == 0
+    assert sorted(model for _, model in load_db.assets) == MODELS
+    assert load_db.checkpoint((file_sha256(path), 'Assets'))['completed'] is True
@@ -0,0 +1,96 @@
+"""asset_transform.transform_frame 단위 테스트"""
+
+from datetime import datetime
+
+import pandas as pd
+
+from asset_transform import (
+    INVALID_DATE, INVALID_STATUS, MISSING_LOCATION, MISSING_MODEL, MISSING_TYPE, MODEL_TOO_LONG, OUTPUT_COLUMNS,
+    map_source_columns, transform_frame
+)
+
+
+def _frame(**overrides):
+    row = {
+        'Type': 'HW', 'Model': 'OptiPlex 7090', 'Purchase Date': '2023-05-01', 'Warranty': '3',
+        'Status': '운영', 'Location': '본사 서버실', 'Reason': '',
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def test_valid_row_keeps_output_columns():
+    result = transform_frame(_frame())
+
+    assert list(result.valid.columns) == OUTPUT_COLUMNS
+    assert len(result.rejects) == 0
+    row = result.valid.iloc[0]
+    assert row['Purchase Date'] == datetime(2023, 5, 1)
+    assert row['Warranty'] == '3년'
+
+
+def test_aliases_map_to_canonical_values():
+    df = pd.DataFrame({
+        'Type': ['hardware', ' 소프트웨어 ', 'N/W'],
+        'Model': ['a', 'b', 'c'],
+        'Status': ['In Use', 'spare', '불용'],
+        'Location': ['IDC', '개인 지급', 'misc'],
+    })
+
+    valid = transform_frame(df).valid
+
+    assert valid['Type'].tolist() == ['HW', 'SW', 'NW']
+    assert valid['Status'].tolist() == ['운영', '유휴', '폐기']
+    assert valid['Location'].tolist() == ['본사 서버실', '개인지급', '기타']
+
+
+def test_dates_and_warranty_formats():
+    df = pd.concat([
+        _frame(**{'Purchase Date': '2024.01.15', 'Warranty': '36개월'}),
+        _frame(**{'Purchase Date': 45000, 'Warranty': '18 months'}),
+        _frame(**{'Purchase Date': None, 'Warranty': '2 years'}),
+    ], ignore_index=True)
+
+    valid = transform_frame(df).valid
+
+    assert valid['Purchase Date'].iloc[0] == datetime(2024, 1, 15)
+    # 엑셀 일련번호 45000 = 2023-03-15
+    assert valid['Purchase Date'].iloc[1] == datetime(2023, 3, 15)
+    assert pd.isna(valid['Purchase Date'].iloc[2])
+    assert valid['Warranty'].tolist() == ['3년', '18개월', '2년']
+
+
+def test_rejects_carry_reason_codes_and_original_index():
+    df = pd.concat([
+        _frame(),
+        _frame(Type=None, Model='  '),
+        _frame(Status='unknown', **{'Purchase Date': 'not a date'}),
+        _frame(Location=None, Model='x' * 300),
+    ], ignore_index=True)
+
+    result = transform_frame(df)
+
+    assert result.valid.index.tolist() == [0]
+    assert result.rejects.index.tolist() == [1, 2, 3]
+    assert result.rejects['reason_code'].tolist() == [
+        f'{MISSING_TYPE};{MISSING_MODEL}',
+        f'{INVALID_DATE};{INVALID_STATUS}',
+        f'{MODEL_TOO_LONG};{MISSING_LOCATION}',
+    ]
+    # 거부 행은 원본 값을 그대로 유지
+    assert result.rejects.loc[2, 'Status'] == 'unknown'
+
+
+def test_missing_columns_are_rejected_not_raised():
+    result = transform_frame(pd.DataFrame({'Model': ['a']}))
+
+    assert len(result.valid) == 0
+    assert result.rejects['reason_code'].iloc[0].startswith(MISSING_TYPE)
+
+
+def test_map_source_columns_accepts_database_and_korean_names():
+    mapping = map_source_columns(['asset_type', '모델명', 'purchase date', 'STATUS', 'unknown', 'type'])
+
+    assert mapping == {
+        'asset_type': 'Type', '모델명': 'Model', 'purchase date': 'Purchase Date', 'STATUS': 'Status',
+    }
@@ -0,0 +1,75 @@
+"""migrate_excel_data 스트리밍 마이그레이션의 체크포인트 재개 테스트 (데이터베이스 없이 conftest의 FakeLoadDatabase 사용)"""
+
+import openpyxl
+
+from migrate_excel_data import EXPECTED_COLUMNS, ExcelToPostgreSQLMigrator, file_sha256
+
+ROWS = 23
+
+
+def _workbook(path, rows=ROWS):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = 'Assets'
+    sheet.append(EXPECTED_COLUMNS)
+    for i in range(1, rows + 1):
+        sheet.append([i, 'HW', f'model-{i:02d}', '2023-05-01', '3', '운영', '본사 서버실', ''])
+        if i == 8:
+            # 빈 행은 읽은 행 수에 포함되지 않음
+            sheet.append([None] * len(EXPECTED_COLUMNS))
+    workbook.save(path)
+    return str(path)
+
+
+def _models(batches):
+    return [model for batch in batches for model in batch.frame['Model']]
+
+
+def test_skip_counts_rows_not_batches(tmp_path):
+    path = _workbook(tmp_path / 'assets.xlsx')
+    parser = ExcelToPostgreSQLMigrator(path, None)
+
+    first = list(parser.iter_excel_batches(5))[:2]
+    done = sum(batch.rows_read for batch in first)
+    rest = list(parser.iter_excel_batches(7, skip={'Assets': done}))
+
+    assert [batch.rows_read for batch in rest] == [7, 6]
+    assert _models(first) + _models(rest) == [f'model-{i:02d}' for i in range(1, ROWS + 1)]
+    # 행 번호는 빈 행을 건너뛰어도 엑셀 행 번호 그대로
+    assert rest[0].frame.index[0] == 13
+
+
+def test_resume_with_different_batch_size_loads_every_row_once(tmp_path, load_db):
+    path = _workbook(tmp_path / 'assets.xlsx')
+    key = (file_sha256(path), 'Assets')
+
+    load_db.fail_on_load = 3
+    migrator = ExcelToPostgreSQLMigrator(path, None)
+    migrator.connection = load_db
+    assert migrator.migrate_streaming(batch_size=5) is None
+    assert load_db.checkpoint(key)['rows_read'] == 10
+
+    load_db.fail_on_load = None
+    migrator = ExcelToPostgreSQLMigrator(path, None)
+    migrator.connection = load_db
+    summary = migrator.migrate_streaming(batch_size=7)
+
+    assert summary['incomplete'] == []
+    assert summary['sheets'][0]['resumed_from'] == 10
+    assert summary['rows_read'] == ROWS - 10
+    assert sorted(model for _, model in load_db.assets) == [f'model-{i:02d}' for i in range(1, ROWS + 1)]
+    checkpoint = load_db.checkpoint(key)
+    assert checkpoint['rows_read'] == ROWS
+    assert checkpoint['rows_skipped'] == 0
+    assert checkpoint['completed'] is True
+
+
+def test_completed_sheet_is_not_read_again(tmp_path, load_db):
+    path = _workbook(tmp_path / 'assets.xlsx')
+    for batch_size in (5, 4):
+        migrator = ExcelToPostgreSQLMigrator(path, None)
+        migrator.connection = load_db
+        summary = migrator.migrate_streaming(batch_size=batch_size)
+
+    assert summary['rows_read'] == 0
+    assert len(load_db.assets) == ROWS
@@ -0,0 +1,84 @@
+"""query_watchdog.QueryWatchdog 단위 테스트"""
+
+import threading
+import time
+
+from query_watchdog import QueryWatchdog
+
+
+def _recorder():
+    fired = []
+    event = threading.Event()
+
+    def on_expire(token):
+        fired.append(token)
+        event.set()
+
+    return fired, event, on_expire
+
+
+def test_expired_token_is_reported_once():
+    fired, event, on_expire = _recorder()
+    watchdog = QueryWatchdog(on_expire)
+
+    watchdog.arm('slow', 0.05)
+
+    assert event.wait(2)
+    time.sleep(0.05)
+    assert fired == ['slow']
+
+
+def test_disarmed_token_never_fires():
+    fired, event, on_expire = _recorder()
+    watchdog = QueryWatchdog(on_expire)
+
+    watchdog.disarm(watchdog.arm('fast', 0.05))
+    watchdog.arm('marker', 0.1)
+
+    assert event.wait(2)
+    assert fired == ['marker']
+
+
+def test_earlier_deadline_wakes_waiting_thread():
+    fired, event, on_expire = _recorder()
+    watchdog = QueryWatchdog(on_expire)
+
+    watchdog.arm('late', 60)
+    started = time.monotonic()
+    watchdog.arm('early', 0.05)
+
+    assert event.wait(2)
+    assert fired == ['early']
+    assert time.monotonic() - started < 1
+
+
+def test_one_thread_for_many_queries():
+    fired, _, on_expire = _recorder()
+    watchdog = QueryWatchdog(on_expire)
+    before = threading.active_count()
+
+    for n in range(1000):
+        watchdog.disarm(watchdog.arm(n, 30))
+
+    assert threading.active_count() <= before + 1
+    # 해제된 항목은 힙을 다시 만들 때 버려짐
+    assert len(watchdog._heap) <= 64
+    assert fired == []
+
+
+def test_callback_error_does_not_stop_watchdog():
+    fired = []
+    event = threading.Event()
+
+    def on_expire(token):
+        if token == 'broken':
+            raise RuntimeError('cancel failed')
+        fired.append(token)
+        event.set()
+
+    watchdog = QueryWatchdog(on_expire)
+    watchdog.arm('broken', 0.01)
+    watchdog.arm('next', 0.05)
+
+    assert event.wait(2)
+    assert fired == ['next']
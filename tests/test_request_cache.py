@@ -0,0 +1,136 @@
+"""request_cache.RequestCache 단위 테스트"""
+
+import threading
+import time
+
+import pytest
+
+from request_cache import RequestCache
+
+
+class Cancelled(Exception):
+    pass
+
+
+class TimedOut(Exception):
+    pass
+
+
+def _concurrently(count, func):
+    results = []
+    lock = threading.Lock()
+
+    def run():
+        try:
+            value = func()
+        except Exception as e:
+            value = e
+        with lock:
+            results.append(value)
+
+    threads = [threading.Thread(target=run) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def _slow(calls, value='result', error=None, delay=0.2):
+    def compute():
+        calls.append(1)
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return value
+    return compute
+
+
+def test_concurrent_requests_share_one_query():
+    cache = RequestCache(ttl_seconds=5)
+    calls = []
+
+    results = _concurrently(10, lambda: cache.get_or_compute('k', _slow(calls)))
+
+    assert results == ['result'] * 10
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['coalesced'] == 9
+    assert stats['saved_queries'] == 9
+
+
+def test_cached_result_until_ttl_expires():
+    cache = RequestCache(ttl_seconds=0.1)
+    calls = []
+
+    cache.get_or_compute('k', _slow(calls, delay=0))
+    cache.get_or_compute('k', _slow(calls, delay=0))
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+
+    time.sleep(0.15)
+    cache.get_or_compute('k', _slow(calls, delay=0))
+    assert len(calls) == 2
+
+
+def test_zero_ttl_only_coalesces():
+    cache = RequestCache(ttl_seconds=0)
+    calls = []
+
+    _concurrently(5, lambda: cache.get_or_compute('k', _slow(calls)))
+    cache.get_or_compute('k', _slow(calls, delay=0))
+
+    assert len(calls) == 2
+    assert cache.stats()['entries'] == 0
+
+
+def test_different_keys_do_not_share():
+    cache = RequestCache()
+
+    assert cache.get_or_compute(('search', 1), lambda: 'a') == 'a'
+    assert cache.get_or_compute(('search', 2), lambda: 'b') == 'b'
+
+
+def test_timeout_goes_to_all_waiters_without_rerun():
+    cache = RequestCache(retry_on=(Cancelled,))
+    calls = []
+
+    results = _concurrently(5, lambda: cache.get_or_compute('k', _slow(calls, error=TimedOut())))
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(isinstance(result, TimedOut) for result in results)
+    # 오류는 캐시하지 않음
+    assert cache.get_or_compute('k', lambda: 'ok') == 'ok'
+
+
+def test_cancelled_leader_is_retried_by_a_waiter():
+    cache = RequestCache(retry_on=(Cancelled,))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        if len(calls) == 1:
+            raise Cancelled()
+        return 'result'
+
+    results = _concurrently(4, lambda: cache.get_or_compute('k', compute))
+
+    assert len(calls) == 2
+    assert sum(isinstance(result, Cancelled) for result in results) == 1
+    assert results.count('result') == 3
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RequestCache(ttl_seconds=60, max_entries=2)
+
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    cache.get_or_compute('a', lambda: pytest.fail('a should be cached'))
+    cache.get_or_compute('c', lambda: 3)
+
+    assert cache.get_or_compute('a', lambda: 'recomputed') == 1
+    assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+    assert cache.stats()['evictions'] >= 1
@@ -0,0 +1,69 @@
+"""schema_migrations 파일 목록/체크섬 검증 단위 테스트 (데이터베이스 없이 적용 기록을 직접 넘김)"""
+
+import hashlib
+
+import pytest
+
+from schema_migrations import MigrationError, SchemaMigrator, load_migrations
+
+
+def _write(directory, filename, sql):
+    path = directory / filename
+    path.write_text(sql, encoding='utf-8')
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    _write(tmp_path, '0001_initial.sql', 'CREATE TABLE a (id INTEGER);\n')
+    _write(tmp_path, '0002_add_b.sql', 'CREATE TABLE b (id INTEGER);\n')
+    (tmp_path / 'README.txt').write_text('무시되는 파일')
+    return tmp_path
+
+
+def test_load_migrations_in_version_order(migrations_dir):
+    _write(migrations_dir, '0010_later.sql', 'SELECT 1;\n')
+
+    assert [(m.version, m.name) for m in load_migrations(str(migrations_dir))] == [
+        (1, 'initial'), (2, 'add_b'), (10, 'later'),
+    ]
+
+
+def test_duplicate_versions_are_rejected(migrations_dir):
+    _write(migrations_dir, '0002_other.sql', 'SELECT 1;\n')
+
+    with pytest.raises(MigrationError):
+        load_migrations(str(migrations_dir))
+
+
+def test_unchanged_applied_files_pass(migrations_dir):
+    migrator = SchemaMigrator(None, str(migrations_dir))
+    applied = {1: hashlib.sha256(b'CREATE TABLE a (id INTEGER);\n').hexdigest()}
+
+    migrator.verify_checksums(applied)
+    assert migrator.modified(applied) == []
+
+
+def test_edited_applied_file_is_rejected(migrations_dir):
+    migrator = SchemaMigrator(None, str(migrations_dir))
+    applied = {
+        1: hashlib.sha256(b'CREATE TABLE a (id INTEGER);\n').hexdigest(),
+        2: hashlib.sha256(b'CREATE TABLE b (id BIGINT);\n').hexdigest(),
+    }
+
+    with pytest.raises(MigrationError, match='0002_add_b'):
+        migrator.verify_checksums(applied)
+
+
+def test_pending_files_are_not_checked(migrations_dir):
+    migrator = SchemaMigrator(None, str(migrations_dir))
+
+    # 아직 적용되지 않은 0002는 자유롭게 고칠 수 있음
+    migrator.verify_checksums({1: hashlib.sha256(b'CREATE TABLE a (id INTEGER);\n').hexdigest()})
+    migrator.verify_checksums({})
+
+
+def test_repository_migrations_load():
+    migrations = load_migrations()
+
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
@@ -0,0 +1,94 @@
+"""migrate_excel_data 증분 동기화 비교(CREATE_SYNC_DIFF)와 보고서 테스트
+
+PostgreSQL 없이 SQLite에서 같은 비교 쿼리를 실행합니다. 타입 변환(::text)과 ON COMMIT DROP만 지우고,
+asset_row_fingerprint는 같은 규칙의 파이썬 함수로 등록합니다.
+"""
+
+import hashlib
+import sqlite3
+
+import pytest
+
+from migrate_excel_data import CREATE_SYNC_DIFF, sync_report
+
+COLUMNS = ('asset_type', 'model', 'purchase_date', 'warranty', 'status', 'location', 'reason')
+
+
+def _fingerprint(asset_type, model, purchase_date, warranty, status, location, reason):
+    values = (asset_type, model, purchase_date or '', warranty or '', status, location, reason or '')
+    return hashlib.md5(chr(31).join(values).encode('utf-8')).hexdigest()
+
+
+def _row(model, status='운영', asset_type='HW'):
+    return (asset_type, model, '2023-05-01', '3년', status, '본사 서버실', '')
+
+
+@pytest.fixture
+def db():
+    connection = sqlite3.connect(':memory:')
+    connection.create_function('asset_row_fingerprint', 7, _fingerprint)
+    connection.execute(f"CREATE TABLE sync_source (seq INTEGER PRIMARY KEY, {', '.join(COLUMNS)})")
+    for table in ('assets', 'assets_archive'):
+        connection.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, {', '.join(COLUMNS)}, row_fingerprint)")
+    yield connection
+    connection.close()
+
+
+def _insert(db, table, asset_id, row):
+    db.execute(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", (asset_id, *row, _fingerprint(*row)))
+
+
+def _diff(db, source):
+    db.execute("DELETE FROM sync_source")
+    db.execute("DROP TABLE IF EXISTS sync_diff")
+    db.executemany(f"INSERT INTO sync_source ({', '.join(COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)", source)
+    db.execute(CREATE_SYNC_DIFF.replace('::text', '').replace(' ON COMMIT DROP', ''))
+    changes = db.execute("SELECT change, asset_id, model FROM sync_diff ORDER BY model").fetchall()
+    counts = dict(db.execute("SELECT change, COUNT(*) FROM sync_diff GROUP BY change").fetchall())
+    return changes, counts
+
+
+def test_archived_rows_are_neither_updated_nor_deleted(db):
+    _insert(db, 'assets', 1, _row('kept'))
+    _insert(db, 'assets', 2, _row('edited'))
+    _insert(db, 'assets', 3, _row('removed'))
+    _insert(db, 'assets_archive', 10, _row('archived-same', '폐기'))
+    _insert(db, 'assets_archive', 11, _row('archived-differs', '폐기'))
+    _insert(db, 'assets_archive', 12, _row('archived-missing', '폐기'))
+    source = [
+        _row('kept'), _row('edited', '유휴'), _row('new'),
+        _row('archived-same', '폐기'), _row('archived-differs', '운영'),
+    ]
+
+    changes, counts = _diff(db, source)
+
+    assert changes == [
+        ('archived', 11, 'archived-differs'),
+        ('archived', 10, 'archived-same'),
+        ('update', 2, 'edited'),
+        ('insert', None, 'new'),
+        ('delete', 3, 'removed'),
+    ]
+    # 수정/삭제 대상은 모두 assets의 행이므로 보고서 건수와 반영 쿼리가 바꾸는 건수가 같음
+    live = {row[0] for row in db.execute("SELECT id FROM assets")}
+    assert all(asset_id in live for change, asset_id, _ in changes if change in ('update', 'delete'))
+
+    report = sync_report(counts, len(source), 0, delete_missing=True, dry_run=True)
+    assert (report['insert'], report['update'], report['delete'], report['archived']) == (1, 1, 1, 2)
+    assert report['missing_in_source'] == 1
+    assert report['unchanged'] == 1
+
+
+def test_rerun_on_unchanged_workbook_reports_no_changes(db):
+    _insert(db, 'assets', 1, _row('kept'))
+    _insert(db, 'assets_archive', 10, _row('archived-differs', '폐기'))
+    _insert(db, 'assets_archive', 11, _row('archived-missing', '폐기'))
+    source = [_row('kept'), _row('archived-differs', '운영')]
+
+    for _ in range(2):
+        _, counts = _diff(db, source)
+        report = sync_report(counts, len(source), 0, delete_missing=True, dry_run=False)
+
+        assert (report['insert'], report['update'], report['delete'], report['missing_in_source']) == (0, 0, 0, 0)
+        assert report['archived'] == 1
+        assert report['unchanged'] == 1
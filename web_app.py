@@ -4,11 +4,31 @@ IT 자산 관리 시스템 - 웹 버전
 Flask를 사용하여 웹 브라우저에서 접근 가능한 자산 관리 시스템
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash
-from DC_asset_manager import ITAssetManager
+from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_file
+from psycopg2.extensions import QueryCanceledError
+from DC_asset_manager import FACETS, PAGE_SIZE, ConflictError, ITAssetManager
+from DC_database import RequestCancelledError
+from DC_config import (
+    ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE, DB_CONFIG, DB_CONNECT_TIMEOUT, JOB_DIR, JOB_QUEUE_LIMIT,
+    JOB_RETENTION_HOURS, JOB_WORKERS, REQUEST_CACHE_MAX_ENTRIES, REQUEST_CACHE_TTL_SECONDS, SUGGEST_LIMIT,
+    SUGGEST_REFRESH_SECONDS
+)
+from asset_attributes import parse_attribute_filters, schema_as_dict
+from asset_audit import AssetAuditor, read_tag_file
+from asset_export import FORMATS as EXPORT_FORMATS, export_assets
+from background_jobs import JobManager, JobQueueFullError, validate_export_format, validate_import_filename
+from circuit_breaker import CircuitOpenError
+from model_suggest import ModelSuggester
+from request_cache import RequestCache
+from contextlib import contextmanager
 import logging
 from datetime import datetime
 import json
+import selectors
+import socket
+import tempfile
+import threading
+import time
 
 # Flask 앱 초기화
 app = Flask(__name__)
@@ -19,39 +39,284 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 자산 매니저 초기화
+# 데이터베이스 연결은 백그라운드에서 워밍업하므로 포트 바인딩을 막지 않습니다.
 try:
     asset_manager = ITAssetManager()
+    asset_manager.db.start_warmup()
     logger.info("자산 매니저가 성공적으로 초기화되었습니다")
 except Exception as e:
     logger.error(f"자산 매니저 초기화 실패: {e}")
     asset_manager = None
 
+# 백그라운드 작업 (가져오기/내보내기)
+# 중단된 작업의 복구는 첫 요청 때 시작하므로, 디버그 리로더의 감시 프로세스에서는 실행되지 않습니다.
+job_manager = None
+if asset_manager:
+    job_manager = JobManager(
+        asset_manager,
+        dict(DB_CONFIG, connect_timeout=DB_CONNECT_TIMEOUT),
+        JOB_DIR,
+        workers=JOB_WORKERS,
+        queue_limit=JOB_QUEUE_LIMIT,
+        retention_hours=JOB_RETENTION_HOURS,
+    )
+
+# 실사 대조 (스캔 목록을 전용 연결로 COPY 적재)
+auditor = AssetAuditor(asset_manager, dict(DB_CONFIG, connect_timeout=DB_CONNECT_TIMEOUT)) if asset_manager else None
+
+# 모델명 자동 완성 (메모리 트라이, 데이터 세대가 바뀌면 다시 만듦)
+suggester = ModelSuggester(asset_manager, SUGGEST_LIMIT, SUGGEST_REFRESH_SECONDS) if asset_manager else None
+
+# 검색/통계 결과 캐시 (같은 요청은 쿼리 하나를 공유, 키에 데이터 세대 번호 포함)
+# 먼저 실행한 요청이 그 클라이언트의 사정으로 취소되면(연결 끊김, 새 검색) 기다리던 요청이 다시 실행하고,
+# statement_timeout 초과는 같은 쿼리를 다시 실행해도 마찬가지이므로 기다리던 요청에도 그대로 전달합니다.
+request_cache = RequestCache(REQUEST_CACHE_TTL_SECONDS, REQUEST_CACHE_MAX_ENTRIES, retry_on=(RequestCancelledError,))
+
+# 클라이언트 연결 종료를 확인하는 주기 (초)
+DISCONNECT_POLL_SECONDS = 0.25
+
+# 연결 끊김 감시 요청 (감시 여부, 소켓, 취소 토큰) - 하나의 감시 스레드가 차례로 반영
+_disconnect_changes = []
+_disconnect_lock = threading.Lock()
+_disconnect_thread = None
+
+# 클라이언트(브라우저 탭)별 진행 중인 검색의 취소 토큰
+_latest_searches = {}
+_latest_searches_lock = threading.Lock()
+
+def _error_response(e):
+    """예외를 JSON 오류 응답으로 변환 (400: 잘못된 입력, 409: 버전 충돌, 503: DB 비정상, 504: 시간 초과/취소, 그 외 500)"""
+    if isinstance(e, CircuitOpenError):
+        response = jsonify({'error': str(e)})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    if isinstance(e, QueryCanceledError):
+        return jsonify({'error': '요청 처리 시간이 초과되었거나 취소되었습니다.'}), 504
+    if isinstance(e, ConflictError):
+        response = jsonify({'error': str(e), 'current_version': e.current_version})
+        response.status_code = 409
+        if e.current_version is not None:
+            response.set_etag(str(e.current_version))
+        return response
+    if isinstance(e, ValueError):
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'error': str(e)}), 500
+
+def _expected_version():
+    """If-Match 헤더의 ETag(자산 버전)를 정수로 반환합니다. 헤더가 없으면 None입니다."""
+    header = request.headers.get('If-Match')
+    if not header or header.strip() == '*':
+        return None
+    value = header.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise ValueError(f"If-Match 헤더가 올바르지 않습니다: {header}") from None
+
+def _include_archived():
+    """include_archived=1이면 보관된 폐기 자산도 조회 대상에 포함"""
+    return request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+def _facet_filters():
+    """패싯 필터 (asset_type, status, location, purchase_year), purchase_year=none은 구매일이 없는 자산"""
+    filters = {}
+    for facet in FACETS:
+        value = request.args.get(facet)
+        if value:
+            filters[facet] = None if facet == 'purchase_year' and value == 'none' else value
+    return filters
+
+def _watch_disconnects():
+    """진행 중인 요청들의 소켓을 한 스레드에서 감시하다가 클라이언트가 끊으면 그 요청의 쿼리를 취소합니다.
+    
+    요청마다 감시 스레드를 만들지 않도록, 등록/해제는 _disconnect_changes에 쌓아 두고 이 스레드만 selector를 고칩니다.
+    """
+    selector = selectors.DefaultSelector()
+    while True:
+        with _disconnect_lock:
+            changes = _disconnect_changes[:]
+            del _disconnect_changes[:]
+        for watch, sock, token in changes:
+            try:
+                if not watch:
+                    selector.unregister(sock)
+                elif sock in selector.get_map():
+                    selector.modify(sock, selectors.EVENT_READ, token)
+                else:
+                    selector.register(sock, selectors.EVENT_READ, token)
+            except (KeyError, OSError, ValueError):
+                # 이미 감시를 멈췄거나 닫힌 소켓
+                pass
+        
+        if not selector.get_map():
+            time.sleep(DISCONNECT_POLL_SECONDS)
+            continue
+        try:
+            events = selector.select(DISCONNECT_POLL_SECONDS)
+        except (OSError, ValueError):
+            # 해제 요청이 반영되기 전에 닫힌 소켓이 있음 (select 기반 selector)
+            for key in list(selector.get_map().values()):
+                if key.fileobj.fileno() == -1:
+                    selector.unregister(key.fileobj)
+            continue
+        for key, _ in events:
+            sock, token = key.fileobj, key.data
+            try:
+                if sock.recv(1, socket.MSG_PEEK) == b'':
+                    logger.info("클라이언트 연결이 끊겨 진행 중인 쿼리를 취소합니다")
+                    asset_manager.db.cancel_query(token)
+                # 데이터가 있으면 다음 요청이 도착한 것(keep-alive)이므로 연결은 살아 있음
+            except (OSError, ValueError):
+                pass
+            # 어느 경우든 이 요청은 더 감시할 필요가 없음 (계속 읽을 수 있는 상태라 다시 select하면 바로 깨어남)
+            try:
+                selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+
+def _change_disconnect_watch(watch, sock, token):
+    global _disconnect_thread
+    with _disconnect_lock:
+        _disconnect_changes.append((watch, sock, token))
+        if _disconnect_thread is None:
+            _disconnect_thread = threading.Thread(target=_watch_disconnects, name='disconnect-watch', daemon=True)
+            _disconnect_thread.start()
+
+@contextmanager
+def cancel_on_disconnect(operation=None):
+    """operation의 statement_timeout 예산으로 쿼리를 실행하고, 클라이언트가 끊으면 취소합니다."""
+    with asset_manager.db.request_scope(operation=operation) as token:
+        sock = request.environ.get('werkzeug.socket') or request.environ.get('gunicorn.socket')
+        if sock is None:
+            yield token
+            return
+        
+        _change_disconnect_watch(True, sock, token)
+        try:
+            yield token
+        finally:
+            _change_disconnect_watch(False, sock, token)
+
+def _cache_key(name, *params):
+    """조회 캐시 키 (정규화한 매개변수와 현재 데이터 세대 번호)"""
+    return (name, asset_manager.generation) + params
+
+@contextmanager
+def latest_search_wins(token):
+    """같은 client의 새 검색이 오면 아직 실행 중인 이전 검색 쿼리를 취소합니다 (마지막 요청 우선).
+    
+    브라우저가 AbortController로 이전 요청을 끊어도 서버가 끊김을 알아채기 전까지 쿼리는 계속 실행되므로,
+    타이핑 중에 쌓이는 검색을 새 요청이 도착하는 즉시 정리합니다. client가 없으면 아무것도 하지 않습니다.
+    """
+    client_id = request.args.get('client')
+    if not client_id:
+        yield
+        return
+    
+    with _latest_searches_lock:
+        previous = _latest_searches.get(client_id)
+        _latest_searches[client_id] = token
+        if previous is not None:
+            asset_manager.db.cancel_query(previous)
+    try:
+        yield
+    finally:
+        with _latest_searches_lock:
+            if _latest_searches.get(client_id) is token:
+                del _latest_searches[client_id]
+
+@app.before_request
+def start_job_manager():
+    if job_manager:
+        job_manager.start()
+
 @app.route('/')
 def index():
     """메인 페이지 - 자산 목록과 통계 표시"""
     if not asset_manager:
         return render_template('error.html', error="데이터베이스 연결에 실패했습니다.")
     
+    db_status = asset_manager.db.status()
+    if db_status['state'] != 'connected':
+        # 연결 전에는 빈 화면을 먼저 그리고, 브라우저가 /api/health를 폴링합니다.
+        return render_template('index.html', assets={}, stats={}, facets=None, next_after_id=None, db_status=db_status)
+    
     try:
-        assets = asset_manager.list_assets()
-        stats = asset_manager.get_asset_statistics()
-        return render_template('index.html', assets=assets, stats=stats)
+        # 목록 첫 페이지와 통계를 한 스냅샷에서 한 번의 쿼리로 읽음
+        dashboard = asset_manager.get_dashboard()
+        return render_template(
+            'index.html', assets=dashboard['assets'], stats=dashboard['statistics'], facets=dashboard['facets'],
+            next_after_id=dashboard['next_after_id'], db_status=db_status
+        )
+    except CircuitOpenError as e:
+        return render_template('error.html', error=str(e)), 503
     except Exception as e:
         logger.error(f"메인 페이지 로드 오류: {e}")
         return render_template('error.html', error=str(e))
 
+@app.route('/api/health')
+def health():
+    """데이터베이스 연결 상태 반환 (connecting / connected / failed)"""
+    if not asset_manager:
+        return jsonify({'database': 'failed', 'error': '자산 매니저 초기화에 실패했습니다.'}), 503
+    
+    db_status = asset_manager.db.status()
+    if db_status['state'] in ('idle', 'failed'):
+        # 워밍업이 끝났는데 연결이 없으면 다시 시도
+        asset_manager.db.start_warmup()
+    return jsonify({'database': db_status['state'], 'error': db_status['error'], 'breaker': db_status['breaker']})
+
 @app.route('/api/assets')
 def get_assets():
-    """자산 목록을 JSON으로 반환"""
+    """자산 목록을 JSON으로 반환
+    
+    location_id를 주면 그 위치와 하위 위치의 자산만, attr.<키>=<값>(예: attr.ram_gb=64)을 주면
+    해당 속성을 가진 자산만 반환합니다. include_archived=1이면 보관된 폐기 자산도 포함합니다.
+    limit을 주면 ID가 after_id보다 큰 자산을 limit개까지만 반환합니다 (페이지 단위 조회).
+    """
     if not asset_manager:
         return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
     
     try:
-        assets = asset_manager.list_assets()
+        location_id = request.args.get('location_id', type=int)
+        attributes = parse_attribute_filters(request.args)
+        with cancel_on_disconnect('list'):
+            assets = asset_manager.list_assets(
+                location_id, attributes, _include_archived(),
+                after_id=request.args.get('after_id', type=int), limit=request.args.get('limit', type=int)
+            )
         return jsonify(assets)
     except Exception as e:
         logger.error(f"자산 목록 조회 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
+
+@app.route('/api/dashboard')
+def get_dashboard():
+    """첫 화면 데이터: 목록 첫 페이지, 통계 카드, 패싯 건수를 한 스냅샷에서 한 번의 쿼리로 반환
+    
+    {"assets": {...}, "statistics": {...}, "facets": {...}, "next_after_id": ...}
+    location_id, include_archived=1, limit(기본 100)을 받으며, 다음 페이지는 /api/assets?after_id=...&limit=...로 읽습니다.
+    """
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        location_id = request.args.get('location_id', type=int)
+        limit = request.args.get('limit', PAGE_SIZE, type=int)
+        with cancel_on_disconnect('list'):
+            dashboard = asset_manager.get_dashboard(location_id, _include_archived(), limit)
+        return jsonify(dashboard)
+    except Exception as e:
+        logger.error(f"대시보드 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/attributes/schema')
+def get_attribute_schema():
+    """유형별 속성 스키마 반환 ({유형: [{"key", "label", "type"}, ...]})"""
+    return jsonify(schema_as_dict())
 
 @app.route('/api/assets/<int:asset_id>')
 def get_asset(asset_id):
@@ -62,12 +327,45 @@ def get_asset(asset_id):
     try:
         asset = asset_manager.get_asset(asset_id)
         if asset:
-            return jsonify(asset)
+            # 수정할 때 If-Match로 돌려보내면 그 사이 다른 수정이 있었는지 확인함
+            response = jsonify(asset)
+            response.set_etag(str(asset['Version']))
+            return response
         else:
             return jsonify({'error': '자산을 찾을 수 없습니다.'}), 404
     except Exception as e:
         logger.error(f"자산 조회 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
+
+@app.route('/api/assets/by-tag/<path:tag>')
+def get_asset_by_tag(tag):
+    """자산 태그 또는 시리얼 번호로 자산 조회 (바코드 스캔)"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        asset = asset_manager.get_asset_by_tag(tag)
+        if asset:
+            return jsonify(asset)
+        return jsonify({'error': '자산을 찾을 수 없습니다.'}), 404
+    except Exception as e:
+        logger.error(f"태그 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/assets/lookup', methods=['POST'])
+def lookup_assets():
+    """스캔한 태그 여러 개를 한 번에 조회 ({"tags": [...]} -> {"found": {...}, "missing": [...]})"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        tags = (request.get_json(silent=True) or {}).get('tags')
+        if not isinstance(tags, list):
+            return jsonify({'error': 'tags 목록이 필요합니다.'}), 400
+        return jsonify(asset_manager.lookup_assets(tags))
+    except Exception as e:
+        logger.error(f"태그 일괄 조회 오류: {e}")
+        return _error_response(e)
 
 @app.route('/api/assets', methods=['POST'])
 def add_asset():
@@ -81,24 +379,70 @@ def add_asset():
         return jsonify({'success': True, 'asset_id': asset_id, 'message': '자산이 성공적으로 추가되었습니다.'})
     except Exception as e:
         logger.error(f"자산 추가 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
+
+@app.route('/api/assets', methods=['PATCH'])
+def bulk_update_assets():
+    """여러 자산의 일부 필드를 한 번에 수정
+    
+    {"ids": [1, 2, 3], "changes": {"Status": "폐기"}} 또는
+    {"filter": {"location_id": 7, "Status": "운영"}, "changes": {...}}
+    """
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        target = data['ids'] if 'ids' in data else data.get('filter')
+        changes = data.get('changes')
+        if not isinstance(target, (list, dict)) or not isinstance(changes, dict):
+            return jsonify({'error': 'ids 또는 filter와 changes가 필요합니다.'}), 400
+        result = asset_manager.bulk_update(target, changes)
+        return jsonify({'success': True, **result, 'message': f"자산 {result['updated']}건이 수정되었습니다."})
+    except Exception as e:
+        logger.error(f"자산 일괄 수정 오류: {e}")
+        return _error_response(e)
 
 @app.route('/api/assets/<int:asset_id>', methods=['PUT'])
 def update_asset(asset_id):
-    """자산 정보 수정"""
+    """자산 정보 수정 (If-Match: 조회 시 받은 ETag를 보내면 다른 사용자가 먼저 수정한 경우 409)"""
     if not asset_manager:
         return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
     
     try:
         data = request.get_json()
-        success = asset_manager.update_asset(asset_id, data)
+        success = asset_manager.update_asset(asset_id, data, expected_version=_expected_version())
         if success:
             return jsonify({'success': True, 'message': '자산이 성공적으로 수정되었습니다.'})
         else:
             return jsonify({'error': '자산 수정에 실패했습니다.'}), 400
     except Exception as e:
         logger.error(f"자산 수정 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
+
+@app.route('/api/assets/<int:asset_id>', methods=['PATCH'])
+def patch_asset(asset_id):
+    """자산의 일부 필드만 수정 (예: {"Status": "운영"}), 값이 같으면 쓰지 않음
+    
+    If-Match에 조회 시 받은 ETag를 보내면 그 사이 다른 수정이 있었을 때 409를 반환합니다.
+    """
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        changes = request.get_json(silent=True)
+        if not isinstance(changes, dict):
+            return jsonify({'error': '수정할 필드가 필요합니다.'}), 400
+        result = asset_manager.patch_asset(asset_id, changes, expected_version=_expected_version())
+        if result is None:
+            return jsonify({'error': '자산을 찾을 수 없습니다.'}), 404
+        message = '자산이 성공적으로 수정되었습니다.' if result['changed'] else '변경된 내용이 없습니다.'
+        response = jsonify({'success': True, **result, 'message': message})
+        response.set_etag(str(result['asset']['Version']))
+        return response
+    except Exception as e:
+        logger.error(f"자산 부분 수정 오류: {e}")
+        return _error_response(e)
 
 @app.route('/api/assets/<int:asset_id>', methods=['DELETE'])
 def delete_asset(asset_id):
@@ -114,85 +458,421 @@ def delete_asset(asset_id):
             return jsonify({'error': '자산 삭제에 실패했습니다.'}), 400
     except Exception as e:
         logger.error(f"자산 삭제 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
 
 @app.route('/api/search')
 def search_assets():
-    """자산 검색"""
+    """자산 검색 (include_archived=1이면 보관된 폐기 자산도 검색)
+    
+    asset_type/status/location/purchase_year로 패싯 값을 지정하면 결과를 그 값으로 좁히고,
+    facets=1이면 {"assets": {...}, "facets": {...}} 형태로 결과 집합의 패싯별 건수를 함께 반환합니다.
+    """
     if not asset_manager:
         return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
     
     try:
         search_term = request.args.get('q', '')
         search_field = request.args.get('field', 'all')
+        search_field = search_field if search_field != 'all' else None
+        location_id = request.args.get('location_id', type=int)
+        include_archived = _include_archived()
+        filters = _facet_filters()
+        with_facets = request.args.get('facets') == '1'
         
-        if not search_term:
-            assets = asset_manager.list_assets()
-        else:
-            assets = asset_manager.search_assets(search_term, search_field if search_field != 'all' else None)
+        def run():
+            with cancel_on_disconnect('search') as token, latest_search_wins(token):
+                if with_facets:
+                    return asset_manager.faceted_search(
+                        search_term, search_field, location_id, include_archived=include_archived, filters=filters
+                    )
+                if not search_term and not filters:
+                    return asset_manager.list_assets(location_id, include_archived=include_archived)
+                return asset_manager.search_assets(
+                    search_term, search_field, location_id, include_archived=include_archived, filters=filters
+                )
         
-        return jsonify(assets)
+        key = _cache_key(
+            'search', search_term, search_field, location_id, include_archived, with_facets, tuple(sorted(filters.items()))
+        )
+        return jsonify(request_cache.get_or_compute(key, run))
+    except QueryCanceledError as e:
+        # 같은 탭의 새 검색으로 대체되었거나 시간 초과 (타이핑 중에는 흔한 일이므로 오류로 남기지 않음)
+        logger.info(f"자산 검색 취소: {e}")
+        return _error_response(e)
     except Exception as e:
         logger.error(f"자산 검색 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
+
+@app.route('/api/suggest')
+def suggest_models():
+    """모델명 자동 완성 (prefix로 시작하는 모델명을 자산 수가 많은 순서로, limit은 최대 SUGGEST_LIMIT)"""
+    if not suggester:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        prefix = request.args.get('prefix', '')
+        limit = request.args.get('limit', SUGGEST_LIMIT, type=int)
+        return jsonify(suggester.suggest(prefix, limit))
+    except Exception as e:
+        logger.error(f"모델명 제안 오류: {e}")
+        return _error_response(e)
 
 @app.route('/api/statistics')
 def get_statistics():
-    """자산 통계 정보 반환"""
+    """자산 통계 정보 반환 (include_archived=1이면 보관된 폐기 자산도 포함하고 archived에 그 수를 반환)"""
     if not asset_manager:
         return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
     
     try:
-        stats = asset_manager.get_asset_statistics()
+        location_id = request.args.get('location_id', type=int)
+        include_archived = _include_archived()
+        
+        def run():
+            with cancel_on_disconnect('stats'):
+                return asset_manager.get_asset_statistics(location_id, include_archived)
+        
+        stats = request_cache.get_or_compute(_cache_key('statistics', location_id, include_archived), run)
         return jsonify(stats)
     except Exception as e:
         logger.error(f"통계 조회 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        return _error_response(e)
 
-@app.route('/export/csv')
-def export_csv():
-    """CSV 형식으로 데이터 내보내기"""
+@app.route('/api/locations')
+def get_locations():
+    """위치 계층 목록 반환 (경로 순서, 각 항목에 parent_id, depth, path 포함)"""
     if not asset_manager:
         return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
     
     try:
-        from io import StringIO
-        import csv
-        
-        assets = asset_manager.list_assets()
-        
-        # CSV 데이터 생성
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # 헤더 작성
-        writer.writerow(['ID', 'Type', 'Model', 'Purchase Date', 'Warranty', 'Status', 'Location', 'Reason'])
-        
-        # 데이터 작성
-        for asset_id, asset_data in assets.items():
-            writer.writerow([
-                asset_id,
-                asset_data.get('Type', ''),
-                asset_data.get('Model', ''),
-                asset_data.get('Purchase Date', ''),
-                asset_data.get('Warranty', ''),
-                asset_data.get('Status', ''),
-                asset_data.get('Location', ''),
-                asset_data.get('Reason', '')
-            ])
+        return jsonify(asset_manager.list_locations())
+    except Exception as e:
+        logger.error(f"위치 목록 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/locations', methods=['POST'])
+def add_location():
+    """위치 추가 ({"name": ..., "parent_id": ..., "kind": "site|building|room|rack|other"})"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        data = request.get_json() or {}
+        if not data.get('name'):
+            return jsonify({'error': '위치 이름을 입력하세요.'}), 400
+        location_id = asset_manager.add_location(data['name'], data.get('parent_id'), data.get('kind', 'other'))
+        return jsonify({'success': True, 'location_id': location_id, 'message': '위치가 추가되었습니다.'})
+    except Exception as e:
+        logger.error(f"위치 추가 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/locations/<int:location_id>', methods=['PUT'])
+def update_location(location_id):
+    """위치 이름/종류 변경 또는 다른 부모 아래로 이동 (하위 위치와 자산이 함께 이동)"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        success = asset_manager.update_location(location_id, request.get_json() or {})
+        if success:
+            return jsonify({'success': True, 'message': '위치가 수정되었습니다.'})
+        else:
+            return jsonify({'error': '위치를 찾을 수 없거나 변경할 내용이 없습니다.'}), 404
+    except Exception as e:
+        logger.error(f"위치 수정 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/locations/<int:location_id>', methods=['DELETE'])
+def delete_location(location_id):
+    """하위 위치와 자산이 없는 위치 삭제"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        if asset_manager.delete_location(location_id):
+            return jsonify({'success': True, 'message': '위치가 삭제되었습니다.'})
+        else:
+            return jsonify({'error': '위치를 찾을 수 없습니다.'}), 404
+    except Exception as e:
+        logger.error(f"위치 삭제 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/locations/<int:location_id>/statistics')
+def get_location_statistics(location_id):
+    """위치 하위 트리의 자산 통계와 직속 하위 위치별 건수 반환"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        with cancel_on_disconnect('stats'):
+            result = asset_manager.get_location_statistics(location_id)
+        if result is None:
+            return jsonify({'error': '위치를 찾을 수 없습니다.'}), 404
+        return jsonify(result)
+    except Exception as e:
+        logger.error(f"위치 통계 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/audits', methods=['POST'])
+def create_audit():
+    """스캔한 태그 목록을 위치의 자산과 대조하여 실사 회차 저장
+    
+    JSON({"location_id": 3, "tags": [...], "note": "..."}) 또는 multipart(location_id, note,
+    file: 한 줄에 태그 하나인 텍스트/CSV)로 받습니다.
+    """
+    if not auditor:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            data = request.form
+            tags = read_tag_file(upload.stream)
+            location_id = data.get('location_id', type=int)
+        else:
+            data = request.get_json(silent=True) or {}
+            tags = data.get('tags')
+            location_id = data.get('location_id')
+        if not isinstance(location_id, int) or not isinstance(tags, list):
+            return jsonify({'error': 'location_id와 tags 목록(또는 file)이 필요합니다.'}), 400
         
-        output.seek(0)
+        run = auditor.run_audit(location_id, tags, data.get('note'))
+        return jsonify({'success': True, 'run': run, 'message': '실사 대조가 완료되었습니다.'})
+    except Exception as e:
+        logger.error(f"실사 대조 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/audits')
+def list_audits():
+    """최근 실사 회차 요약 (location_id를 주면 그 위치의 회차만, 추이 보고용)"""
+    if not auditor:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        location_id = request.args.get('location_id', type=int)
+        limit = min(request.args.get('limit', 50, type=int), 500)
+        return jsonify(auditor.list_runs(location_id, limit))
+    except Exception as e:
+        logger.error(f"실사 회차 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/audits/<int:run_id>')
+def get_audit(run_id):
+    """실사 회차 요약과 항목 (outcome=matched|misplaced|unexpected|missing으로 거를 수 있음)"""
+    if not auditor:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        run = auditor.get_run(run_id)
+        if run is None:
+            return jsonify({'error': '실사 회차를 찾을 수 없습니다.'}), 404
+        with cancel_on_disconnect('list'):
+            items = auditor.get_items(run_id, request.args.get('outcome'))
+        return jsonify({'run': run, 'items': items})
+    except Exception as e:
+        logger.error(f"실사 회차 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/audits/<int:run_id>/corrections', methods=['POST'])
+def apply_audit_corrections(run_id):
+    """실사 결과로 일괄 수정 ({"move_misplaced": true, "missing_status": "유휴"})"""
+    if not auditor:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        data = request.get_json(silent=True) or {}
+        result = auditor.apply_corrections(
+            run_id, bool(data.get('move_misplaced', True)), data.get('missing_status') or None
+        )
+        return jsonify({'success': True, **result, 'message': '실사 결과가 반영되었습니다.'})
+    except Exception as e:
+        logger.error(f"실사 일괄 수정 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/diagnostics/transactions')
+def transaction_diagnostics():
+    """트랜잭션 진단 정보 반환 (이 프로세스의 트랜잭션 시간, 유휴 트랜잭션 세션)"""
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        return jsonify(asset_manager.db.transaction_diagnostics())
+    except Exception as e:
+        logger.error(f"트랜잭션 진단 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/diagnostics/cache')
+def cache_diagnostics():
+    """검색/통계 캐시 지표 (적중률, 합쳐진 요청 수, 아낀 쿼리 수)"""
+    return jsonify(dict(request_cache.stats(), generation=asset_manager.generation if asset_manager else None))
+
+@app.route('/export/<file_format>')
+def export_file(file_format):
+    """CSV / Parquet / Arrow IPC / XLSX 형식으로 데이터 내보내기
+
+    서버 측 커서에서 배치 단위로 읽어 임시 파일에 쓴 뒤 전송하므로
+    건수와 관계없이 메모리 사용량이 일정합니다.
+    """
+    if not asset_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    if file_format not in EXPORT_FORMATS:
+        return jsonify({'error': f'지원하지 않는 내보내기 형식입니다: {file_format}'}), 404
+    
+    spool = tempfile.TemporaryFile()
+    try:
+        with cancel_on_disconnect('export'):
+            export_assets(asset_manager, file_format, spool)
+        spool.seek(0)
         
-        from flask import Response
-        return Response(
-            output.getvalue(),
-            mimetype='text/csv',
-            headers={'Content-Disposition': f'attachment; filename=assets_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'}
+        mimetype, extension = EXPORT_FORMATS[file_format]
+        return send_file(
+            spool,
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=f'assets_{datetime.now().strftime("%Y%m%d_%H%M%S")}{extension}'
         )
         
     except Exception as e:
-        logger.error(f"CSV 내보내기 오류: {e}")
-        return jsonify({'error': str(e)}), 500
+        spool.close()
+        logger.error(f"{file_format.upper()} 내보내기 오류: {e}")
+        return _error_response(e)
+
+def _job_json(job):
+    """작업 정보에 결과 파일 다운로드 주소를 붙여 반환 (결과 파일이 없으면 None)"""
+    job = dict(job)
+    job['download_url'] = url_for('download_job', job_id=job['id']) if job_manager.artifact_path(job) else None
+    return job
+
+def _submit_job(kind, params, upload=None):
+    try:
+        job = job_manager.submit(kind, params, upload)
+    except JobQueueFullError as e:
+        response = jsonify({'error': str(e)})
+        response.status_code = 429
+        response.headers['Retry-After'] = '30'
+        return response
+    response = jsonify(_job_json(job))
+    response.status_code = 202
+    response.headers['Location'] = url_for('get_job', job_id=job['id'])
+    return response
+
+@app.route('/api/jobs/import', methods=['POST'])
+def create_import_job():
+    """업로드한 엑셀/CSV/JSONL/Parquet 파일을 백그라운드에서 가져오는 작업 등록"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'error': '가져올 파일을 선택하세요.'}), 400
+    try:
+        validate_import_filename(upload.filename)
+        return _submit_job('import', {}, upload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"가져오기 작업 등록 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/jobs/export', methods=['POST'])
+def create_export_job():
+    """CSV / Parquet / Arrow IPC / XLSX 내보내기 작업 등록"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        file_format = validate_export_format(data.get('format', 'csv'))
+        return _submit_job('export', {'format': file_format})
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"내보내기 작업 등록 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/jobs/archive', methods=['POST'])
+def create_archive_job():
+    """폐기된 지 older_than_days일(기본 ARCHIVE_AFTER_DAYS)이 지난 자산을 보관 테이블로 옮기는 작업 등록"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        older_than_days = int(data.get('older_than_days', ARCHIVE_AFTER_DAYS))
+        batch_size = int(data.get('batch_size', ARCHIVE_BATCH_SIZE))
+        if older_than_days < 0 or batch_size < 1:
+            raise ValueError('older_than_days는 0 이상, batch_size는 1 이상이어야 합니다.')
+        return _submit_job('archive', {'older_than_days': older_than_days, 'batch_size': batch_size})
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"보관 작업 등록 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/jobs')
+def list_jobs():
+    """최근 작업 목록 반환"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        limit = min(request.args.get('limit', 20, type=int), 100)
+        jobs = [_job_json(job) for job in job_manager.list(limit)]
+        return jsonify(jobs)
+    except Exception as e:
+        logger.error(f"작업 목록 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """작업 상태와 진행률 반환"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        return jsonify(_job_json(job))
+    except Exception as e:
+        logger.error(f"작업 조회 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """대기 중이거나 실행 중인 작업 취소"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        job = job_manager.cancel(job_id)
+        if not job:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        return jsonify(_job_json(job))
+    except Exception as e:
+        logger.error(f"작업 취소 오류: {e}")
+        return _error_response(e)
+
+@app.route('/api/jobs/<job_id>/download')
+def download_job(job_id):
+    """완료된 작업의 결과 파일 (내보내기 파일 또는 가져오기 거부 행 CSV) 다운로드"""
+    if not job_manager:
+        return jsonify({'error': '데이터베이스 연결에 실패했습니다.'}), 500
+    
+    try:
+        job = job_manager.get(job_id)
+        if not job:
+            return jsonify({'error': '작업을 찾을 수 없습니다.'}), 404
+        path = job_manager.artifact_path(job)
+        if path is None:
+            return jsonify({'error': '다운로드할 결과 파일이 없습니다.', 'status': job['status']}), 409
+        
+        mimetype = 'text/csv'
+        if job['kind'] == 'export':
+            mimetype = EXPORT_FORMATS[job['params']['format']][0]
+        return send_file(path, mimetype=mimetype, as_attachment=True, download_name=job['artifact_name'])
+    except Exception as e:
+        logger.error(f"작업 결과 다운로드 오류: {e}")
+        return _error_response(e)
 
 @app.errorhandler(404)
 def not_found(error):